@@ -0,0 +1,86 @@
+# 스크립트별 시작 비용 측정: -X importtime 합계/상위 모듈 + 첫 요청 준비까지 걸린 시간
+# 네트워크/쿼터는 쓰지 않는다(첫 요청은 보내지 않고 만들기까지만 잰다)
+# 사용: python bench_startup.py [script.py ...]
+import re
+import sys
+import time
+import subprocess
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+SCRIPTS = [
+    "last.py", "last_quota.py", "playlist_ko.py", "playlist_en.py", "ko.py",
+    "yt_enrich.py", "yt_feed.py",
+    "ko_kbs.py", "ko_mbc.py", "ko_sbs.py", "en_serp_api.py",
+]
+REPEAT = 3                      # 최솟값을 쓴다(디스크 캐시 등 잡음 제거)
+TOP_N = 5
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# 모듈 import → YouTube 클라이언트 생성 → 첫 요청 객체 준비(전송 안 함)
+FIRST_REQUEST = """
+import {module}
+from yt_pool import build_client
+yt = build_client("bench-key")
+yt.playlistItems().list(part="snippet", playlistId="UU", maxResults=50)
+"""
+
+# -----------------------------
+# MEASUREMENT
+# -----------------------------
+def run(code: str, *flags) -> tuple:
+    t0 = time.perf_counter()
+    p = subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True)
+    return time.perf_counter() - t0, p
+
+def import_profile(module: str) -> dict:
+    """-X importtime: 스크립트 모듈의 누적 import 시간과, 그 모듈이 직접 import한 것 중 비싼 순."""
+    _, p = run(f"import {module}", "-X", "importtime")
+    if p.returncode != 0:
+        return {"error": p.stderr.strip().splitlines()[-1] if p.stderr.strip() else "failed"}
+    rows = [(int(m.group(2)), len(m.group(3)), m.group(4))
+            for line in p.stderr.splitlines() if (m := IMPORTTIME_RE.match(line))]
+    # 출력은 자식이 부모보다 먼저 찍힌다 → 스크립트 줄(들여쓰기 1) 바로 앞의 들여쓰기 3 줄들이 직접 import
+    idx = next(i for i, r in enumerate(rows) if r[1] == 1 and r[2] == module)
+    children = []
+    for us, indent, name in reversed(rows[:idx]):
+        if indent == 1:
+            break  # 인터프리터 시작 시 import(site 등)
+        if indent == 3:
+            children.append((us, name))
+    children.sort(reverse=True)
+    return {"total_ms": rows[idx][0] / 1000, "top": children[:TOP_N]}
+
+def wall_time(code: str) -> float | None:
+    best = None
+    for _ in range(REPEAT):
+        dt, p = run(code)
+        if p.returncode != 0:
+            return None
+        best = dt if best is None else min(best, dt)
+    return best
+
+# -----------------------------
+# MAIN
+# -----------------------------
+def main(scripts: list):
+    baseline = wall_time("pass") or 0.0
+    print(f"[BENCH] interpreter baseline {baseline * 1000:.0f} ms (subtracted below)")
+    for script in scripts:
+        module = script[:-3] if script.endswith(".py") else script
+        prof = import_profile(module)
+        if "error" in prof:
+            print(f"[BENCH] {script:<18} import failed: {prof['error']}")
+            continue
+        imp = wall_time(f"import {module}")
+        first = wall_time(FIRST_REQUEST.format(module=module))
+        first_s = f"{(first - baseline) * 1000:7.0f} ms" if first is not None else "    n/a"
+        print(f"[BENCH] {script:<18} importtime={prof['total_ms']:7.0f} ms  "
+              f"import={(imp - baseline) * 1000:7.0f} ms  first_request={first_s}")
+        for us, name in prof["top"]:
+            print(f"          {us / 1000:7.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or SCRIPTS)
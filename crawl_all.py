@@ -0,0 +1,292 @@
+# pip install requests pandas openpyxl urllib3 python-dateutil (YouTube까지: google-api-python-client)
+# 모든 출처(KBS/MBC/SBS 검색, SerpAPI 웹검색, YouTube 업로드 목록)를 한 설정으로 동시에 돌려 하나의 코퍼스에 모은다
+# - 출처마다 자기 스레드(들)에서 돌므로 전체 시간 = 가장 느린 출처(합이 아니라)
+# - 작업/결과는 news_queue의 SQLite 큐 하나(CORPUS_DB): 출처별로 따로 임대, 결과는 (출처, 링크)로 중복 제거,
+#   중간에 끊겨도 다시 실행하면 남은 작업부터(YouTube 쿼터 소진이면 그 출처만 멈추고 나머지는 계속)
+# - 호스트별 요청 간격은 큐 DB rate 테이블로 호스트마다 따로(한 호스트가 느려도 다른 호스트는 기다리지 않음)
+#   SerpAPI는 모듈 자체 간격, YouTube는 키 풀의 쿼터 원장을 그대로 쓴다
+# 사용: python crawl_all.py [--config crawl_all.json] [--sources kbs,mbc,sbs,serp,youtube]
+#                           [--start 2015-08-01] [--end 2025-08-01] [--export-only]
+import json
+import time
+import socket
+import argparse
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from news_queue import SqliteQueue, SourcePaused, install_rate_limits, news_tasks, worker_loop, run_news_task
+from news_survey import KEYWORDS as KO_KEYWORDS, START_DATE, END_DATE, SURVEY_STATE
+
+# ============================ 설정 ============================
+# --config JSON 파일이 있으면 같은 키만 덮어쓴다(sources 안은 출처별로 합침)
+CONFIG = {
+    "start": START_DATE,                  # YYYY-MM-DD, 양 끝 포함
+    "end": END_DATE,
+    "keywords": {"ko": KO_KEYWORDS, "en": None},       # en None → en_serp_api.KEYWORDS
+    "sources": {
+        "kbs": {"enabled": True, "workers": 1},
+        "mbc": {"enabled": True, "workers": 1},
+        "sbs": {"enabled": True, "workers": 1},
+        "serp": {"enabled": True, "domains": None, "api_key": None},     # None → en_serp_api.DOMAIN / API_KEY
+        "youtube": {"enabled": True, "channels": None, "api_keys": None},  # None → last_quota.CHANNELS / API_KEYS
+    },
+    "hosts": {},                          # 호스트 → 요청 간격(초), 비우면 각 크롤러 기본값
+    "corpus_db": "corpus.sqlite",
+    "output": "corpus_{start}_{end}.xlsx",
+}
+NEWS_SOURCES = ("kbs", "mbc", "sbs")
+
+def load_config(path: str | None) -> dict:
+    config = json.loads(json.dumps(CONFIG))
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            user = json.load(f)
+        for key, value in user.items():
+            if key in ("sources", "keywords") and isinstance(value, dict):
+                for name, sub in value.items():
+                    if isinstance(sub, dict) and isinstance(config[key].get(name), dict):
+                        config[key][name].update(sub)
+                    else:
+                        config[key][name] = sub
+            else:
+                config[key] = value
+    return config
+
+def day(s: str, tz=None) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d").replace(tzinfo=tz)
+
+# ============================ 출처 어댑터 ============================
+# 어댑터: setup(config) → 돌릴 수 있으면 True, tasks(config) → 큐 작업, run(task) → (행, 요청 수)
+class NewsAdapter:
+    def __init__(self, source: str):
+        self.source = source
+
+    def setup(self, config: dict) -> bool:
+        return True
+
+    def tasks(self, config: dict) -> list:
+        return news_tasks([self.source], config["keywords"]["ko"], config["start"], config["end"], SURVEY_STATE)
+
+    def run(self, task: dict) -> tuple:
+        return run_news_task(task)
+
+class SerpAdapter:
+    """작업 = (도메인, 연도). en_serp_api는 모듈 전역(DOMAIN/START/END/KEYWORDS)을 쓰므로 워커는 하나만."""
+    source = "serp"
+    single_worker = True
+
+    def setup(self, config: dict) -> bool:
+        import en_serp_api
+        self.api = en_serp_api
+        opts = config["sources"]["serp"]
+        en_serp_api.API_KEY = opts.get("api_key") or en_serp_api.API_KEY
+        if not en_serp_api.API_KEY:
+            print("[SKIP] serp: no SerpAPI key (sources.serp.api_key)", flush=True)
+            return False
+        en_serp_api.START = day(config["start"], timezone.utc)
+        en_serp_api.END = day(config["end"], timezone.utc)
+        if config["keywords"].get("en"):
+            en_serp_api.KEYWORDS = list(dict.fromkeys(config["keywords"]["en"]))
+        self.domains = opts.get("domains") or [en_serp_api.DOMAIN]
+        return True
+
+    def tasks(self, config: dict) -> list:
+        # 작업 기간 = 그 해 중 설정 범위에 든 부분 → 범위를 늘리면 잘려 있던 경계 연도만 다시 돈다
+        tasks = []
+        for y in range(self.api.START.year, self.api.END.year + 1):
+            s = max(f"{y}-01-01", config["start"])
+            e = min(f"{y}-12-31", config["end"])
+            tasks += [("serp", domain, str(y), s, e, 0.0) for domain in self.domains]
+        return tasks
+
+    def run(self, task: dict) -> tuple:
+        self.api.DOMAIN = task["keyword"]
+        window_stats = []
+        rows = self.api.crawl_year(int(task["month"]), set(), window_stats)
+        rows = [{"keyword": task["keyword"], "title": r["title"], "published": r["published"], "link": r["link"]}
+                for r in rows]
+        return rows, sum(s["pages"] for s in window_stats)
+
+class YouTubeAdapter:
+    """작업 = 채널 하나의 업로드 목록. 쿼터가 바닥나면 받은 만큼 넣고 이 출처만 멈춘다(페이지 토큰에서 재개).
+    실행마다 다시 큐에 넣는다(refresh) — 워터마크까지만 보므로 이미 본 채널은 새 업로드만 받는다."""
+    source = "youtube"
+    single_worker = True
+    refresh = True
+
+    def setup(self, config: dict) -> bool:
+        try:
+            import last_quota
+        except ImportError as e:
+            print(f"[SKIP] youtube: {e}", flush=True)
+            return False
+        from yt_quota import CrawlState
+        from yt_pool import YouTubeClientPool
+        from yt_cache import ResponseCache
+        from yt_enrich import get_uploads_playlist_ids
+        from yt_watermark import Watermarks
+        opts = config["sources"]["youtube"]
+        keys = [k for k in (opts.get("api_keys") or last_quota.API_KEYS) if k]
+        if not keys:
+            print("[SKIP] youtube: no API keys (sources.youtube.api_keys)", flush=True)
+            return False
+        self.yt = last_quota
+        last_quota.START_DATE = day(config["start"])
+        last_quota.END_DATE = day(config["end"]).replace(hour=23, minute=59, second=59)
+        if config["keywords"].get("en"):
+            last_quota.ENGLISH_KEYWORDS = list(config["keywords"]["en"])
+        elif not last_quota.ENGLISH_KEYWORDS:
+            import en_serp_api
+            last_quota.ENGLISH_KEYWORDS = list(en_serp_api.KEYWORDS)
+        self.channels = opts.get("channels") or last_quota.CHANNELS
+        cache = ResponseCache(last_quota.CACHE_FILE, last_quota.CACHE_MAX_AGE) if last_quota.RESPONSE_CACHE else None
+        self.pool = YouTubeClientPool(keys, cache=cache)
+        self.state = CrawlState(last_quota.STATE_FILE)
+        self.marks = Watermarks(last_quota.WATERMARK_FILE)
+        self.uploads_of = lambda cid: get_uploads_playlist_ids(self.pool, [cid]).get(cid)
+        return True
+
+    def tasks(self, config: dict) -> list:
+        return [("youtube", cid, "uploads", config["start"], config["end"], 0.0) for cid in self.channels]
+
+    def run(self, task: dict) -> tuple:
+        from yt_quota import QuotaExhausted
+        cid = task["keyword"]
+        name = self.channels.get(cid, cid)
+        found = {}
+        try:
+            playlist_id = self.uploads_of(cid)
+            if playlist_id:
+                self.yt.fetch_playlist_videos(self.pool, self.state, self.marks, playlist_id, name, found)
+            paused = None
+        except QuotaExhausted as e:
+            paused = e
+        finally:
+            self.state.save()
+            self.marks.save()
+        rows = [{"keyword": name, "title": v["Title"], "published": v["UploadDate"][:10], "link": v["Video URL"],
+                 "artid": vid} for vid, v in found.items()]
+        if paused is not None:
+            raise SourcePaused(f"quota exhausted: {paused}", rows)
+        return rows, 0
+
+    def report(self):
+        self.pool.report()
+
+ADAPTERS = {
+    "kbs": lambda: NewsAdapter("kbs"),
+    "mbc": lambda: NewsAdapter("mbc"),
+    "sbs": lambda: NewsAdapter("sbs"),
+    "serp": SerpAdapter,
+    "youtube": YouTubeAdapter,
+}
+
+# ============================ 실행 ============================
+def run_source(db: str, source: str, adapter, workers: int) -> tuple:
+    """출처 하나를 workers개 스레드로 큐가 빌 때까지(또는 SourcePaused까지). (출처, 끝낸 작업 수, 걸린 초)."""
+    t0 = time.time()
+    base = f"{socket.gethostname()}-{source}"
+    done = [0] * workers
+
+    def loop(i: int):
+        done[i] = worker_loop(db, f"{base}-{i}", True, [source], adapter.run, rate_limits=False)
+
+    threads = [threading.Thread(target=loop, args=(i,), name=f"{source}-{i}") for i in range(workers)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    return source, sum(done), time.time() - t0
+
+def crawl_all(config: dict, sources: list) -> dict:
+    db = config["corpus_db"]
+    queue = SqliteQueue(db)
+    adapters = {}
+    for source in sources:
+        adapter = ADAPTERS[source]()
+        try:
+            ready = adapter.setup(config)
+        except Exception as e:
+            print(f"[SKIP] {source}: setup failed ({e})", flush=True)
+            ready = False
+        if not ready:
+            continue
+        added = queue.enqueue(adapter.tasks(config), refresh=getattr(adapter, "refresh", False))
+        queued, leased = queue.pending([source])
+        print(f"[PLAN] {source}: {added} new tasks, {queued + leased} to run", flush=True)
+        adapters[source] = adapter
+
+    # 호스트별 간격: 뉴스 세 곳의 SESSION.get에 한 번만 끼운다(스레드끼리 같은 rate 테이블)
+    if any(s in adapters for s in NEWS_SOURCES):
+        install_rate_limits(queue, config.get("hosts"))
+
+    elapsed = {}
+    t0 = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, len(adapters))) as ex:
+        futures = []
+        for source, adapter in adapters.items():
+            workers = 1 if getattr(adapter, "single_worker", False) else max(1, int(config["sources"][source].get("workers", 1)))
+            futures.append(ex.submit(run_source, db, source, adapter, workers))
+        for f in futures:
+            try:
+                source, n, secs = f.result()
+            except Exception as e:
+                print(f"[ERROR] {e}", flush=True)
+                continue
+            elapsed[source] = secs
+            print(f"[DONE] {source}: {n} tasks in {secs:.0f}s", flush=True)
+    wall = time.time() - t0
+    if elapsed:
+        print(f"[DONE] wall-clock {wall:.0f}s (slowest: {max(elapsed, key=elapsed.get)} {max(elapsed.values()):.0f}s, "
+              f"sequential would be ~{sum(elapsed.values()):.0f}s)", flush=True)
+    print(queue.status(), flush=True)
+    for adapter in adapters.values():
+        if hasattr(adapter, "report"):
+            adapter.report()
+    return elapsed
+
+def export(config: dict) -> str | None:
+    import pandas as pd  # 내보낼 때만 로드
+    rows = SqliteQueue(config["corpus_db"]).all_rows()
+    if not rows:
+        print("[INFO] corpus is empty", flush=True)
+        return None
+    df = pd.DataFrame(rows)
+    # 매체: 뉴스 검색은 출처 자체, SerpAPI/YouTube는 도메인/채널(keyword 칸에 들어 있음)
+    news = df["source"].isin(NEWS_SOURCES)
+    df.insert(1, "outlet", df["source"].where(news, df["keyword"]))
+    df["keyword"] = df["keyword"].where(news, None)
+    dt = pd.to_datetime(df["published"], errors="coerce")
+    df = df.assign(_dt=dt).sort_values(["source", "_dt"], ascending=[True, False]).drop(columns=["_dt"])
+    out = config["output"].format(start=config["start"], end=config["end"])
+    df.to_excel(out, index=False)
+    counts = ", ".join(f"{k} {v}" for k, v in df["outlet"].value_counts().items())
+    print(f"[INFO] saved {len(df)} rows -> {out} ({counts})", flush=True)
+    return out
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Run every news/video source concurrently into one corpus")
+    ap.add_argument("--config", default=None, help="JSON, CONFIG와 같은 모양(덮어쓸 키만)")
+    ap.add_argument("--sources", default=None, help="쉼표 목록, 기본: 설정에서 enabled인 것 전부")
+    ap.add_argument("--start", default=None)
+    ap.add_argument("--end", default=None)
+    ap.add_argument("--export-only", action="store_true", help="크롤 없이 코퍼스만 엑셀로")
+    args = ap.parse_args()
+
+    config = load_config(args.config)
+    if args.start:
+        config["start"] = args.start
+    if args.end:
+        config["end"] = args.end
+    if args.sources:
+        sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    else:
+        sources = [s for s, opts in config["sources"].items() if opts.get("enabled", True)]
+    unknown = [s for s in sources if s not in ADAPTERS]
+    if unknown:
+        raise SystemExit(f"unknown sources: {', '.join(unknown)} (known: {', '.join(ADAPTERS)})")
+
+    if not args.export_only:
+        crawl_all(config, sources)
+    export(config)
@@ -1,7 +1,7 @@
 # pip install requests pandas python-dateutil openpyxl
-import os, time, random, math
-import requests, pandas as pd
-from datetime import datetime, timezone
+import os, time, json, random, math
+import requests
+from datetime import datetime, timedelta, timezone
 from dateutil import parser as du
 
 API_KEY = "" # serpApi apk key
@@ -25,6 +25,21 @@ KEYWORDS = list(dict.fromkeys(KEYWORDS))
 BASE = "https://serpapi.com/search.json"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
+PAGE_NUM = 10                   # 페이지당 결과 수(고정)
+PAGE_CAP = 200                  # 한 창(window)에서 내려갈 최대 결과 수
+# 포화된 창을 쪼개는 단계: 연 → 반기 → 분기 → 월
+SPLIT_MONTHS = [12, 6, 3, 1]
+SPLIT_NAMES  = ["year", "half", "quarter", "month"]
+STATS_FILE = f"serp_window_stats_{DOMAIN}.json"
+
+# 쿼리 계획: "single" = 키워드 전체를 한 intitle:(...)에 / "groups" = 그룹별로 나눠 각각 크롤
+QUERY_MODE = "single"
+MAX_QUERY_WORDS = 32            # 구글 쿼리 단어 수 한도(초과분은 잘림)
+GROUP_MAX_TERMS = 8             # 그룹당 최대 키워드 수(튜닝용)
+# 상위 랭킹을 독차지하는 광범위 키워드 → 단독 그룹으로 분리
+BROAD_KEYWORDS = ['temperature', 'climate', 'warming', 'carbon']
+GROUP_STATS_FILE = f"serp_group_stats_{DOMAIN}.json"
+
 def mdy(d: datetime) -> str:
     return d.strftime("%m/%d/%Y").lstrip("0").replace("/0", "/")
 
@@ -39,10 +54,11 @@ def normalize_date(s: str | None):
     except Exception:
         return None
 
-def fetch_google(q: str, start_idx: int = 0):
+def fetch_google(q: str, start_idx: int = 0, tbs: str | None = None):
     """
     SerpAPI engine=google (웹검색).
     start_idx: 0, 10, 20 ... (구글은 보통 100~200 사이가 실용 한계)
+    tbs: 기간 필터(cdr) — 요청 1회 = 크레딧 1개이므로 한 번에 같이 보낸다
     """
     params = {
         "engine": "google",
@@ -51,43 +67,96 @@ def fetch_google(q: str, start_idx: int = 0):
         "hl": "en",
         "api_key": API_KEY,
         "start": start_idx,   # 10단위
-        "num": 10,            # 고정
-        "tbs": None,          # 아래에서 연도별로 세팅
+        "num": PAGE_NUM,      # 고정
     }
+    if tbs:
+        params["tbs"] = tbs
     r = requests.get(BASE, params=params, headers=HEADERS, timeout=30)
     r.raise_for_status()
     return r.json()
 
-def crawl_year(year: int):
-    y_start = datetime(year, 1, 1, tzinfo=timezone.utc)
-    y_end   = datetime(year, 12, 31, tzinfo=timezone.utc)
-    # 경계년도 보정
-    if year == START.year and y_start < START: y_start = START
-    if year == END.year and y_end > END:       y_end = END
+# -----------------------------
+# 기간 창(window) 분할
+# -----------------------------
+def add_months(d: datetime, months: int) -> datetime:
+    m = d.month - 1 + months
+    return d.replace(year=d.year + m // 12, month=m % 12 + 1, day=1)
 
-    # 기간 필터 (Custom Date Range; 웹검색도 지원)
-    tbs = f"cdr:1,cd_min:{mdy(y_start)},cd_max:{mdy(y_end)}"
+def calendar_chunks(w_start: datetime, w_end: datetime, months: int):
+    """[w_start, w_end]를 달력 기준 months개월 단위(반기/분기/월)로 자른다."""
+    # 달력 경계에 맞춘 첫 구간 시작(예: 반기 → 1월/7월)
+    first = w_start.replace(month=(w_start.month - 1) // months * months + 1, day=1)
+    cur = first
+    while cur <= w_end:
+        nxt = add_months(cur, months)
+        s = max(cur, w_start)
+        e = min(nxt - timedelta(days=1), w_end)
+        yield s, e
+        cur = nxt
 
-    # 제목에 1개 이상 포함: intitle:(kw1|kw2|...)
+# -----------------------------
+# 쿼리 계획(키워드 그룹)
+# -----------------------------
+def quote(k: str) -> str:
     # 괄호/공백 포함 키워드는 큰따옴표로 감싸주자
-    def quote(k): return f'"{k}"' if " " in k or "ñ" in k.lower() else k
-    or_expr = " | ".join(quote(k) for k in KEYWORDS)
-    q = f'site:{DOMAIN} intitle:({or_expr})'
+    return f'"{k}"' if " " in k or "ñ" in k.lower() else k
 
-    seen = set()
+def query_words(keywords: list) -> int:
+    """site: 1개 + 키워드 단어 수 + OR 연산자 수(보수적으로 센다)."""
+    return 1 + sum(len(k.split()) for k in keywords) + max(0, len(keywords) - 1)
+
+def build_query(keywords: list | None = None) -> str:
+    # 제목에 1개 이상 포함: intitle:(kw1|kw2|...)
+    keywords = KEYWORDS if keywords is None else keywords
+    or_expr = " | ".join(quote(k) for k in keywords)
+    return f'site:{DOMAIN} intitle:({or_expr})'
+
+def plan_keyword_groups(keywords: list, max_words: int = MAX_QUERY_WORDS,
+                        max_terms: int = GROUP_MAX_TERMS) -> list:
+    """
+    키워드를 구글 쿼리 한도 안에 들어가는 그룹들로 나눈다.
+    광범위 키워드(BROAD_KEYWORDS)는 드문 키워드를 가리지 않도록 단독 그룹.
+    """
+    broad = {k.lower() for k in BROAD_KEYWORDS}
+    groups = [[k] for k in keywords if k.lower() in broad]
+    cur = []
+    for k in keywords:
+        if k.lower() in broad:
+            continue
+        if cur and (len(cur) >= max_terms or query_words(cur + [k]) > max_words):
+            groups.append(cur)
+            cur = []
+        cur.append(k)
+    if cur:
+        groups.append(cur)
+    return groups
+
+def plan_queries() -> list:
+    """[(그룹 라벨, 쿼리)] — QUERY_MODE에 따라 단일/그룹 쿼리."""
+    if QUERY_MODE == "groups":
+        groups = plan_keyword_groups(KEYWORDS)
+    else:
+        groups = [KEYWORDS]
+    return [(" | ".join(g), build_query(g)) for g in groups]
+
+def crawl_window(q: str, w_start: datetime, w_end: datetime, year: int, seen: set, level: int):
+    """
+    한 기간 창을 페이지 상한(PAGE_CAP)까지 긁는다.
+    모든 페이지가 꽉 차서 상한에 도달하면 saturated=True → 상위에서 더 잘게 쪼갠다.
+    """
+    tbs = f"cdr:1,cd_min:{mdy(w_start)},cd_max:{mdy(w_end)}"
     rows = []
+    pages = results = 0
+    last_full = False
 
-    # start=0,10,20... 페이지네이션 (너무 깊이 들어가면 의미없음 → 200 정도 제한)
-    for start_idx in range(0, 200, 10):
-        payload = fetch_google(q, start_idx=start_idx)
-        # tbs는 params로 못 넣으니 q에 붙이지 말고, serpapi google의 'tbs' 파라미터 지원을 직접 추가
-        # -> 일부 계정에선 전달됨. 안전하게는 다음처럼 재요청:
-        payload = requests.get(BASE, params={
-            "engine":"google","q":q,"gl":"us","hl":"en","api_key":API_KEY,
-            "start":start_idx,"num":10,"tbs":tbs
-        }, headers=HEADERS, timeout=30).json()
+    # start=0,10,20... 페이지네이션 (너무 깊이 들어가면 의미없음 → PAGE_CAP 정도 제한)
+    for start_idx in range(0, PAGE_CAP, PAGE_NUM):
+        payload = fetch_google(q, start_idx=start_idx, tbs=tbs)
+        pages += 1
 
         organic = payload.get("organic_results") or []
+        results += len(organic)
+        last_full = len(organic) >= PAGE_NUM
         if not organic:
             break
 
@@ -100,11 +169,12 @@ def crawl_year(year: int):
                 continue
             if link in seen:
                 continue
-            seen.add(link)
 
             dt = normalize_date(date_raw)
-            if dt is not None and not (y_start <= dt <= y_end):
+            if dt is not None and not (w_start <= dt <= w_end):
                 continue
+            # 기간 밖 결과는 다른 창에서 다시 잡힐 수 있도록 seen에 넣지 않는다
+            seen.add(link)
 
             rows.append({
                 "site": DOMAIN,
@@ -117,17 +187,104 @@ def crawl_year(year: int):
 
         time.sleep(random.uniform(0.4, 0.8))
 
+        # 마지막 페이지가 덜 찼거나 다음 페이지 안내가 없으면 더 볼 것 없음
+        pagination = payload.get("serpapi_pagination")
+        if not last_full or (pagination is not None and not pagination.get("next")):
+            break
+
+    saturated = last_full and pages * PAGE_NUM >= PAGE_CAP
+    stats = {
+        "window_start": w_start.strftime("%Y-%m-%d"),
+        "window_end": w_end.strftime("%Y-%m-%d"),
+        "granularity": SPLIT_NAMES[level],
+        "pages": pages,                 # = 사용 크레딧
+        "results": results,
+        "new_links": len(rows),
+        "links_per_credit": round(len(rows) / pages, 2) if pages else 0.0,
+        "saturated": saturated,
+    }
+    print(f"  [WINDOW] {stats['window_start']}~{stats['window_end']} ({stats['granularity']}) "
+          f"pages={pages} new={len(rows)} saturated={saturated}", flush=True)
+    return rows, stats
+
+def refine_window(q: str, w_start: datetime, w_end: datetime, year: int, seen: set, level: int,
+                  window_stats: list):
+    """포화된 창만 반기 → 분기 → 월로 재귀 분할한다(한산한 창은 굵게 유지)."""
+    rows, stats = crawl_window(q, w_start, w_end, year, seen, level)
+    window_stats.append(stats)
+    if not stats["saturated"]:
+        return rows
+
+    # 다음 단계 중 실제로 2개 이상으로 쪼개지는 단계를 찾는다(부분 연도 보정)
+    for nxt in range(level + 1, len(SPLIT_MONTHS)):
+        children = list(calendar_chunks(w_start, w_end, SPLIT_MONTHS[nxt]))
+        if len(children) > 1:
+            for c_start, c_end in children:
+                rows.extend(refine_window(q, c_start, c_end, year, seen, nxt, window_stats))
+            return rows
+
+    print(f"  [WARN] still saturated at finest granularity: {stats['window_start']}~{stats['window_end']} "
+          f"(results may be truncated)", flush=True)
+    return rows
+
+def crawl_year(year: int, seen: set | None = None, window_stats: list | None = None):
+    y_start = datetime(year, 1, 1, tzinfo=timezone.utc)
+    y_end   = datetime(year, 12, 31, tzinfo=timezone.utc)
+    # 경계년도 보정
+    if year == START.year and y_start < START: y_start = START
+    if year == END.year and y_end > END:       y_end = END
+
+    seen = set() if seen is None else seen
+    window_stats = [] if window_stats is None else window_stats
+
+    # 그룹별로 창을 따로 분할(포화 여부가 그룹마다 다름), 결과는 같은 seen으로 합집합
+    rows = []
+    for label, q in plan_queries():
+        first = len(window_stats)
+        rows.extend(refine_window(q, y_start, y_end, year, seen, 0, window_stats))
+        for st in window_stats[first:]:
+            st["group"] = label
     return rows
 
+def save_window_stats(window_stats: list):
+    with open(STATS_FILE, "w", encoding="utf-8") as f:
+        json.dump(window_stats, f, ensure_ascii=False, indent=2)
+    credits = sum(s["pages"] for s in window_stats)
+    new_links = sum(s["new_links"] for s in window_stats)
+    print(f"[INFO] window stats saved -> {STATS_FILE} "
+          f"(windows={len(window_stats)}, credits={credits}, new_links={new_links})")
+
+def group_report(window_stats: list) -> list:
+    """그룹별 크레딧/신규 링크 집계 — 그룹 구성 튜닝용."""
+    agg = {}
+    for st in window_stats:
+        g = agg.setdefault(st.get("group", "all"), {"group": st.get("group", "all"), "credits": 0, "new_links": 0})
+        g["credits"] += st["pages"]
+        g["new_links"] += st["new_links"]
+    report = sorted(agg.values(), key=lambda g: g["new_links"], reverse=True)
+    for g in report:
+        g["links_per_credit"] = round(g["new_links"] / g["credits"], 2) if g["credits"] else 0.0
+        print(f"  [GROUP] new={g['new_links']:>5} credits={g['credits']:>4} "
+              f"per_credit={g['links_per_credit']:>5} | {g['group']}")
+    with open(GROUP_STATS_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[INFO] group stats saved -> {GROUP_STATS_FILE}")
+    return report
+
 if __name__ == "__main__":
     if not API_KEY or API_KEY == "PUT_YOUR_KEY_HERE":
         raise SystemExit("❌ SERPAPI_API_KEY 설정이 필요합니다.")
 
     all_rows = []
+    seen = set()
+    window_stats = []
     for y in range(START.year, END.year + 1):
         print(f"[INFO] year {y}…", flush=True)
-        all_rows.extend(crawl_year(y))
+        all_rows.extend(crawl_year(y, seen, window_stats))
+    save_window_stats(window_stats)
+    group_report(window_stats)
 
+    import pandas as pd  # 내보낼 때만 로드
     df = pd.DataFrame(all_rows)
     if df.empty:
         print("[INFO] no results")
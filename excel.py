@@ -1,9 +1,8 @@
-import json
 import pandas as pd
+from yt_store import load_records
 
-# JSON 파일 읽기
-with open("temp.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
+# JSON 파일 읽기(컬럼형 스냅샷/예전 dict 형식 모두)
+data = load_records("temp.json")
 
 # JSON → DataFrame 변환
 df = pd.DataFrame(list(data.values()))
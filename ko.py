@@ -1,12 +1,11 @@
-import os
 import time
-import json
 import random
-import pandas as pd
 import re
-from datetime import datetime
-import googleapiclient.discovery
+from datetime import datetime, timedelta
 import googleapiclient.errors
+from yt_traverse import walk_playlist
+from yt_pool import build_client
+from yt_store import VideoStore
 
 # -----------------------------
 # CONFIGURATION
@@ -52,17 +51,15 @@ SAVE_FILE = "news_videos_kbs_1.xlsx"
 # FUNCTIONS
 # -----------------------------
 def load_existing_data():
-    if os.path.exists(TEMP_FILE):
-        with open(TEMP_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    # 컬럼형 저장소(예전 dict-of-dicts temp 파일도 그대로 읽음)
+    return VideoStore.load(TEMP_FILE)
 
 def save_temp_data(data):
-    with open(TEMP_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    data.save(TEMP_FILE)
     print(f"[INFO] Temp data saved ({len(data)} videos)")
 
 def save_final_data(data):
+    import pandas as pd  # 내보낼 때만 로드(크롤/체크포인트만 하는 실행은 pandas/openpyxl 없이 시작)
     if data:
         df = pd.DataFrame(list(data.values()))
         df.to_excel(SAVE_FILE, index=False)
@@ -89,24 +86,23 @@ def get_uploads_playlist_id(youtube, channel_id):
         return None
 
 def fetch_playlist_videos(youtube, playlist_id, channel_name, existing_data):
-    next_page_token = None
     new_count = 0
+    stats = {}
+
+    def list_page(page_token, part):
+        time.sleep(random.uniform(0.3, 0.8))
+        request = youtube.playlistItems().list(
+            part=part,
+            playlistId=playlist_id,
+            maxResults=50,
+            pageToken=page_token
+        )
+        return request.execute()
 
-    while True:
-        try:
-            time.sleep(random.uniform(0.3, 0.8))
-            request = youtube.playlistItems().list(
-                part="snippet",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=next_page_token
-            )
-
-            response = request.execute()
-            items = response.get("items", [])
-
-            # print(items)
-
+    try:
+        # 업로드 목록은 최신순 → START_DATE 이전 페이지에 닿으면 채널 전체를 다 돌지 않고 멈춤
+        # (END_DATE는 날짜 단위 포함이므로 경계는 다음 날 0시)
+        for items in walk_playlist(list_page, START_DATE, END_DATE + timedelta(days=1), stats=stats):
             for item in items:
                 snippet = item["snippet"]
                 video_id = snippet["resourceId"]["videoId"]
@@ -127,24 +123,20 @@ def fetch_playlist_videos(youtube, playlist_id, channel_name, existing_data):
                         new_count += 1
                         print(f"[MATCH] {channel_name} | {upload_date} | {title}")
 
-            next_page_token = response.get("nextPageToken")
-            if not next_page_token:
-                break
-
-        except googleapiclient.errors.HttpError as e:
-            print(f"[ERROR] HTTP Error for playlist {playlist_id}: {e}")
-            break
-        except Exception as e:
-            print(f"[ERROR] Exception for playlist {playlist_id}: {e}")
-            break
+    except googleapiclient.errors.HttpError as e:
+        print(f"[ERROR] HTTP Error for playlist {playlist_id}: {e}")
+    except Exception as e:
+        print(f"[ERROR] Exception for playlist {playlist_id}: {e}")
 
+    print(f"[INFO] {channel_name}: pages={stats.get('pages')} skipped_newer={stats.get('light_pages')} "
+          f"order={stats.get('order')} stopped_early={stats.get('stopped_early')}")
     return new_count
 
 # -----------------------------
 # MAIN
 # -----------------------------
 def main():
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
+    youtube = build_client(API_KEY)
     existing_data = load_existing_data()
     total_new = 0
 
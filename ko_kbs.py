@@ -12,6 +12,9 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import pandas as pd
 
+from news_tuning import load_tuning
+from news_resilience import ResilientGetter, SliceError, retry_slice
+
 # ============================ 설정 ============================
 BASE = "https://reco.kbs.co.kr/v2/search"
 
@@ -19,6 +22,8 @@ GLOBAL_START = "2015.08.01"     # YYYY.MM.DD
 GLOBAL_END   = "2025.08.01"     # YYYY.MM.DD
 
 PAGE_SIZE  = 100                # 가급적 크게
+TUNING = load_tuning("kbs")     # news_calibrate.py 측정값이 있으면 PAGE_SIZE/Accept-Encoding을 덮어씀
+PAGE_SIZE  = TUNING.get("page_size", PAGE_SIZE)
 SLEEP_REQ  = 0.15               # 요청 간 딜레이(초)
 SLEEP_SLICE= 0.25               # 슬라이스 경계 딜레이
 KW_COOLDOWN = (2.0, 4.0)        # 키워드 간 쿨다운(2~4초 랜덤)
@@ -43,18 +48,21 @@ HEADERS = {
 # ======================= 유틸/세션/파서 =======================
 def make_session() -> requests.Session:
     s = requests.Session()
+    # 연결 실패만 여기서 재시도 — 읽기 타임아웃/5xx는 news_resilience(브레이커·헤지)가 짧게 처리
     retries = Retry(
-        total=5, connect=5, read=5,
+        total=2, connect=2, read=0, status=0,
         backoff_factor=0.5,                   # 0.5, 1, 2, 4, ...
-        status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET"],
         raise_on_status=False,
     )
     s.mount("https://", HTTPAdapter(max_retries=retries))
     s.headers.update(HEADERS)
+    if TUNING.get("accept_encoding"):
+        s.headers["Accept-Encoding"] = TUNING["accept_encoding"]
     return s
 
 SESSION = make_session()
+FETCH = ResilientGetter(SESSION, 5, 12)   # (connect, read) — 호스트별 브레이커 + 헤지 + 적응형 read 타임아웃
 
 JSONP_PAYLOAD_RE = re.compile(r'\((\s*{.*}\s*)\)\s*;?\s*$', re.S)
 XSSI_PREFIX_RE   = re.compile(r"^\)\]\}',?\s*")
@@ -115,7 +123,7 @@ def fetch_page(keyword: str, page: int, sdate: str, edate: str,
     }
     url = f"{BASE}?{urlencode(params)}"
 
-    r = SESSION.get(url, timeout=(5, 12))      # (connect, read)
+    r = FETCH.get(url)
     print(f"[DEBUG] {keyword} {sdate}~{edate} tag={tag_type} p={page} -> {r.status_code} len={len(r.text)}", flush=True)
     r.raise_for_status()
     payload = parse_json_or_jsonp(r.text)
@@ -150,39 +158,55 @@ def month_slices(start_str: str, end_str: str):
         cur = next_month
 
 # ========================= 크롤 로직 =========================
-def crawl_one_keyword(keyword: str) -> pd.DataFrame:
+TAGS = ("m", "w")  # 모바일/웹 모두 시도(결과폭 상이할 수 있음)
+
+def crawl_slice(keyword: str, sdate: str, edate: str, tag: str) -> tuple:
+    """한 슬라이스·tag의 모든 페이지 → (rows, 요청 수).
+    요청이 실패하면 SliceError(받은 행 포함)를 올린다(부분 결과를 '끝난 슬라이스'로 넘기지 않도록 — 재시도는 호출 쪽)."""
     all_rows = []
-    for sdate, edate in month_slices(GLOBAL_START, GLOBAL_END):
-        for tag in ("m", "w"):  # 모바일/웹 모두 시도(결과폭 상이할 수 있음)
-            page = 1
-            total_hint = None
-            cap_warned = False
+    page = 1
+    total_hint = None
+    requests_made = 0
 
-            while True:
-                try:
-                    payload = fetch_page(keyword, page, sdate, edate, tag)
-                except Exception as e:
-                    print(f"[WARN] request error: {e}", flush=True)
-                    break
+    while True:
+        requests_made += 1
+        try:
+            payload = fetch_page(keyword, page, sdate, edate, tag)
+        except Exception as e:
+            raise SliceError(e, all_rows, requests_made) from e
+        rows, total = extract_rows(payload, keyword)
 
-                rows, total = extract_rows(payload, keyword)
+        if total_hint is None:
+            total_hint = total
+            if total_hint and total_hint <= 200:
+                print(f"[WARN] possible cap: total_count={total_hint} ({keyword} {sdate}~{edate} tag={tag})", flush=True)
 
-                if total_hint is None:
-                    total_hint = total
-                    if total_hint and total_hint <= 200 and not cap_warned:
-                        print(f"[WARN] possible cap: total_count={total_hint} ({keyword} {sdate}~{edate} tag={tag})", flush=True)
-                        cap_warned = True
+        if not rows:
+            break
 
-                if not rows:
-                    break
+        all_rows.extend(rows)
+        page += 1
 
-                all_rows.extend(rows)
-                page += 1
+        if total_hint and (page - 1) * PAGE_SIZE >= total_hint:
+            break
 
-                if total_hint and (page - 1) * PAGE_SIZE >= total_hint:
-                    break
+        time.sleep(SLEEP_REQ)
+    return all_rows, requests_made
 
-                time.sleep(SLEEP_REQ)
+def crawl_one_keyword(keyword: str) -> pd.DataFrame:
+    all_rows = []
+    for sdate, edate in month_slices(GLOBAL_START, GLOBAL_END):
+        for tag in TAGS:
+            try:
+                rows, _ = retry_slice(crawl_slice, keyword, sdate, edate, tag)
+            except SliceError as e:
+                print(f"[WARN] request error, keeping {len(e.rows)} rows ({keyword} {sdate}~{edate} tag={tag}): {e}",
+                      flush=True)
+                rows = e.rows
+            except Exception as e:
+                print(f"[WARN] request error, slice skipped ({keyword} {sdate}~{edate} tag={tag}): {e}", flush=True)
+                rows = []
+            all_rows.extend(rows)
             time.sleep(SLEEP_SLICE)
 
     df = pd.DataFrame(all_rows)
@@ -247,4 +271,5 @@ if __name__ == "__main__":
         # 키워드 간 쿨다운(레이트리밋 회피)
         time.sleep(random.uniform(*KW_COOLDOWN))
 
+    print(f"[INFO] transport: {FETCH.report()}", flush=True)
     print("[INFO] done.", flush=True)
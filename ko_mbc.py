@@ -8,6 +8,9 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from news_tuning import load_tuning
+from news_resilience import ResilientGetter, SliceError, retry_slice
+
 BASE = "https://searchapi.imnews.imbc.com/search"
 
 KEYWORDS = [
@@ -19,6 +22,8 @@ KEYWORDS = [
 GLOBAL_START = "20150801"
 GLOBAL_END   = "20250801"
 PAGESIZE     = 100
+TUNING       = load_tuning("mbc")   # news_calibrate.py 측정값이 있으면 PAGESIZE/Accept-Encoding을 덮어씀
+PAGESIZE     = TUNING.get("page_size", PAGESIZE)
 REQ_SLEEP    = 0.08
 KW_COOLDOWN  = (0.5, 1.2)
 OUTPUT_XLSX  = f"mbc_titles_{GLOBAL_START}_{GLOBAL_END}.xlsx"
@@ -38,18 +43,21 @@ def log(msg: str):
 
 def make_session():
     s = requests.Session()
+    # 연결 실패만 여기서 재시도 — 읽기 타임아웃/5xx는 news_resilience(브레이커·헤지)가 짧게 처리
     retries = Retry(
-        total=5, connect=5, read=5,
+        total=2, connect=2, read=0, status=0,
         backoff_factor=0.4,
-        status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET"],
         raise_on_status=False,
     )
     s.mount("https://", HTTPAdapter(max_retries=retries))
     s.headers.update(HEADERS)
+    if TUNING.get("accept_encoding"):
+        s.headers["Accept-Encoding"] = TUNING["accept_encoding"]
     return s
 
 SESSION = make_session()
+FETCH = ResilientGetter(SESSION, 4, 10)   # (connect, read) — 호스트별 브레이커 + 헤지 + 적응형 read 타임아웃
 
 JSONP_RE = re.compile(r'^[\w$]+\((.*)\)\s*;?\s*$', re.S)
 def parse_jsonp(text: str) -> dict:
@@ -67,19 +75,19 @@ def parse_jsonp(text: str) -> dict:
 def now_ms():
     return int(time.time() * 1000)
 
-def fetch_page(keyword: str, page: int, startdate: str, enddate: str) -> dict:
+def fetch_page(keyword: str, page: int, startdate: str, enddate: str, pagesize: int = PAGESIZE) -> dict:
     params = {
         "callback": f"search_{now_ms()}",
         "query": keyword,
         "page": page,               # 0,1,2,...
-        "pagesize": PAGESIZE,
+        "pagesize": pagesize,
         "sorttype": "date",
         "startdate": startdate,     # YYYYMMDD
         "enddate": enddate,         # YYYYMMDD
         "_": now_ms(),
     }
     url = f"{BASE}?{urlencode(params)}"
-    r = SESSION.get(url, timeout=(4, 10))
+    r = FETCH.get(url)
     log(f"[PAGE] kw='{keyword}' {startdate}~{enddate} p={page} -> HTTP {r.status_code} len={len(r.text)}")
     r.raise_for_status()
     return parse_jsonp(r.text)
@@ -96,6 +104,24 @@ def month_ranges(start_yyyymmdd: str, end_yyyymmdd: str):
         yield s.strftime("%Y%m%d"), e.strftime("%Y%m%d")
         cur = nxt
 
+def extract_total(payload: dict) -> int | None:
+    """검색 결과 총 건수(result.total). 없으면 다른 총 건수 키를 보되 어느 키였는지 남긴다
+    ("count"처럼 이번 페이지 행 수일 수 있는 키는 보지 않음). 못 찾으면 None."""
+    result = payload.get("result", {}) or {}
+    for where, src in (("result", result), ("payload", payload)):
+        for key in ("total", "totalCount", "total_count", "numFound"):
+            value = src.get(key)
+            if value in (None, ""):
+                continue
+            try:
+                total = int(value)
+            except (TypeError, ValueError):
+                continue
+            if (where, key) != ("result", "total"):
+                log(f"[WARN] MBC total read from {where}.{key}={total} (result.total missing)")
+            return total
+    return None
+
 def extract_rows(payload: dict, keyword: str):
     result = payload.get("result", {}) or {}
     rows = result.get("rows", []) or []
@@ -121,6 +147,39 @@ def extract_rows(payload: dict, keyword: str):
         })
     return out
 
+def crawl_slice(keyword: str, s: str, e: str) -> tuple:
+    """한 월 슬라이스의 모든 페이지(빈 페이지 두 번이면 끝) → (rows, 요청 수).
+    요청이 실패하면 SliceError(받은 행 포함)를 올린다(실패를 빈 페이지로 세면 슬라이스가 일찍 '끝난' 것처럼 보인다)."""
+    collected = []
+    page = 0
+    empty_hits = 0
+    requests_made = 0
+
+    while True:
+        requests_made += 1
+        try:
+            payload = fetch_page(keyword, page, s, e)
+        except Exception as ex:
+            raise SliceError(ex, collected, requests_made) from ex
+        rows = extract_rows(payload, keyword)
+        got = len(rows)
+        log(f"  └─ got={got} rows on page {page}")
+        if got == 0:
+            empty_hits += 1
+            if empty_hits >= 2:
+                log(f"  └─ stop slice (two empty pages)")
+                break
+        else:
+            collected.extend(rows)
+            empty_hits = 0
+
+        page += 1
+        if page >= 1500:   # 안전장치
+            log("  └─ stop slice (page cap reached)")
+            break
+        time.sleep(REQ_SLEEP)
+    return collected, requests_made
+
 def crawl_keyword(keyword: str) -> pd.DataFrame:
     collected = []
     total_added = 0
@@ -129,44 +188,17 @@ def crawl_keyword(keyword: str) -> pd.DataFrame:
     for s, e in month_ranges(GLOBAL_START, GLOBAL_END):
         slice_idx += 1
         log(f"[SLICE] kw='{keyword}' slice#{slice_idx} {s}~{e}")
-
-        page = 0
-        empty_hits = 0
-        added_this_slice = 0
-
-        while True:
-            try:
-                payload = fetch_page(keyword, page, s, e)
-            except Exception as e:
-                log(f"[WARN] request error at p={page}: {e}")
-                empty_hits += 1
-                if empty_hits >= 2:
-                    break
-                page += 1
-                time.sleep(REQ_SLEEP)
-                continue
-
-            rows = extract_rows(payload, keyword)
-            got = len(rows)
-            log(f"  └─ got={got} rows on page {page}")
-            if got == 0:
-                empty_hits += 1
-                if empty_hits >= 2:
-                    log(f"  └─ stop slice (two empty pages)")
-                    break
-            else:
-                collected.extend(rows)
-                total_added += got
-                added_this_slice += got
-                empty_hits = 0
-
-            page += 1
-            if page >= 1500:   # 안전장치
-                log("  └─ stop slice (page cap reached)")
-                break
-            time.sleep(REQ_SLEEP)
-
-        log(f"[SLICE-END] kw='{keyword}' {s}~{e} added={added_this_slice}, total={total_added}")
+        try:
+            rows, _ = retry_slice(crawl_slice, keyword, s, e)
+        except SliceError as ex:
+            log(f"[WARN] request error, keeping {len(ex.rows)} rows ({s}~{e}): {ex}")
+            rows = ex.rows
+        except Exception as ex:
+            log(f"[WARN] request error, slice skipped ({s}~{e}): {ex}")
+            rows = []
+        collected.extend(rows)
+        total_added += len(rows)
+        log(f"[SLICE-END] kw='{keyword}' {s}~{e} added={len(rows)}, total={total_added}")
         time.sleep(REQ_SLEEP)
 
     df = pd.DataFrame(collected)
@@ -195,6 +227,27 @@ def crawl_keyword(keyword: str) -> pd.DataFrame:
     log(f"[KEYWORD-END] kw='{keyword}' final_rows={len(df)}")
     return df[["keyword", "title", "published", "link", "artid"]]
 
+def append_to_excel(path: str, df_new: pd.DataFrame):
+    """기존 엑셀과 합쳐 artid → link → (title,published) 순으로 중복 제거 후 저장."""
+    if os.path.exists(path):
+        try:
+            df_old = pd.read_excel(path, dtype=str)
+        except Exception:
+            df_old = pd.DataFrame(columns=["keyword", "title", "published", "link", "artid"])
+        out = pd.concat([df_old, df_new], ignore_index=True)
+    else:
+        out = df_new.copy()
+    if "artid" in out.columns:
+        has_id = out["artid"].notna() & (out["artid"].astype(str) != "")
+        out = pd.concat([out[has_id].drop_duplicates(subset=["artid"]), out[~has_id]])
+    out["link"] = out["link"].astype(str).str.strip()
+    out = out.drop_duplicates(subset=["link"])
+    out = out.drop_duplicates(subset=["title", "published"])
+    dt = pd.to_datetime(out["published"], errors="coerce", utc=True)
+    out = out.assign(_dt=dt).sort_values(["_dt", "title"], ascending=[False, True]).drop(columns=["_dt"])
+    out.to_excel(path, index=False)
+    return len(out)
+
 # ---------------- main ----------------
 if __name__ == "__main__":
     log(f"[START] saving to {OUTPUT_XLSX}")
@@ -223,3 +276,4 @@ if __name__ == "__main__":
         log(f"[DONE] saved {len(out)} rows -> {OUTPUT_XLSX}")
     else:
         log("[DONE] no results")
+    log(f"[INFO] transport: {FETCH.report()}")
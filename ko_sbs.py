@@ -5,6 +5,10 @@ import requests
 import pandas as pd
 from urllib.parse import urlencode
 from dateutil import parser as dtparser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from news_tuning import load_tuning
 
 BASE = "https://searchapi.news.sbs.co.kr/search/news"
 
@@ -15,6 +19,8 @@ SECTION_CD = "01,02,03,07,08,09,14"     # 필요시 조정
 SEARCH_FIELD = "all"
 COLLECTION = "news_sbs"
 PAGE_SIZE = 100
+TUNING = load_tuning("sbs")     # news_calibrate.py 측정값이 있으면 PAGE_SIZE/Accept-Encoding을 덮어씀
+PAGE_SIZE = TUNING.get("page_size", PAGE_SIZE)
 SLEEP = 0.25
 
 OUTPUT_XLSX = f"sbs_titles_{START_DATE}_to_{END_DATE}.xlsx"
@@ -31,8 +37,27 @@ HEADERS = {
     "Accept": "application/json",
     "Referer": "https://news.sbs.co.kr/news/search/main.do",
     "Origin": "https://news.sbs.co.kr",
+    "Connection": "keep-alive",
 }
 
+def make_session() -> requests.Session:
+    """요청마다 새 연결을 맺지 않도록 세션 하나를 재사용(재시도는 다른 크롤러와 같은 방식)."""
+    s = requests.Session()
+    retries = Retry(
+        total=3, connect=3, read=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    s.mount("https://", HTTPAdapter(max_retries=retries))
+    s.headers.update(HEADERS)
+    if TUNING.get("accept_encoding"):
+        s.headers["Accept-Encoding"] = TUNING["accept_encoding"]
+    return s
+
+SESSION = make_session()
+
 def normalize_date(s: str) -> str | None:
     if not s:
         return None
@@ -43,11 +68,12 @@ def normalize_date(s: str) -> str | None:
         # 다른 필드로 재시도할 수 있게 None
         return None
 
-def fetch_page(query: str, offset: int, limit: int = PAGE_SIZE) -> dict:
+def fetch_page(query: str, offset: int, limit: int = PAGE_SIZE,
+               start_date: str = START_DATE, end_date: str = END_DATE) -> dict:
     params = {
         "query": query,
-        "startDate": START_DATE,
-        "endDate": END_DATE,
+        "startDate": start_date,    # YYYY-MM-DD
+        "endDate": end_date,
         "searchField": SEARCH_FIELD,
         "sectionCd": SECTION_CD,
         "collection": COLLECTION,
@@ -56,10 +82,16 @@ def fetch_page(query: str, offset: int, limit: int = PAGE_SIZE) -> dict:
         # "sort": "date.desc",  # 필요 시 정렬 지정
     }
     url = f"{BASE}?{urlencode(params, safe=',')}"
-    r = requests.get(url, headers=HEADERS, timeout=20)
+    r = SESSION.get(url, timeout=20)
     r.raise_for_status()
     return r.json()
 
+def extract_total(payload: dict) -> int | None:
+    total = payload.get("total")
+    if total is None:
+        total = payload.get("numFound")
+    return int(total) if total is not None else None
+
 def extract_rows(payload: dict):
     items = payload.get("news_sbs", []) or []
     rows = []
@@ -73,21 +105,28 @@ def extract_rows(payload: dict):
         rows.append({"title": title, "published": d, "link": link})
     return rows
 
-def crawl_one_keyword(query: str) -> pd.DataFrame:
+def crawl_slice(query: str, start_date: str = START_DATE, end_date: str = END_DATE) -> tuple:
+    """기간 하나의 모든 페이지 → (rows, 요청 수)."""
     all_rows = []
     offset = 0
+    requests_made = 0
     while True:
-        payload = fetch_page(query, offset)
+        requests_made += 1
+        payload = fetch_page(query, offset, start_date=start_date, end_date=end_date)
         rows = extract_rows(payload)
         if not rows:
             break
         all_rows.extend(rows)
         offset += PAGE_SIZE
 
-        total = payload.get("total") or payload.get("numFound")
-        if total is not None and offset >= int(total):
+        total = extract_total(payload)
+        if total is not None and offset >= total:
             break
         time.sleep(SLEEP)
+    return all_rows, requests_made
+
+def crawl_one_keyword(query: str) -> pd.DataFrame:
+    all_rows, _ = crawl_slice(query)
 
     df = pd.DataFrame(all_rows)
     if df.empty:
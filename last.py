@@ -1,16 +1,18 @@
-import os
 import time
-import json
 import random
-import pandas as pd
 from datetime import datetime, timedelta
-import googleapiclient.discovery
 import googleapiclient.errors
+from yt_quota import QuotaExhausted, CrawlState, run_with_resume
+from yt_pool import YouTubeClientPool
+from yt_cache import ResponseCache
+from yt_enrich import enrich_videos
+from yt_store import VideoStore
 
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
 API_KEY = ""
+API_KEYS = [API_KEY]                    # 프로젝트 키를 여러 개 넣으면 남은 예산 순으로 분산
 
 CHANNELS = {
     # 'UCBi2mrWuNuyYy4gbM6fU18Q': "ABC 뉴스"
@@ -28,22 +30,36 @@ END_DATE = datetime(2015, 8, 1)
 
 TEMP_FILE = "temp.json"
 SAVE_FILE = "news_videos_kbs_1.xlsx"
+STATE_FILE = "crawl_state_search.json"  # 쿼터 소진 시 재개 지점(구간 + pageToken)
+
+AUTO_RESUME = True                      # 쿼터 소진 → 태평양 자정 리셋 후 자동 재개
+ENRICH = True                           # 수집 후 videos.list(50개씩)로 길이/조회수/태그 보강
+RESPONSE_CACHE = True                   # 응답을 ETag와 저장 → 재실행 시 If-None-Match, 304면 캐시 응답
+CACHE_FILE = "yt_cache.sqlite"
+CACHE_MAX_AGE = 0                       # 초. 0이면 항상 재검증, >0이면 그 안의 응답은 요청 없이 사용
+
+# search().list는 쿼리당 ~500개까지만 페이지를 넘겨준다 → 구간 폭을 적응적으로 조정
+SEARCH_RESULT_CAP = 500                 # 쿼리당 받을 수 있는 최대 결과 수
+SEARCH_PAGE_CAP = 10                    # = 500 / maxResults(50)
+TRUNCATION_HINT = 450                   # 이만큼 받고 멈췄는데 totalResults가 더 크면 잘린 것으로 봄
+TARGET_RESULTS = 400                    # 구간당 목표 결과 수(상한보다 약간 작게)
+INITIAL_WINDOW_DAYS = 90
+MIN_WINDOW = timedelta(hours=6)
+MAX_WINDOW = timedelta(days=730)
 
 # -----------------------------
 # FUNCTIONS
 # -----------------------------
 def load_existing_data():
-    if os.path.exists(TEMP_FILE):
-        with open(TEMP_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    # 컬럼형 저장소(예전 dict-of-dicts temp 파일도 그대로 읽음)
+    return VideoStore.load(TEMP_FILE)
 
 def save_temp_data(data):
-    with open(TEMP_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    data.save(TEMP_FILE)
     print(f"[INFO] Temp data saved ({len(data)} videos)")
 
 def save_final_data(data):
+    import pandas as pd  # 내보낼 때만 로드(크롤/체크포인트만 하는 실행은 pandas/openpyxl 없이 시작)
     if data:
         df = pd.DataFrame(list(data.values()))
         df.sort_values("UploadDate", inplace=True)
@@ -59,20 +75,41 @@ def keyword_filter(title):
             return True
     return False
 
-def fetch_videos(youtube, channel_id, channel_name, existing_data):
-    # 3개월 단위로 구간 쪼개기
-    delta = timedelta(days=90)
-    current_start = START_DATE
+def parse_published(published_at: str) -> datetime:
+    return datetime.fromisoformat(published_at.replace("Z", ""))
+
+def next_delta(delta: timedelta, total: int) -> timedelta:
+    """직전 구간의 totalResults로 다음 구간 폭을 맞춘다(한산하면 넓히고 붐비면 좁힘)."""
+    # 넓힐 때는 최대 2배씩만(방금 쪼갠 붐비는 구간으로 다시 뛰어들지 않도록)
+    scale = min(TARGET_RESULTS / max(total, 1), 2.0)
+    return min(max(delta * scale, MIN_WINDOW), MAX_WINDOW)
+
+def fetch_videos(pool, state, channel_id, channel_name, existing_data):
+    # 구간 폭은 고정 90일이 아니라 결과 밀도에 맞춰 적응적으로 조정
+    task = f"search:{channel_id}"
+    saved = state.get(task)
+    current_start = datetime.fromisoformat(saved["window_start"]) if saved.get("window_start") else START_DATE
+    current_end = datetime.fromisoformat(saved["window_end"]) if saved.get("window_end") else None
+    delta = timedelta(days=saved.get("delta_days", INITIAL_WINDOW_DAYS))
+    resume_token = saved.get("page_token")
     total_new = 0
 
     while current_start < END_DATE:
-        current_end = min(current_start + delta, END_DATE)
-        next_page_token = None
+        if current_end is None:
+            current_end = min(current_start + delta, END_DATE)
+        next_page_token, resume_token = resume_token, None
+        state.update(task, window_start=current_start.isoformat(), window_end=current_end.isoformat(),
+                     delta_days=delta / timedelta(days=1), page_token=next_page_token)
+
+        pages = fetched = 0
+        total = None
+        oldest = None
+        outcome = "done"
 
         while True:
             try:
                 time.sleep(random.uniform(0.3, 0.8))
-                request = youtube.search().list(
+                response = pool.execute("search.list", lambda yt: yt.search().list(
                     part="snippet",
                     channelId=channel_id,
                     type="video",
@@ -81,9 +118,12 @@ def fetch_videos(youtube, channel_id, channel_name, existing_data):
                     publishedBefore=current_end.isoformat("T") + "Z",
                     maxResults=50,
                     pageToken=next_page_token
-                )
-                response = request.execute()
+                ))
                 items = response.get("items", [])
+                pages += 1
+                fetched += len(items)
+                if total is None:
+                    total = int((response.get("pageInfo") or {}).get("totalResults", 0) or 0)
 
                 for item in items:
                     video_id = item["id"]["videoId"]
@@ -91,6 +131,8 @@ def fetch_videos(youtube, channel_id, channel_name, existing_data):
                     title = snippet["title"]
                     upload_date = snippet["publishedAt"].replace("Z", "")
                     url = f"https://www.youtube.com/watch?v={video_id}"
+                    upload_dt = parse_published(snippet["publishedAt"])
+                    oldest = upload_dt if oldest is None else min(oldest, upload_dt)
 
                     if video_id not in existing_data and keyword_filter(title):
                         existing_data[video_id] = {
@@ -102,10 +144,26 @@ def fetch_videos(youtube, channel_id, channel_name, existing_data):
                         total_new += 1
                         print(f"[MATCH] {channel_name} | {upload_date} | {title}")
 
+                # 첫 페이지부터 상한 초과가 예상되면 더 넘기지 말고 구간을 쪼갠다
+                if (pages == 1 and next_page_token is None and total > SEARCH_RESULT_CAP
+                        and current_end - current_start > MIN_WINDOW):
+                    outcome = "bisect"
+                    break
+
                 next_page_token = response.get("nextPageToken")
                 if not next_page_token:
+                    # 토큰 없이 끝났어도 상한 근처에서 멈췄다면 잘린 것
+                    if fetched >= TRUNCATION_HINT and total > fetched:
+                        outcome = "truncated"
                     break
+                if pages >= SEARCH_PAGE_CAP:
+                    outcome = "truncated"
+                    break
+                state.update(task, page_token=next_page_token)
 
+            except QuotaExhausted:
+                # 구간 + 다음 페이지 토큰이 state에 남아 있으므로 리셋 후 여기서부터 재개
+                raise
             except googleapiclient.errors.HttpError as e:
                 print(f"[ERROR] HTTP Error: {e}")
                 break
@@ -113,24 +171,64 @@ def fetch_videos(youtube, channel_id, channel_name, existing_data):
                 print(f"[ERROR] Exception: {e}")
                 break
 
-        current_start = current_end
-
+        print(f"  [WINDOW] {current_start:%Y-%m-%d %H:%M}~{current_end:%Y-%m-%d %H:%M} "
+              f"total~{total} fetched={fetched} calls={pages} -> {outcome}", flush=True)
+
+        if outcome == "bisect":
+            # 예상 결과가 TARGET_RESULTS 안에 들어오도록 최소 절반 이상 줄여 다시
+            factor = max(2.0, total / TARGET_RESULTS)
+            delta = max((current_end - current_start) / factor, MIN_WINDOW)
+            current_end = current_start + delta
+            continue
+        if outcome == "truncated" and oldest is not None and oldest > current_start:
+            # order=date(최신순)이므로 받은 것 중 가장 오래된 시각까지로 줄이면 이어받기가 된다
+            current_end = oldest + timedelta(seconds=1)
+            delta = max(delta / 2, MIN_WINDOW)
+            continue
+
+        if total is not None:
+            delta = next_delta(current_end - current_start, total)
+        current_start, current_end = current_end, None
+
+    state.mark_done(task)
     return total_new
 
 # -----------------------------
 # MAIN
 # -----------------------------
 def main():
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
+    cache = ResponseCache(CACHE_FILE, CACHE_MAX_AGE) if RESPONSE_CACHE else None
+    pool = YouTubeClientPool(API_KEYS, cache=cache)
+    state = CrawlState(STATE_FILE)
     existing_data = load_existing_data()
     total_new = 0
 
-    for channel_id, channel_name in CHANNELS.items():
-        print(f"[INFO] Processing channel: {channel_name}")
-        new_videos = fetch_videos(youtube, channel_id, channel_name, existing_data)
-        total_new += new_videos
+    def checkpoint():
         save_temp_data(existing_data)
-
+        state.save()
+
+    def crawl():
+        nonlocal total_new
+        for channel_id, channel_name in CHANNELS.items():
+            if state.is_done(f"search:{channel_id}"):
+                continue
+            print(f"[INFO] Processing channel: {channel_name}")
+            new_videos = fetch_videos(pool, state, channel_id, channel_name, existing_data)
+            total_new += new_videos
+            checkpoint()
+
+        if ENRICH:
+            enrich_videos(pool, existing_data)
+            checkpoint()
+        return True
+
+    finished = run_with_resume(crawl, on_pause=checkpoint, auto_resume=AUTO_RESUME)
+    pool.report()
+    if not finished:
+        print("[INFO] Paused on quota. Re-run to resume from the saved page token.")
+        return
+
+    state.clear()
     print(f"[INFO] Crawling completed. Total new videos added: {total_new}")
     save_final_data(existing_data)
 
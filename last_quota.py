@@ -1,16 +1,20 @@
-import os
 import time
-import json
 import random
-import pandas as pd
 from datetime import datetime
-import googleapiclient.discovery
 import googleapiclient.errors
+from yt_quota import QuotaExhausted, CrawlState, run_with_resume
+from yt_pool import YouTubeClientPool
+from yt_cache import ResponseCache
+from yt_enrich import enrich_videos, get_uploads_playlist_ids
+from yt_traverse import walk_playlist
+from yt_watermark import Watermarks
+from yt_store import VideoStore
 
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
 API_KEY = ""
+API_KEYS = [API_KEY]                    # 프로젝트 키를 여러 개 넣으면 남은 예산 순으로 분산
 
 CHANNELS = {
     # 'UCBi2mrWuNuyYy4gbM6fU18Q': "ABC News",
@@ -24,22 +28,29 @@ END_DATE = datetime(2024, 3, 7)
 
 TEMP_FILE = "temp.json"
 SAVE_FILE = "news_videos_abc.xlsx"
+STATE_FILE = "crawl_state_uploads.json" # 쿼터 소진 시 재개 지점(pageToken)
+
+AUTO_RESUME = True                      # 쿼터 소진 → 태평양 자정 리셋 후 자동 재개
+ENRICH = True                           # 수집 후 videos.list(50개씩)로 길이/조회수/태그 보강
+RESPONSE_CACHE = True                   # 응답을 ETag와 저장 → 재실행 시 If-None-Match, 304면 캐시 응답
+CACHE_FILE = "yt_cache.sqlite"
+CACHE_MAX_AGE = 0                       # 초. 0이면 항상 재검증, >0이면 그 안의 응답은 요청 없이 사용
+INCREMENTAL = True                      # 재생목록별 워터마크까지만 넘김(이미 본 영상에 닿으면 멈춤)
+WATERMARK_FILE = "watermarks_uploads.json"
 
 # -----------------------------
 # FUNCTIONS
 # -----------------------------
 def load_existing_data():
-    if os.path.exists(TEMP_FILE):
-        with open(TEMP_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    # 컬럼형 저장소(예전 dict-of-dicts temp 파일도 그대로 읽음)
+    return VideoStore.load(TEMP_FILE)
 
 def save_temp_data(data):
-    with open(TEMP_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    data.save(TEMP_FILE)
     print(f"[INFO] Temp data saved ({len(data)} videos)")
 
 def save_final_data(data):
+    import pandas as pd  # 내보낼 때만 로드(크롤/체크포인트만 하는 실행은 pandas/openpyxl 없이 시작)
     if data:
         df = pd.DataFrame(list(data.values()))
         df.to_excel(SAVE_FILE, index=False)
@@ -54,37 +65,30 @@ def keyword_filter(title):
             return True
     return False
 
-def get_uploads_playlist_id(youtube, channel_id):
-    try:
-        request = youtube.channels().list(
-            part="contentDetails",
-            id=channel_id
-        )
-        response = request.execute()
-        return response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
-    except Exception as e:
-        print(f"[ERROR] Cannot get uploads playlist for channel {channel_id}: {e}")
-        return None
-
-def fetch_playlist_videos(youtube, playlist_id, channel_name, existing_data):
-    next_page_token = None
+def fetch_playlist_videos(pool, state, marks, playlist_id, channel_name, existing_data):
+    task = f"uploads:{playlist_id}"
     new_count = 0
-    done_old_videos = False
-
-    while True:
-        try:
-            time.sleep(random.uniform(0.3, 0.8))
-            request = youtube.playlistItems().list(
-                part="snippet",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=next_page_token
-            )
-            response = request.execute()
-            items = response.get("items", [])
-
-            # --- 오래된 순으로 가져오기 위해 reverse 적용 ---
-            for item in reversed(items):
+    stats = {}
+    complete = False
+
+    def list_page(page_token, part):
+        time.sleep(random.uniform(0.3, 0.8))
+        return pool.execute("playlistItems.list", lambda yt: yt.playlistItems().list(
+            part=part,
+            playlistId=playlist_id,
+            maxResults=50,
+            pageToken=page_token
+        ))
+
+    try:
+        # 업로드 목록은 최신순 → 정렬을 확인하면 START_DATE 이전 페이지에서 바로 멈춤
+        pages = walk_playlist(list_page, START_DATE, END_DATE,
+                              page_token=state.get(task).get("page_token"),
+                              on_page=lambda tok: state.update(task, page_token=tok),
+                              stats=stats,
+                              watermark=marks.get(task, START_DATE) if INCREMENTAL else None)
+        for items in pages:
+            for item in items:
                 snippet = item["snippet"]
                 video_id = snippet["resourceId"]["videoId"]
                 title = snippet["title"]
@@ -92,10 +96,7 @@ def fetch_playlist_videos(youtube, playlist_id, channel_name, existing_data):
                 upload_dt = datetime.fromisoformat(upload_date)
                 url = f"https://www.youtube.com/watch?v={video_id}"
 
-                # 날짜 필터링
-                if upload_dt < START_DATE:
-                    done_old_videos = True
-                    break
+                # 날짜 필터링(페이지 안 순서와 무관하게 항목마다 판단)
                 if START_DATE <= upload_dt <= END_DATE:
                     if video_id not in existing_data and keyword_filter(title):
                         existing_data[video_id] = {
@@ -106,41 +107,73 @@ def fetch_playlist_videos(youtube, playlist_id, channel_name, existing_data):
                         }
                         new_count += 1
                         print(f"[MATCH] {channel_name} | {upload_date} | {title}")
+        complete = True
 
-            if done_old_videos:
-                break
-
-            next_page_token = response.get("nextPageToken")
-            if not next_page_token:
-                break
-
-        except googleapiclient.errors.HttpError as e:
-            print(f"[ERROR] HTTP Error for playlist {playlist_id}: {e}")
-            break
-        except Exception as e:
-            print(f"[ERROR] Exception for playlist {playlist_id}: {e}")
-            break
-
+    except QuotaExhausted:
+        # 다음 페이지 토큰은 state에 남아 있으므로 리셋 후 여기서부터 재개
+        raise
+    except googleapiclient.errors.HttpError as e:
+        print(f"[ERROR] HTTP Error for playlist {playlist_id}: {e}")
+    except Exception as e:
+        print(f"[ERROR] Exception for playlist {playlist_id}: {e}")
+
+    print(f"[INFO] {channel_name}: pages={stats.get('pages')} skipped_newer={stats.get('light_pages')} "
+          f"order={stats.get('order')} stopped_early={stats.get('stopped_early')} "
+          f"stopped_at_mark={stats.get('stopped_at_mark')}")
+    if complete:
+        # 끝까지(또는 워터마크까지) 본 경우에만 워터마크 전진
+        marks.advance(task, stats.get("newest"), stats.get("order"), start=START_DATE)
+    state.mark_done(task)
     return new_count
 
 # -----------------------------
 # MAIN
 # -----------------------------
 def main():
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
+    cache = ResponseCache(CACHE_FILE, CACHE_MAX_AGE) if RESPONSE_CACHE else None
+    pool = YouTubeClientPool(API_KEYS, cache=cache)
+    state = CrawlState(STATE_FILE)
+    marks = Watermarks(WATERMARK_FILE)
     existing_data = load_existing_data()
     total_new = 0
 
-    for channel_id, channel_name in CHANNELS.items():
-        print(f"[INFO] Processing channel: {channel_name}")
-        playlist_id = get_uploads_playlist_id(youtube, channel_id)
-        if not playlist_id:
-            continue
-
-        new_videos = fetch_playlist_videos(youtube, playlist_id, channel_name, existing_data)
-        total_new += new_videos
+    def checkpoint():
+        # 워터마크는 데이터와 같은 시점에 저장(데이터 없이 워터마크만 앞서 나가지 않도록)
         save_temp_data(existing_data)
-
+        state.save()
+        marks.save()
+
+    def crawl():
+        nonlocal total_new
+        # 업로드 재생목록 ID는 channels.list 한 번(최대 50채널)으로 조회
+        todo = [cid for cid in CHANNELS if not state.is_done(f"channel:{cid}")]
+        uploads = get_uploads_playlist_ids(pool, todo) if todo else {}
+        for channel_id, channel_name in CHANNELS.items():
+            task = f"channel:{channel_id}"
+            if state.is_done(task):
+                continue
+            print(f"[INFO] Processing channel: {channel_name}")
+            playlist_id = uploads.get(channel_id)
+            if not playlist_id:
+                continue
+
+            new_videos = fetch_playlist_videos(pool, state, marks, playlist_id, channel_name, existing_data)
+            total_new += new_videos
+            state.mark_done(task)
+            checkpoint()
+
+        if ENRICH:
+            enrich_videos(pool, existing_data)
+            checkpoint()
+        return True
+
+    finished = run_with_resume(crawl, on_pause=checkpoint, auto_resume=AUTO_RESUME)
+    pool.report()
+    if not finished:
+        print("[INFO] Paused on quota. Re-run to resume from the saved page token.")
+        return
+
+    state.clear()
     print(f"[INFO] Crawling completed. Total new videos added: {total_new}")
     save_final_data(existing_data)
 
@@ -0,0 +1,170 @@
+# pip install numpy pandas openpyxl
+# 제목 근접 중복 탐지(MinHash + LSH): [속보]/[단독] 같은 태그나 약간 고친 제목, 다른 URL로 다시 올라온 같은 기사를 묶는다
+# - 정규화(괄호 태그/문장부호/공백 제거) → 문자 n-gram(한국어에 맞음) → MinHash 서명 → LSH 밴드로 후보만 비교
+# - 결과: cluster_id(같은 이야기 묶음), cluster_size
+# 사용: python near_duplicate.py out.xlsx kbs_titles.xlsx mbc_titles.xlsx sbs_titles.xlsx news_videos.xlsx
+import re
+import sys
+import time
+import zlib
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+# ============================ 설정 ============================
+NGRAM = 3                       # 문자 n-gram(공백 제거 후)
+NUM_PERM = 64                   # MinHash 해시 함수 수
+BANDS = 16                      # LSH 밴드 수(밴드당 행 = NUM_PERM / BANDS)
+SIM_THRESHOLD = 0.6             # 후보 쌍을 같은 묶음으로 볼 최소 추정 Jaccard
+CHUNK = 10_000                  # 서명 계산 단위(제목 수) — 메모리 ≈ CHUNK × 평균 n-gram 수 × NUM_PERM × 8B
+SEED = 42
+
+DROP_DUPLICATES = False         # True면 묶음마다 첫 행만 남김
+
+# 앞/뒤/중간의 괄호 태그: [속보] [단독] (종합) 【영상】 <포토> ...
+BRACKET_TAG_RE = re.compile(r"\[[^\]]*\]|\([^)]*\)|【[^】]*】|<[^>]*>|〈[^〉]*〉|《[^》]*》")
+NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+_P = np.uint64((1 << 31) - 1)   # 해시 값(crc32 < 2^32) × a(< 2^31)가 uint64를 넘지 않도록
+
+# ============================ 정규화/서명 ============================
+def normalize_title(title: str) -> str:
+    """괄호 태그, 문장부호, 공백을 지우고 소문자로(NFKC로 전각/반각 통일)."""
+    s = unicodedata.normalize("NFKC", str(title or ""))
+    s = BRACKET_TAG_RE.sub(" ", s)
+    return NON_WORD_RE.sub("", s).lower()
+
+def shingles(norm: str, n: int = NGRAM) -> list:
+    if not norm:
+        return []
+    if len(norm) <= n:
+        return [zlib.crc32(norm.encode("utf-8"))]
+    return list({zlib.crc32(norm[i:i + n].encode("utf-8")) for i in range(len(norm) - n + 1)})
+
+def _permutations(num_perm: int, seed: int) -> tuple:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_P), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_P), size=num_perm, dtype=np.uint64)
+    return a, b
+
+def minhash_signatures(titles: list, num_perm: int = NUM_PERM, seed: int = SEED) -> tuple:
+    """
+    제목들 → (서명 n×num_perm uint32, 비어 있지 않은지 n bool).
+    청크마다 n-gram 해시를 한 배열로 이어 붙여 (a·h + b) mod p를 한 번에 계산하고
+    제목 경계별 최솟값은 np.minimum.reduceat으로 구한다(제목마다 파이썬 루프 없음).
+    """
+    a, b = _permutations(num_perm, seed)
+    n = len(titles)
+    sig = np.full((n, num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    valid = np.zeros(n, dtype=bool)
+    for lo in range(0, n, CHUNK):
+        sh = [shingles(normalize_title(t)) for t in titles[lo:lo + CHUNK]]
+        lens = np.fromiter((len(x) for x in sh), dtype=np.int64, count=len(sh))
+        nonempty = lens > 0
+        if not nonempty.any():
+            continue
+        flat = np.fromiter((h for x in sh for h in x), dtype=np.uint64, count=int(lens.sum()))
+        starts = np.concatenate(([0], np.cumsum(lens)[:-1]))[nonempty]
+        hashed = (flat[:, None] * a[None, :] + b[None, :]) % _P
+        rows = np.flatnonzero(nonempty) + lo
+        sig[rows] = np.minimum.reduceat(hashed, starts, axis=0).astype(np.uint32)
+        valid[rows] = True
+    return sig, valid
+
+# ============================ LSH / 묶음 ============================
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = np.arange(n)
+
+    def find(self, x: int) -> int:
+        p = self.parent
+        while p[x] != x:
+            p[x] = p[p[x]]
+            x = p[x]
+        return x
+
+    def union(self, x: int, y: int):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)   # 먼저 나온 행이 대표
+
+def lsh_clusters(sig: np.ndarray, valid: np.ndarray, bands: int = BANDS,
+                 threshold: float = SIM_THRESHOLD, seed: int = SEED) -> np.ndarray:
+    """
+    밴드마다 같은 버킷에 든 행을 버킷 첫 행과만 비교(별 모양) → O(n) 비교로 후보 쌍 검증.
+    추정 Jaccard(서명 일치 비율) ≥ threshold인 쌍을 합쳐 묶음 번호(0..)를 매긴다.
+    """
+    n, num_perm = sig.shape
+    rows = num_perm // bands
+    mult = np.random.default_rng(seed + 1).integers(1, 2 ** 63, size=rows, dtype=np.uint64) | np.uint64(1)
+    idx = np.flatnonzero(valid)
+    uf = _UnionFind(n)
+    pairs_checked = pairs_merged = 0
+
+    with np.errstate(over="ignore"):     # uint64 곱/합은 2^64로 감싸지는 게 의도
+        for band in range(bands):
+            block = sig[idx, band * rows:(band + 1) * rows].astype(np.uint64)
+            keys = (block * mult).sum(axis=1)
+            order = np.argsort(keys, kind="stable")
+            sk = keys[order]
+            new_group = np.concatenate(([True], sk[1:] != sk[:-1]))
+            group_start = np.maximum.accumulate(np.where(new_group, np.arange(len(sk)), 0))
+            member = ~new_group
+            if not member.any():
+                continue
+            rep = idx[order[group_start[member]]]
+            other = idx[order[member]]
+            sim = (sig[rep] == sig[other]).mean(axis=1)
+            ok = sim >= threshold
+            pairs_checked += len(rep)
+            pairs_merged += int(ok.sum())
+            for x, y in zip(rep[ok].tolist(), other[ok].tolist()):
+                uf.union(x, y)
+
+    roots = np.fromiter((uf.find(i) for i in range(n)), dtype=np.int64, count=n)
+    _, labels = np.unique(roots, return_inverse=True)
+    # 등장 순서대로 번호 다시 매기기(첫 행의 묶음이 0)
+    first = {}
+    out = np.fromiter((first.setdefault(l, len(first)) for l in labels.tolist()), dtype=np.int64, count=n)
+    print(f"[DEDUP] {n} titles: {pairs_checked} candidate pairs checked, {pairs_merged} merged, "
+          f"{len(first)} clusters", flush=True)
+    return out
+
+def cluster_titles(titles: list) -> np.ndarray:
+    sig, valid = minhash_signatures(titles)
+    return lsh_clusters(sig, valid)
+
+def add_clusters(df, title_col: str = "title"):
+    """DataFrame에 cluster_id/cluster_size 열을 붙인다."""
+    labels = cluster_titles(df[title_col].astype(str).tolist())
+    df = df.assign(cluster_id=labels)
+    df["cluster_size"] = df.groupby("cluster_id")["cluster_id"].transform("size")
+    return df
+
+# ============================ 실행 ============================
+def load_titles(paths: list):
+    import pandas as pd
+    frames = []
+    for path in paths:
+        df = pd.read_excel(path, dtype=str)
+        col = "title" if "title" in df.columns else "Title"
+        if col not in df.columns:
+            raise ValueError(f"{path}: 'title'/'Title' 컬럼이 없습니다.")
+        frames.append(df.rename(columns={col: "title"}).assign(source=Path(path).stem))
+    return pd.concat(frames, ignore_index=True)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: python near_duplicate.py out.xlsx in1.xlsx [in2.xlsx ...]")
+        sys.exit(1)
+    out_path, in_paths = sys.argv[1], sys.argv[2:]
+    df = load_titles(in_paths)
+    t0 = time.perf_counter()
+    df = add_clusters(df)
+    print(f"[DEDUP] clustered {len(df)} titles in {time.perf_counter() - t0:.1f}s")
+    if DROP_DUPLICATES:
+        df = df.drop_duplicates(subset=["cluster_id"], keep="first")
+    df.sort_values(["cluster_size", "cluster_id"], ascending=[False, True]).to_excel(out_path, index=False)
+    print(f"[INFO] rows: {len(df)}  rows in multi-title clusters: {(df['cluster_size'] > 1).sum()}")
+    print(f"[INFO] saved to  : {out_path}")
@@ -0,0 +1,197 @@
+# pip install requests pandas openpyxl urllib3 python-dateutil
+# 출처별 페이지 크기/전송 보정: 한 번 돌려 news_tuning.json에 저장 → ko_kbs/ko_mbc/ko_sbs가 import 시 읽는다
+# - 페이지 크기: 기준 크기(100)로 받은 링크 목록과 같은 결과를 주는 가장 큰 크기(1페이지 + 가능하면 2페이지 비교)
+# - 압축: identity / gzip / br(디코더가 있을 때)마다 실제 전송 바이트를 재서 가장 작은 것
+# - keep-alive: 보정 동안 새로 맺은 연결 수(1이면 재사용 중)
+# - 보고: 행당 바이트, 요청당 행
+# 사용: python news_calibrate.py [--sources kbs,mbc,sbs] [--keyword 기후] [--month 2025-07]
+import time
+import argparse
+from datetime import datetime, timedelta
+
+import urllib3
+
+import ko_kbs
+import ko_mbc
+import ko_sbs
+from news_tuning import save_tuning, TUNING_FILE
+
+# ============================ 설정 ============================
+BASELINE = 100                             # 기준 페이지 크기(지금까지 쓰던 값)
+CANDIDATES = [200, 300, 500, 1000, 2000]   # 작은 것부터 시험, 처음 실패하면 멈춤
+CONSISTENCY = 0.98                         # 기준 목록과 겹쳐야 하는 비율(같은 날짜 안 순서는 바뀔 수 있음)
+PROBE_KEYWORD = "기후"
+PROBE_MONTH = "2025-07"                    # 건수가 넉넉한 달
+SLEEP = 0.3
+
+ENCODINGS = ["identity", "gzip, deflate"]
+if getattr(urllib3.response, "brotli", None) is not None:   # br 디코더가 설치돼 있을 때만
+    ENCODINGS.append("gzip, deflate, br")
+
+# ============================ 출처별 페이지 ============================
+def month_range(month: str) -> tuple:
+    start = datetime.strptime(month + "-01", "%Y-%m-%d").date()
+    end = (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return start.isoformat(), end.isoformat()
+
+def page_kbs(kw: str, s: str, e: str, index: int, size: int) -> tuple:
+    payload = ko_kbs.fetch_page(kw, index + 1, s.replace("-", "."), e.replace("-", "."), "m", page_size=size)
+    rows, total = ko_kbs.extract_rows(payload, kw)
+    return [r["link"] for r in rows], total
+
+def page_mbc(kw: str, s: str, e: str, index: int, size: int) -> tuple:
+    payload = ko_mbc.fetch_page(kw, index, s.replace("-", ""), e.replace("-", ""), pagesize=size)
+    return [r["link"] for r in ko_mbc.extract_rows(payload, kw)], ko_mbc.extract_total(payload)
+
+def page_sbs(kw: str, s: str, e: str, index: int, size: int) -> tuple:
+    payload = ko_sbs.fetch_page(kw, index * size, limit=size, start_date=s, end_date=e)
+    return [r["link"] for r in ko_sbs.extract_rows(payload)], ko_sbs.extract_total(payload)
+
+# 출처 → (페이지 함수, 모듈, 호스트 URL)
+SOURCES = {
+    "kbs": (page_kbs, ko_kbs, ko_kbs.BASE),
+    "mbc": (page_mbc, ko_mbc, ko_mbc.BASE),
+    "sbs": (page_sbs, ko_sbs, ko_sbs.BASE),
+}
+
+# ============================ 측정 ============================
+class Probe:
+    """세션 응답 훅으로 요청마다 (전송 바이트, 본문 바이트, Content-Encoding)을 모은다."""
+
+    def __init__(self, source: str):
+        self.page_fn, self.module, self.base = SOURCES[source]
+        self.session = self.module.SESSION
+        self.responses = []
+        self.session.hooks.setdefault("response", []).append(self._hook)
+        self.requests = 0
+
+    def _hook(self, r, *args, **kwargs):
+        self.responses.append(r)
+
+    def close(self):
+        self.session.hooks["response"].remove(self._hook)
+
+    def connections(self) -> int:
+        """이 호스트로 지금까지 새로 맺은 연결 수(어댑터의 모든 풀 합계)."""
+        pm = self.session.get_adapter(self.base).poolmanager
+        host = urllib3.util.parse_url(self.base).host
+        total = 0
+        for key in pm.pools.keys():
+            pool = pm.pools.get(key)
+            if pool is not None and pool.host == host:
+                total += pool.num_connections
+        return total
+
+    def page(self, kw: str, s: str, e: str, index: int, size: int) -> tuple:
+        self.requests += 1
+        out = self.page_fn(kw, s, e, index, size)
+        time.sleep(SLEEP)
+        return out
+
+    def last_transfer(self) -> tuple:
+        """(전송 바이트, 본문 바이트, Content-Encoding)."""
+        r = self.responses[-1]
+        body = len(r.content)
+        try:
+            wire = r.raw.tell() or body
+        except Exception:
+            wire = int(r.headers.get("Content-Length") or body)
+        return wire, body, r.headers.get("Content-Encoding", "identity")
+
+def same_rows(got: list, ref: list) -> bool:
+    if not ref:
+        return not got
+    return len(got) == len(ref) and len(set(got) & set(ref)) >= CONSISTENCY * len(ref)
+
+def calibrate(source: str, kw: str = PROBE_KEYWORD, month: str = PROBE_MONTH) -> dict:
+    s, e = month_range(month)
+    probe = Probe(source)
+    conns_before = probe.connections()
+    try:
+        # 기준 목록(BASELINE 크기 페이지를 필요한 만큼 이어 붙임)
+        ref, total = probe.page(kw, s, e, 0, BASELINE)
+        total = total or 0
+        print(f"[CAL] {source}: '{kw}' {month} total={total}", flush=True)
+
+        def reference(n: int) -> list:
+            while len(ref) < min(n, total):
+                more, _ = probe.page(kw, s, e, len(ref) // BASELINE, BASELINE)
+                if not more:
+                    break
+                ref.extend(more)
+            return ref[:n]
+
+        # 페이지 크기
+        best = BASELINE
+        for size in CANDIDATES:
+            if size > total:
+                print(f"[CAL] {source}: total {total} < {size}, stop (pick a busier --month to test larger)", flush=True)
+                break
+            try:
+                first, _ = probe.page(kw, s, e, 0, size)
+            except Exception as ex:
+                print(f"[CAL] {source}: size {size} rejected ({ex})", flush=True)
+                break
+            ok = same_rows(first, reference(size))
+            if ok and total >= 2 * size:
+                second, _ = probe.page(kw, s, e, 1, size)
+                ok = same_rows(second, reference(2 * size)[size:])
+            print(f"[CAL] {source}: size {size} -> {len(first)} rows, {'ok' if ok else 'inconsistent'}", flush=True)
+            if not ok:
+                break
+            best = size
+
+        # 압축(같은 요청을 Accept-Encoding만 바꿔서)
+        saved = probe.session.headers.get("Accept-Encoding")
+        transfer = {}
+        for enc in ENCODINGS:
+            probe.session.headers["Accept-Encoding"] = enc
+            rows, _ = probe.page(kw, s, e, 0, best)
+            wire, body, used = probe.last_transfer()
+            transfer[enc] = (wire, body, used, len(rows))
+            print(f"[CAL] {source}: Accept-Encoding '{enc}' -> {used}, {wire} B on wire / {body} B body", flush=True)
+        if saved is None:
+            probe.session.headers.pop("Accept-Encoding", None)
+        else:
+            probe.session.headers["Accept-Encoding"] = saved
+        enc = min(transfer, key=lambda k: transfer[k][0])
+        wire, body, used, rows = transfer[enc]
+        conns = probe.connections() - conns_before
+    finally:
+        probe.close()
+
+    result = {
+        "page_size": best,
+        "accept_encoding": enc,
+        "content_encoding": used,
+        "bytes_per_row": round(wire / rows, 1) if rows else None,
+        "body_bytes_per_row": round(body / rows, 1) if rows else None,
+        "rows_per_request": rows,
+        "keepalive": conns <= 1,
+        "connections": conns,
+        "probe_requests": probe.requests,
+        "measured_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    print(f"[CAL] {source}: page_size {BASELINE} -> {best} ({best / BASELINE:.0f}x fewer round-trips), "
+          f"{result['bytes_per_row']} B/row on wire ({used}), {rows} rows/request, "
+          f"{probe.requests} probe requests on {conns} connection(s)", flush=True)
+    return result
+
+# ============================ 실행 ============================
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Calibrate page size and transport per news source")
+    ap.add_argument("--sources", default=",".join(SOURCES))
+    ap.add_argument("--keyword", default=PROBE_KEYWORD)
+    ap.add_argument("--month", default=PROBE_MONTH, help="YYYY-MM, 건수가 많은 달일수록 큰 크기까지 시험")
+    ap.add_argument("--dry-run", action="store_true", help=f"측정만 하고 {TUNING_FILE}에 쓰지 않음")
+    args = ap.parse_args()
+
+    for source in [s.strip() for s in args.sources.split(",") if s.strip()]:
+        try:
+            result = calibrate(source, args.keyword, args.month)
+        except Exception as ex:
+            print(f"[ERROR] {source}: {ex}", flush=True)
+            continue
+        if not args.dry_run:
+            save_tuning(source, result)
+            print(f"[INFO] saved {source} -> {TUNING_FILE}", flush=True)
@@ -0,0 +1,371 @@
+# pip install requests pandas openpyxl urllib3 python-dateutil
+# 여러 프로세스/머신이 나눠 도는 뉴스 크롤 작업 큐(SQLite 파일 하나, WAL)
+# - 작업 = (출처, 키워드, 월). enqueue 때 news_scheduler의 예상 수익으로 우선순위를 매긴다
+# - 워커는 작업을 임대(lease)하고 HEARTBEAT마다 연장, 죽어서 LEASE가 지나면 다른 워커가 다시 가져간다
+# - 결과는 공유 싱크(rows 테이블, (출처, 링크) 기본키)로 — 중복은 INSERT OR IGNORE로 자동 제거
+# - 호스트별 요청 간격은 큐 DB의 rate 테이블로 모든 워커가 함께 지킨다(전역 레이트 리밋)
+# - 다른 공유 저장소로 바꾸려면 SqliteQueue와 같은 메서드를 가진 클래스를 만들면 된다
+#   (SQLite 파일은 한 머신의 여러 프로세스용; 여러 머신은 네트워크 파일시스템보다 공유 DB 구현을 권장)
+# 사용:
+#   python news_queue.py enqueue [--sources kbs,mbc,sbs] [--keywords ...] [--start ...] [--end ...]
+#   python news_queue.py worker --procs 4 [--id box-1]
+#   python news_queue.py status
+#   python news_queue.py export          # 출처별 엑셀(OUTPUT_XLSX)에 합쳐 저장
+import os
+import time
+import socket
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from news_survey import KEYWORDS, START_DATE, END_DATE, SURVEY_STATE, load_state, month_slices
+
+# ============================ 설정 ============================
+QUEUE_DB = "crawl_queue.sqlite"
+LEASE = 300.0                   # 임대 시간(초) — 하트비트가 없으면 이만큼 뒤 다시 큐로
+HEARTBEAT = 60.0
+MAX_ATTEMPTS = 3                # 이만큼 실패/만료되면 failed
+RETRY_DELAY = 30.0              # 실패한 작업은 (시도 수 × 이 초) 뒤에 다시 임대(잠깐 끊긴 동안 시도를 다 쓰지 않게)
+IDLE_POLL = 2.0                 # 남은 작업이 다른 워커 임대 중일 때 다시 보는 간격(만료되면 이어받음)
+
+class SourcePaused(Exception):
+    """출처가 지금은 더 진행할 수 없음(쿼터 소진 등) → 작업은 시도 횟수 없이 큐로 되돌리고 워커는 멈춘다.
+    rows/requests: 멈추기 전까지 받은 것(재개 지점이 이미 앞으로 갔으면 버리면 안 된다)."""
+    def __init__(self, reason: str, rows: list | None = None, requests_made: int = 0):
+        super().__init__(reason)
+        self.rows = rows or []
+        self.requests_made = requests_made
+
+# ============================ 큐 ============================
+class SqliteQueue:
+    def __init__(self, path: str = QUEUE_DB):
+        self.path = path
+        # 헤지 요청 스레드도 reserve()를 부르므로 스레드 간 공유 + 잠금
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY, source TEXT, keyword TEXT, month TEXT, start TEXT, "end" TEXT,
+                priority REAL DEFAULT 0, state TEXT DEFAULT 'queued', owner TEXT, lease_until REAL,
+                attempts INTEGER DEFAULT 0, rows INTEGER, new_rows INTEGER, requests INTEGER,
+                error TEXT, updated REAL, UNIQUE (source, keyword, month));
+            CREATE INDEX IF NOT EXISTS tasks_pick ON tasks (state, priority DESC);
+            CREATE TABLE IF NOT EXISTS rows (
+                source TEXT, link TEXT, keyword TEXT, title TEXT, published TEXT, artid TEXT, task_id INTEGER,
+                PRIMARY KEY (source, link));
+            CREATE TABLE IF NOT EXISTS rate (host TEXT PRIMARY KEY, next_at REAL);
+        """)
+
+    @contextmanager
+    def _tx(self):
+        """BEGIN IMMEDIATE … COMMIT(쓰기 잠금을 먼저 잡아 워커끼리 같은 작업을 가져가지 않게)."""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    # ---- 작업 ----
+    def enqueue(self, tasks: list, refresh: bool = False) -> int:
+        """tasks: (source, keyword, month, start, end, priority). 이미 있는 작업은 우선순위를 갱신하고,
+        끝난(done/failed) 작업이라도 저장된 기간이 새 기간을 덮지 못하면(범위를 늘림) 새 기간으로 다시 큐에.
+        refresh=True면 끝난 작업을 모두 다시 큐에(워터마크까지만 보는 증분 출처)."""
+        stale = ("tasks.state IN ('done', 'failed') AND "
+                 f'({int(refresh)} OR NOT (tasks.start <= excluded.start AND tasks."end" >= excluded."end"))')
+        with self._tx() as c:
+            before = c.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+            c.executemany(
+                'INSERT INTO tasks (source, keyword, month, start, "end", priority, updated) '
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, keyword, month) DO UPDATE SET priority = excluded.priority, "
+                f"start = CASE WHEN {stale} THEN excluded.start ELSE tasks.start END, "
+                f'"end" = CASE WHEN {stale} THEN excluded."end" ELSE tasks."end" END, '
+                f"attempts = CASE WHEN {stale} THEN 0 ELSE tasks.attempts END, "
+                f"lease_until = CASE WHEN {stale} THEN NULL ELSE tasks.lease_until END, "
+                f"state = CASE WHEN {stale} THEN 'queued' ELSE tasks.state END",
+                [t + (time.time(),) for t in tasks])
+            return c.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] - before
+
+    def requeue_expired(self, c) -> int:
+        now = time.time()
+        c.execute("UPDATE tasks SET state = 'failed', error = 'lease expired', owner = NULL, updated = ? "
+                  "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?", (now, now, MAX_ATTEMPTS))
+        return c.execute("UPDATE tasks SET state = 'queued', owner = NULL, updated = ? "
+                         "WHERE state = 'leased' AND lease_until < ?", (now, now)).rowcount
+
+    @staticmethod
+    def _only(sources: list | None) -> tuple:
+        """출처 필터 → (SQL 조건, 인자)."""
+        if not sources:
+            return "", ()
+        return f" AND source IN ({','.join('?' * len(sources))})", tuple(sources)
+
+    def lease(self, owner: str, sources: list | None = None) -> dict | None:
+        where, params = self._only(sources)
+        with self._tx() as c:
+            n = self.requeue_expired(c)
+            if n:
+                print(f"[QUEUE] requeued {n} expired task(s)", flush=True)
+            row = c.execute('SELECT id, source, keyword, month, start, "end" FROM tasks '
+                            f"WHERE state = 'queued' AND COALESCE(lease_until, 0) <= ?{where} "
+                            "ORDER BY priority DESC, id LIMIT 1", (time.time(),) + params).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            c.execute("UPDATE tasks SET state = 'leased', owner = ?, lease_until = ?, attempts = attempts + 1, "
+                      "updated = ? WHERE id = ?", (owner, now + LEASE, now, row[0]))
+        return dict(zip(("id", "source", "keyword", "month", "start", "end"), row))
+
+    def heartbeat(self, task_id: int, owner: str) -> bool:
+        cur = self.conn.execute("UPDATE tasks SET lease_until = ? WHERE id = ? AND owner = ? AND state = 'leased'",
+                                (time.time() + LEASE, task_id, owner))
+        return cur.rowcount == 1
+
+    @staticmethod
+    def _insert_rows(c, task_id: int, source: str, rows: list) -> int:
+        before = c.total_changes
+        c.executemany(
+            "INSERT OR IGNORE INTO rows (source, link, keyword, title, published, artid, task_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(source, str(r.get("link") or "").strip(), r.get("keyword"), r.get("title"),
+              r.get("published"), r.get("artid"), task_id)
+             for r in rows if str(r.get("link") or "").strip()])
+        return c.total_changes - before
+
+    def _owns(self, c, task_id: int, owner: str) -> bool:
+        return c.execute("SELECT 1 FROM tasks WHERE id = ? AND owner = ? AND state = 'leased'",
+                         (task_id, owner)).fetchone() is not None
+
+    def complete(self, task_id: int, owner: str, source: str, rows: list, requests_made: int) -> int | None:
+        """임대가 아직 내 것이면 행을 싱크에 넣고 done. 새로 들어간 행 수(임대를 잃었으면 None)."""
+        with self._tx() as c:
+            if not self._owns(c, task_id, owner):
+                return None
+            new = self._insert_rows(c, task_id, source, rows)
+            c.execute("UPDATE tasks SET state = 'done', owner = NULL, lease_until = NULL, rows = ?, new_rows = ?, "
+                      "requests = ?, error = NULL, updated = ? WHERE id = ?", (len(rows), new, requests_made, time.time(), task_id))
+        return new
+
+    def fail(self, task_id: int, owner: str, error: str):
+        now = time.time()
+        with self._tx() as c:
+            c.execute("UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                      "owner = NULL, error = ?, lease_until = ? + attempts * ?, updated = ? WHERE id = ? AND owner = ?",
+                      (MAX_ATTEMPTS, error[:500], now, RETRY_DELAY, now, task_id, owner))
+
+    def release(self, task_id: int, owner: str, source: str, rows: list, reason: str) -> int | None:
+        """받은 만큼 싱크에 넣고 작업을 시도 횟수 없이 큐로 되돌린다(SourcePaused). 새로 들어간 행 수."""
+        with self._tx() as c:
+            if not self._owns(c, task_id, owner):
+                return None
+            new = self._insert_rows(c, task_id, source, rows)
+            c.execute("UPDATE tasks SET state = 'queued', owner = NULL, lease_until = NULL, attempts = attempts - 1, "
+                      "error = ?, updated = ? WHERE id = ?", (reason[:500], time.time(), task_id))
+        return new
+
+    def pending(self, sources: list | None = None) -> tuple:
+        """(queued, leased) 수."""
+        where, params = self._only(sources)
+        counts = dict(self.conn.execute(f"SELECT state, COUNT(*) FROM tasks WHERE 1{where} GROUP BY state",
+                                        params).fetchall())
+        return counts.get("queued", 0), counts.get("leased", 0)
+
+    # ---- 전역 레이트 리밋 ----
+    def reserve(self, host: str, interval: float) -> float:
+        """host에 다음 요청을 보낼 자리를 잡고, 그때까지 기다릴 초를 돌려준다."""
+        with self._tx() as c:
+            row = c.execute("SELECT next_at FROM rate WHERE host = ?", (host,)).fetchone()
+            now = time.time()
+            slot = max(now, row[0] if row else 0.0)
+            c.execute("INSERT INTO rate (host, next_at) VALUES (?, ?) "
+                      "ON CONFLICT (host) DO UPDATE SET next_at = excluded.next_at", (host, slot + interval))
+        return slot - now
+
+    # ---- 보고/내보내기 ----
+    def status(self) -> str:
+        c = self.conn
+        states = dict(c.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+        rows = c.execute("SELECT source, COUNT(*) FROM rows GROUP BY source").fetchall()
+        owners = c.execute("SELECT owner, COUNT(*) FROM tasks WHERE state = 'leased' GROUP BY owner").fetchall()
+        recent = c.execute("SELECT COUNT(*), COALESCE(SUM(requests), 0) FROM tasks "
+                           "WHERE state = 'done' AND updated > ?", (time.time() - 600,)).fetchone()
+        lines = ["[QUEUE] tasks: " + ", ".join(f"{k} {v}" for k, v in sorted(states.items())),
+                 "[QUEUE] rows: " + (", ".join(f"{s} {n}" for s, n in rows) or "0"),
+                 f"[QUEUE] last 10 min: {recent[0]} tasks, {recent[1]} requests"]
+        lines += [f"[QUEUE] leased by {o}: {n}" for o, n in owners]
+        return "\n".join(lines)
+
+    def rows_of(self, source: str) -> list:
+        cur = self.conn.execute("SELECT keyword, title, published, link, artid FROM rows WHERE source = ?", (source,))
+        return [dict(zip(("keyword", "title", "published", "link", "artid"), r)) for r in cur]
+
+    def all_rows(self) -> list:
+        cur = self.conn.execute("SELECT source, keyword, title, published, link, artid FROM rows ORDER BY source")
+        return [dict(zip(("source", "keyword", "title", "published", "link", "artid"), r)) for r in cur]
+
+# ============================ 워커 ============================
+def host_intervals() -> dict:
+    """출처 모듈 → (호스트, 요청 간격). 간격은 각 크롤러의 요청 간 딜레이 상수."""
+    import ko_kbs
+    import ko_mbc
+    import ko_sbs
+    return {
+        ko_kbs: (urlsplit(ko_kbs.BASE).hostname, ko_kbs.SLEEP_REQ),
+        ko_mbc: (urlsplit(ko_mbc.BASE).hostname, ko_mbc.REQ_SLEEP),
+        ko_sbs: (urlsplit(ko_sbs.BASE).hostname, ko_sbs.SLEEP),
+    }
+
+def install_rate_limits(queue: SqliteQueue, overrides: dict | None = None):
+    """각 크롤러 SESSION.get 앞에 큐 DB 자리 잡기를 끼운다(모듈 자체 sleep은 0으로 — 간격은 전역으로 관리).
+    overrides: 호스트 → 요청 간격(초), 크롤러 기본값 대신."""
+    for module, (host, interval) in host_intervals().items():
+        interval = (overrides or {}).get(host, interval)
+        get = module.SESSION.get
+
+        def limited(url, *args, _get=get, _host=host, _interval=interval, **kwargs):
+            wait = queue.reserve(_host, _interval)
+            if wait > 0:
+                time.sleep(wait)
+            return _get(url, *args, **kwargs)
+
+        module.SESSION.get = limited
+        for name in ("SLEEP_REQ", "SLEEP_SLICE", "REQ_SLEEP", "SLEEP"):
+            if hasattr(module, name):
+                setattr(module, name, 0)
+
+def run_news_task(task: dict) -> tuple:
+    from news_scheduler import SOURCES
+    return SOURCES[task["source"]][0](task["keyword"], task["start"], task["end"])
+
+def worker_loop(db: str, owner: str, exit_when_idle: bool = True, sources: list | None = None,
+                run=run_news_task, rate_limits: bool = True) -> int:
+    """sources: 이 워커가 가져갈 출처(None이면 전부), run: 작업 dict → (행, 요청 수).
+    rate_limits=False면 호출 쪽이 install_rate_limits를 이미 한 번 끼운 것(같은 프로세스의 여러 스레드)."""
+    queue = SqliteQueue(db)
+    hb_queue = SqliteQueue(db)        # 하트비트 스레드 전용 연결
+    if rate_limits:
+        install_rate_limits(queue)
+    done = 0
+    print(f"[WORKER] {owner} started (pid {os.getpid()})", flush=True)
+    while True:
+        task = queue.lease(owner, sources)
+        if task is None:
+            queued, leased = queue.pending(sources)
+            if queued == 0 and leased == 0 and exit_when_idle:
+                break
+            time.sleep(IDLE_POLL)      # 다른 워커 임대가 만료되면 다시 큐로 돌아온다
+            continue
+
+        stop = threading.Event()
+
+        def beat(task_id=task["id"]):
+            while not stop.wait(HEARTBEAT):
+                if not hb_queue.heartbeat(task_id, owner):
+                    print(f"[WORKER] {owner}: lost lease on task {task_id}", flush=True)
+                    return
+
+        hb = threading.Thread(target=beat, daemon=True)
+        hb.start()
+        label = f"{task['source']} '{task['keyword']}' {task['month']}"
+        try:
+            rows, made = run(task)
+        except SourcePaused as e:
+            stop.set()
+            new = queue.release(task["id"], owner, task["source"], e.rows, str(e))
+            print(f"[WORKER] {owner}: {label} paused ({e}), kept {new} new rows, task back in queue", flush=True)
+            break
+        except Exception as e:
+            stop.set()
+            queue.fail(task["id"], owner, repr(e))
+            print(f"[WORKER] {owner}: {label} failed: {e}", flush=True)
+            continue
+        stop.set()
+        new = queue.complete(task["id"], owner, task["source"], rows, made)
+        if new is None:
+            print(f"[WORKER] {owner}: {label} finished after losing its lease, results dropped", flush=True)
+            continue
+        done += 1
+        print(f"[WORKER] {owner}: {label}: {new} new / {len(rows)} rows / {made} req", flush=True)
+    print(f"[WORKER] {owner} done: {done} tasks", flush=True)
+    return done
+
+# ============================ 실행 ============================
+def news_tasks(sources: list, keywords: list, start: str, end: str, survey_path: str = SURVEY_STATE) -> list:
+    """(출처, 키워드, 월) 작업 목록, 우선순위 = news_scheduler 예상 수익."""
+    from news_scheduler import YieldModel
+    months = list(month_slices(start, end))
+    model = YieldModel(sources, keywords, [m for m, _, _ in months], load_state(survey_path), {})
+    tasks = []
+    for source in sources:
+        for kw in keywords:
+            for month, s, e in months:
+                _, _, score = model.expected(source, kw, month)
+                tasks.append((source, kw, month, s, e, score))
+    return tasks
+
+def cmd_enqueue(args):
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    tasks = news_tasks(sources, args.keywords, args.start, args.end, args.survey)
+    added = SqliteQueue(args.db).enqueue(tasks)
+    print(f"[QUEUE] {added} new tasks ({len(tasks) - added} already queued) -> {args.db}", flush=True)
+
+def cmd_worker(args):
+    base = args.id or socket.gethostname()
+    if args.procs <= 1:
+        worker_loop(args.db, f"{base}-{os.getpid()}", not args.keep_alive)
+        return
+    procs = [multiprocessing.Process(target=worker_loop, args=(args.db, f"{base}-{i}", not args.keep_alive))
+             for i in range(args.procs)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+def cmd_export(args):
+    import pandas as pd
+    from news_scheduler import SOURCES
+    queue = SqliteQueue(args.db)
+    for source, (_, _, module) in SOURCES.items():
+        rows = queue.rows_of(source)
+        if not rows:
+            continue
+        df = pd.DataFrame(rows)
+        if source != "mbc":
+            df = df.drop(columns=["artid"])
+        n = module.append_to_excel(module.OUTPUT_XLSX, df)
+        print(f"[INFO] {source}: {len(rows)} rows -> {module.OUTPUT_XLSX} (total {n})", flush=True)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Distributed news crawl work queue")
+    ap.add_argument("--db", default=QUEUE_DB)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    e = sub.add_parser("enqueue")
+    e.add_argument("--sources", default="kbs,mbc,sbs")
+    e.add_argument("--keywords", nargs="*", default=KEYWORDS)
+    e.add_argument("--start", default=START_DATE)
+    e.add_argument("--end", default=END_DATE)
+    e.add_argument("--survey", default=SURVEY_STATE)
+    w = sub.add_parser("worker")
+    w.add_argument("--procs", type=int, default=1)
+    w.add_argument("--id", default=None, help="워커 이름 접두어(기본: 호스트 이름)")
+    w.add_argument("--keep-alive", action="store_true", help="큐가 비어도 끝내지 않고 계속 기다림")
+    sub.add_parser("status")
+    sub.add_parser("export")
+    args = ap.parse_args()
+
+    if args.cmd == "enqueue":
+        cmd_enqueue(args)
+    elif args.cmd == "worker":
+        cmd_worker(args)
+    elif args.cmd == "status":
+        print(SqliteQueue(args.db).status())
+    else:
+        cmd_export(args)
@@ -0,0 +1,264 @@
+# 뉴스 검색 API용 꼬리 지연 대책(호스트별로 공유)
+# - 서킷 브레이커: 최근 WINDOW건 중 오류 비율이 TRIP_RATIO 이상이면 열림 → COOLDOWN 동안 요청을 보내지 않음
+#   (크롤러는 기다렸다가 이어서 하므로 일감은 버리지 않는다), 반쯤 열림에서 한 건 시험 → 성공이면 닫힘
+# - 적응형 타임아웃: read 타임아웃 = 관측 p99 × TIMEOUT_MULT (MIN_READ..처음 값 사이)
+# - 헤지 요청: 관측 p95가 지나도 응답이 없으면 같은 요청을 한 번 더 보내 먼저 온 것을 쓴다(HEDGE_BUDGET 비율까지만)
+# - urllib3 Retry의 긴 재시도 사다리 대신 여기서 짧게 재시도(브레이커가 판단), 429/503의 Retry-After는 지킨다
+# - 그래도 안 되면 오류 응답을 돌려주지 않고 TransientError → 호출 쪽(스케줄러/큐)이 단위째 나중에 다시
+import time
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlsplit
+
+# ============================ 설정 ============================
+WINDOW = 20                 # 브레이커가 보는 최근 결과 수
+MIN_CALLS = 8               # 이보다 적으면 열지 않음
+TRIP_RATIO = 0.5            # 오류 비율 임계값
+COOLDOWN = 30.0             # 처음 열림 시간(초), 연속으로 열리면 두 배씩
+MAX_COOLDOWN = 300.0
+
+LATENCY_SAMPLES = 200       # 백분위수 계산에 쓰는 최근 성공 지연 수
+MIN_SAMPLES = 20            # 이보다 적으면 처음 타임아웃 그대로, 헤지 안 함
+TIMEOUT_MULT = 3.0
+MIN_READ = 2.0
+HEDGE_PERCENTILE = 95
+HEDGE_BUDGET = 0.1          # 헤지 요청은 전체 요청의 10%까지(부하 증폭 방지)
+
+MAX_ATTEMPTS = 3
+BACKOFF = 0.5               # 재시도 대기(초) × 시도 번호
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 120.0     # 서버가 준 Retry-After를 이 초까지만 기다림
+SLICE_TRIES = 3             # 단독 실행 크롤러: TransientError가 난 슬라이스를 처음부터 다시 도는 횟수
+SLICE_WAIT = 30.0           # 슬라이스 재시도 대기(초) × 시도 번호
+
+class CircuitOpenError(Exception):
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"circuit open for {host} ({retry_after:.0f}s left)")
+        self.host = host
+        self.retry_after = retry_after
+
+class TransientError(Exception):
+    """재시도를 다 써도 연결 오류/429/5xx — 일감은 버리지 말고 나중에 다시 돌릴 것."""
+    def __init__(self, url: str, status: int | None = None, cause: Exception | None = None):
+        what = f"HTTP {status}" if status else repr(cause)
+        super().__init__(f"{what} after {MAX_ATTEMPTS} attempts: {url}")
+        self.status = status
+
+class SliceError(Exception):
+    """슬라이스 도중 요청 실패 — 그때까지 받은 행과 요청 수를 함께 올린다.
+    스케줄러/큐는 단위를 끝나지 않은 것으로 보고, 단독 실행 크롤러는 받은 행을 그대로 쓴다."""
+    def __init__(self, cause: Exception, rows: list, requests_made: int):
+        super().__init__(f"{cause} ({len(rows)} rows before the failure)")
+        self.rows = rows
+        self.requests_made = requests_made
+        self.transient = isinstance(cause, TransientError)
+
+def retry_after(r) -> float | None:
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 초."""
+    value = (getattr(r, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# ============================ 지연/브레이커 ============================
+class LatencyTracker:
+    def __init__(self, size: int = LATENCY_SAMPLES):
+        self.samples = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, p: float) -> float | None:
+        with self.lock:
+            if len(self.samples) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, host: str):
+        self.host = host
+        self.state = self.CLOSED
+        self.results = deque(maxlen=WINDOW)
+        self.opened_at = 0.0
+        self.cooldown = COOLDOWN
+        self.trips = 0
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def before(self):
+        """요청을 보내도 되면 그냥 반환, 아니면 CircuitOpenError."""
+        with self.lock:
+            if self.state == self.OPEN:
+                left = self.opened_at + self.cooldown - time.monotonic()
+                if left > 0:
+                    raise CircuitOpenError(self.host, left)
+                self.state = self.HALF_OPEN
+                self.trial_running = False
+            if self.state == self.HALF_OPEN:
+                if self.trial_running:
+                    raise CircuitOpenError(self.host, 1.0)
+                self.trial_running = True
+
+    def allows_extra(self) -> bool:
+        """헤지처럼 덤으로 보내는 요청은 닫힘 상태에서만."""
+        return self.state == self.CLOSED
+
+    def record(self, ok: bool):
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.trial_running = False
+                if ok:
+                    self.state = self.CLOSED
+                    self.results.clear()
+                    self.cooldown = COOLDOWN
+                    print(f"[BREAKER] {self.host}: closed", flush=True)
+                else:
+                    self._open()
+                return
+            self.results.append(ok)
+            if ok:
+                return      # 성공으로는 열지 않는다(장애가 끝난 뒤 첫 성공에 열리는 일 방지)
+            errors = self.results.count(False)
+            if len(self.results) >= MIN_CALLS and errors / len(self.results) >= TRIP_RATIO:
+                self._open()
+
+    def _open(self):
+        if self.state == self.HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, MAX_COOLDOWN)
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        self.results.clear()
+        print(f"[BREAKER] {self.host}: open for {self.cooldown:.0f}s (trip #{self.trips})", flush=True)
+
+# 호스트 → (브레이커, 지연) — 같은 프로세스의 모든 크롤러/스레드가 공유
+_HOSTS: dict = {}
+_HOSTS_LOCK = threading.Lock()
+
+def host_state(host: str) -> tuple:
+    with _HOSTS_LOCK:
+        if host not in _HOSTS:
+            _HOSTS[host] = (CircuitBreaker(host), LatencyTracker())
+        return _HOSTS[host]
+
+def retry_slice(fn, *args):
+    """fn(*args)를 일시 오류(SliceError.transient)면 SLICE_TRIES번까지 다시(단독 실행 크롤러용 — 스케줄러/큐는
+    단위째 다시 돌린다). 끝내 실패하면 시도 중 가장 많이 받은 부분 결과를 담은 SliceError를 올린다."""
+    best = None
+    for attempt in range(1, SLICE_TRIES + 1):
+        try:
+            return fn(*args)
+        except SliceError as e:
+            if best is None or len(e.rows) > len(best.rows):
+                best = e
+            if not e.transient or attempt == SLICE_TRIES:
+                raise best
+            print(f"[WARN] {e}; retrying slice in {SLICE_WAIT * attempt:.0f}s", flush=True)
+            time.sleep(SLICE_WAIT * attempt)
+
+# ============================ 요청 ============================
+class ResilientGetter:
+    """session.get 대신 쓴다: getter.get(url) → Response(상태 코드 확인은 호출 쪽 raise_for_status)."""
+
+    def __init__(self, session, connect_timeout: float, read_timeout: float, wait_when_open: bool = True):
+        self.session = session
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.wait_when_open = wait_when_open
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        self.calls = self.hedges = self.hedge_wins = 0
+
+    def timeout(self, latency: LatencyTracker) -> tuple:
+        p99 = latency.percentile(99)
+        read = self.read_timeout if p99 is None else min(self.read_timeout, max(MIN_READ, p99 * TIMEOUT_MULT))
+        return self.connect_timeout, read
+
+    def _timed_get(self, url: str, timeout: tuple) -> tuple:
+        t0 = time.monotonic()
+        r = self.session.get(url, timeout=timeout)
+        return r, time.monotonic() - t0
+
+    def _hedged(self, url: str, breaker: CircuitBreaker, latency: LatencyTracker) -> tuple:
+        timeout = self.timeout(latency)
+        self.calls += 1
+        first = self.pool.submit(self._timed_get, url, timeout)
+        delay = latency.percentile(HEDGE_PERCENTILE)
+        if delay is None or self.hedges >= HEDGE_BUDGET * self.calls:
+            return first.result()
+        done, _ = wait([first], timeout=delay)
+        if done or not breaker.allows_extra():
+            return first.result()
+        self.hedges += 1
+        second = self.pool.submit(self._timed_get, url, timeout)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                try:
+                    r, elapsed = f.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if f is second:
+                    self.hedge_wins += 1
+                return r, elapsed      # 늦은 쪽은 백그라운드에서 끝나게 둔다
+        raise error
+
+    def get(self, url: str):
+        host = urlsplit(url).hostname or ""
+        breaker, latency = host_state(host)
+        last_error = None
+        r = None
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            while True:
+                try:
+                    breaker.before()
+                    break
+                except CircuitOpenError as e:
+                    if not self.wait_when_open:
+                        raise
+                    print(f"[BREAKER] {host}: waiting {e.retry_after:.0f}s", flush=True)
+                    time.sleep(max(e.retry_after, 0.5))
+            try:
+                r, elapsed = self._hedged(url, breaker, latency)
+            except Exception as e:
+                breaker.record(False)
+                last_error, r = e, None
+                time.sleep(BACKOFF * attempt)
+                continue
+            if r.status_code in RETRY_STATUS:
+                breaker.record(False)
+                if attempt < MAX_ATTEMPTS:
+                    delay = retry_after(r)
+                    time.sleep(BACKOFF * attempt if delay is None else min(delay, MAX_RETRY_AFTER))
+                continue
+            breaker.record(True)
+            latency.add(elapsed)
+            return r
+        if r is not None and r.status_code in RETRY_STATUS:
+            raise TransientError(url, status=r.status_code)
+        raise TransientError(url, cause=last_error) from last_error
+
+    def report(self) -> str:
+        parts = []
+        for host, (breaker, latency) in _HOSTS.items():
+            p50, p95, p99 = (latency.percentile(p) for p in (50, 95, 99))
+            fmt = lambda x: "-" if x is None else f"{x * 1000:.0f}ms"
+            parts.append(f"{host}: {breaker.state}, trips {breaker.trips}, p50 {fmt(p50)} p95 {fmt(p95)} p99 {fmt(p99)}")
+        parts.append(f"hedged {self.hedges}/{self.calls} (won {self.hedge_wins})")
+        return "; ".join(parts)
@@ -0,0 +1,271 @@
+# pip install requests pandas openpyxl urllib3 python-dateutil
+# 수익(새 고유 행/요청) 순 크롤 스케줄러: 일찍 멈춰도 값어치 큰 (출처, 키워드, 월)부터 받아 둔다
+# - 예상 총 건수: news_survey 결과 → 지난 실행의 실제 건수 → 같은 키워드의 다른 달 평균 → PRIOR_TOTAL
+# - 중복 비율: 같은 (출처, 월)에서 이미 고른 키워드가 덮는 비율(title_index 색인이 있으면 과거 제목으로,
+#   없으면 키워드 포함 관계로 — '기후위기'는 '기후' 결과에 거의 다 들어 있다)
+# - 점수 = 예상 총 건수 × (1 − 중복 비율) / 예상 요청 수, lazy greedy(고를 때만 점수 다시 계산)
+# - --budget-requests / --deadline 안에서 실행, FLUSH_EVERY 단위마다 행과 상태를 함께 저장 → 다시 실행하면 남은 것부터
+# 사용: python news_scheduler.py --budget-requests 5000 --deadline 2h [--index titles.sqlite] [--dry-run]
+import os
+import re
+import math
+import time
+import heapq
+import argparse
+
+import pandas as pd
+
+import ko_kbs
+import ko_mbc
+import ko_sbs
+from news_survey import KEYWORDS, START_DATE, END_DATE, SURVEY_STATE, cell_key, load_state, save_state, month_slices
+
+# ============================ 설정 ============================
+SCHEDULE_STATE = "schedule_state.json"
+PRIOR_TOTAL = 50                 # 아무 정보도 없는 칸의 예상 건수
+CONTAINED_OVERLAP = 0.9          # 이미 고른 키워드가 이 키워드 안에 들어 있으면(기후 ⊂ 기후위기) 중복 비율
+MIN_HISTORY = 20                 # 과거 제목이 이보다 적으면 색인 대신 포함 관계로 추정
+FLUSH_EVERY = 20                 # 단위 몇 개마다 엑셀에 저장
+SEC_PER_REQUEST = 0.5            # 측정 전 요청당 시간 추정(마감 계산용)
+MAX_FAILURES = 3                 # 한 출처가 연달아 이만큼 실패하면 이번 실행에서는 그 출처를 쉰다(장애 중 헛돌지 않게)
+
+# ============================ 출처별 단위 실행 ============================
+def run_kbs(keyword: str, start: str, end: str) -> tuple:
+    rows, made = [], 0
+    for tag in ko_kbs.TAGS:
+        r, n = ko_kbs.crawl_slice(keyword, start.replace("-", "."), end.replace("-", "."), tag)
+        rows += r
+        made += n
+        time.sleep(ko_kbs.SLEEP_SLICE)
+    return rows, made
+
+def run_mbc(keyword: str, start: str, end: str) -> tuple:
+    return ko_mbc.crawl_slice(keyword, start.replace("-", ""), end.replace("-", ""))
+
+def run_sbs(keyword: str, start: str, end: str) -> tuple:
+    rows, made = ko_sbs.crawl_slice(keyword, start, end)
+    return [dict(r, keyword=keyword) for r in rows], made
+
+# 출처 → (단위 실행, 예상 요청 수(총 건수), 모듈)
+SOURCES = {
+    "kbs": (run_kbs, lambda t: len(ko_kbs.TAGS) * max(1, math.ceil(t / ko_kbs.PAGE_SIZE)), ko_kbs),
+    "mbc": (run_mbc, lambda t: math.ceil(t / ko_mbc.PAGESIZE) + 2, ko_mbc),     # 빈 페이지 두 번으로 끝
+    "sbs": (run_sbs, lambda t: max(1, math.ceil(t / ko_sbs.PAGE_SIZE)), ko_sbs),
+}
+
+def compact(s: str) -> str:
+    return re.sub(r"\s+", "", str(s))
+
+def parse_duration(s: str | None) -> float | None:
+    """'2h', '90m', '1h30m', '45s', '600' → 초."""
+    if not s:
+        return None
+    if s.isdigit():
+        return float(s)
+    parts = re.findall(r"(\d+(?:\.\d+)?)([hms])", s)
+    if not parts:
+        raise ValueError(f"알 수 없는 기간: {s}")
+    return sum(float(n) * {"h": 3600, "m": 60, "s": 1}[u] for n, u in parts)
+
+# ============================ 예상치 ============================
+class YieldModel:
+    def __init__(self, sources: list, keywords: list, months: list, survey: dict, done: dict, index=None):
+        self.survey = survey
+        self.done = done
+        self.selected = {}               # (source, month) → 고른 키워드 목록
+        self.covered = {}                # (source, month) → 과거 제목 id 합집합
+        self.hist = {}                   # (keyword, source, month) → 과거 제목 id 집합
+        if index is not None:
+            self._load_history(index, sources, keywords)
+        # 키워드별 평균(같은 키워드의 알려진 달)
+        self.mean = {}
+        for source in sources:
+            for kw in keywords:
+                known = [self.total_known(source, kw, m) for m in months]
+                known = [t for t in known if t is not None]
+                if known:
+                    self.mean[(source, kw)] = sum(known) / len(known)
+        # 이전 실행에서 끝낸 단위도 "고른 것"으로 친다
+        for key in done:
+            source, kw, month = key.split("|")
+            self.select(source, kw, month)
+
+    def _load_history(self, index, sources: list, keywords: list):
+        index.load()
+        src_of = {}
+        for i, (stem, _, month, _) in enumerate(index.docs):
+            for source in sources:
+                if str(stem).startswith(f"{source}_titles"):
+                    src_of[i] = (source, month)
+                    break
+        for kw in keywords:
+            for i in index.term(kw):
+                if i in src_of:
+                    source, month = src_of[i]
+                    self.hist.setdefault((kw, source, month), set()).add(i)
+        print(f"[PLAN] history: {len(src_of)} titles from {index.path}", flush=True)
+
+    def total_known(self, source: str, kw: str, month: str) -> int | None:
+        key = cell_key(source, kw, month)
+        if self.survey.get(key) is not None:
+            return self.survey[key]
+        if key in self.done:
+            return self.done[key]["rows"]
+        return None
+
+    def total(self, source: str, kw: str, month: str) -> float:
+        t = self.total_known(source, kw, month)
+        if t is not None:
+            return t
+        return self.mean.get((source, kw), PRIOR_TOTAL)
+
+    def overlap(self, source: str, kw: str, month: str) -> float:
+        chosen = self.selected.get((source, month), [])
+        if not chosen:
+            return 0.0
+        h = self.hist.get((kw, source, month), set())
+        if len(h) >= MIN_HISTORY:
+            return len(h & self.covered.get((source, month), set())) / len(h)
+        k = compact(kw)
+        return CONTAINED_OVERLAP if any(compact(c) in k for c in chosen) else 0.0
+
+    def expected(self, source: str, kw: str, month: str) -> tuple:
+        """(예상 새 행, 예상 요청 수, 점수)."""
+        t = self.total(source, kw, month)
+        new = t * (1 - self.overlap(source, kw, month))
+        cost = SOURCES[source][1](t)
+        return new, cost, new / cost
+
+    def select(self, source: str, kw: str, month: str):
+        self.selected.setdefault((source, month), []).append(kw)
+        self.covered.setdefault((source, month), set()).update(self.hist.get((kw, source, month), ()))
+
+# ============================ 실행 ============================
+def schedule(sources: list, keywords: list, start: str, end: str, budget: int | None = None,
+             deadline: float | None = None, index=None, dry_run: bool = False,
+             state_path: str = SCHEDULE_STATE, survey_path: str = SURVEY_STATE):
+    state = load_state(state_path)
+    done = state.setdefault("done", {})
+    months = [(m, s, e) for m, s, e in month_slices(start, end)]
+    model = YieldModel(sources, keywords, [m for m, _, _ in months], load_state(survey_path), done, index)
+
+    heap = []
+    for source in sources:
+        for kw in keywords:
+            for month, s, e in months:
+                if cell_key(source, kw, month) in done:
+                    continue
+                _, _, score = model.expected(source, kw, month)
+                heap.append((-score, len(heap), source, kw, month, s, e))
+    heapq.heapify(heap)
+    print(f"[PLAN] {len(heap)} units to go ({len(done)} done before)", flush=True)
+
+    t0 = time.time()
+    used = 0
+    sec_per_req = SEC_PER_REQUEST
+    buffers = {source: [] for source in sources}
+    seen = {}
+    ran = new_total = exp_total = 0
+    skipped = []
+    failed = []
+    failures = {source: 0 for source in sources}     # 출처별 연속 실패 수
+
+    def flush():
+        for source, rows in buffers.items():
+            if rows:
+                n = SOURCES[source][2].append_to_excel(SOURCES[source][2].OUTPUT_XLSX, pd.DataFrame(rows))
+                print(f"[SAVE] {source}: {len(rows)} rows -> {SOURCES[source][2].OUTPUT_XLSX} (total {n})", flush=True)
+                rows.clear()
+        save_state(state_path, state)
+
+    while heap:
+        neg, seq, source, kw, month, s, e = heapq.heappop(heap)
+        exp_new, cost, score = model.expected(source, kw, month)
+        if heap and score < -heap[0][0] - 1e-12:
+            heapq.heappush(heap, (-score, seq, source, kw, month, s, e))   # 점수가 떨어짐 → 다시 줄 세움
+            continue
+        if failures[source] >= MAX_FAILURES:
+            skipped.append((source, kw, month, cost))
+            continue
+        if budget is not None and used + cost > budget:
+            skipped.append((source, kw, month, cost))
+            continue
+        elapsed = used * sec_per_req if dry_run else time.time() - t0
+        if deadline is not None and elapsed + cost * sec_per_req > deadline:
+            skipped.append((source, kw, month, cost))
+            continue
+
+        exp_total += exp_new
+        if dry_run:
+            model.select(source, kw, month)
+            used += cost
+            ran += 1
+            if ran <= 30:
+                print(f"[PLAN] #{ran:<4} {source} '{kw}' {month}: ~{exp_new:.0f} new / {cost} req", flush=True)
+            continue
+
+        if source not in seen:
+            module = SOURCES[source][2]
+            seen[source] = set()
+            if os.path.exists(module.OUTPUT_XLSX):
+                seen[source] = set(pd.read_excel(module.OUTPUT_XLSX, dtype=str)["link"].astype(str).str.strip())
+        t1 = time.time()
+        try:
+            rows, made = SOURCES[source][0](kw, s, e)
+        except Exception as ex:
+            # done에 넣지 않는다 → 다음 실행에서 다시(빈 결과를 총 건수 0으로 배우지도 않음, 고른 것으로도 치지 않음)
+            # 실패한 요청(재시도 포함)도 예산에서 뺀다 — 최소 예상 요청 수만큼
+            used += max(cost, getattr(ex, "requests_made", 0))
+            failures[source] += 1
+            failed.append((source, kw, month))
+            print(f"[WARN] {source} '{kw}' {month}: {ex}, used {used}", flush=True)
+            if failures[source] == MAX_FAILURES:
+                print(f"[WARN] {source}: {MAX_FAILURES} failures in a row, skipping it for the rest of this run",
+                      flush=True)
+            continue
+        failures[source] = 0
+        model.select(source, kw, month)
+        used += made
+        if made:
+            sec_per_req = 0.8 * sec_per_req + 0.2 * (time.time() - t1) / made
+        links = {str(r.get("link") or "").strip() for r in rows} - {""}
+        fresh = links - seen[source]
+        seen[source] |= fresh
+        buffers[source].extend(rows)
+        done[cell_key(source, kw, month)] = {"rows": len(rows), "new": len(fresh), "requests": made}
+        ran += 1
+        new_total += len(fresh)
+        print(f"[RUN] {source} '{kw}' {month}: {len(fresh)} new / {len(rows)} rows / {made} req "
+              f"(expected ~{exp_new:.0f} / {cost}), used {used}", flush=True)
+        if ran % FLUSH_EVERY == 0:
+            flush()
+
+    if not dry_run:
+        flush()
+    elapsed = time.time() - t0
+    print(f"[DONE] {ran} units, {used} requests, {elapsed:.0f}s; "
+          f"{'expected' if dry_run else 'new'} rows: {exp_total if dry_run else new_total:.0f}; "
+          f"{len(skipped) + len(failed)} units left for a later run ({len(failed)} failed)", flush=True)
+    return done
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Yield-ordered news crawl under a request/time budget")
+    ap.add_argument("--sources", default=",".join(SOURCES))
+    ap.add_argument("--keywords", nargs="*", default=KEYWORDS)
+    ap.add_argument("--start", default=START_DATE)
+    ap.add_argument("--end", default=END_DATE)
+    ap.add_argument("--budget-requests", type=int, default=None)
+    ap.add_argument("--deadline", default=None, help="예: 2h, 90m, 1h30m, 600")
+    ap.add_argument("--index", default=None, help="title_index.py로 만든 과거 제목 색인(중복 비율 추정)")
+    ap.add_argument("--state", default=SCHEDULE_STATE)
+    ap.add_argument("--survey", default=SURVEY_STATE)
+    ap.add_argument("--dry-run", action="store_true", help="요청 없이 순서와 예상치만 출력")
+    args = ap.parse_args()
+
+    index = None
+    if args.index:
+        from title_index import TitleIndex
+        index = TitleIndex(args.index)
+    schedule([s.strip() for s in args.sources.split(",") if s.strip()], args.keywords, args.start, args.end,
+             budget=args.budget_requests, deadline=parse_duration(args.deadline), index=index,
+             dry_run=args.dry_run, state_path=args.state, survey_path=args.survey)
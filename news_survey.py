@@ -0,0 +1,176 @@
+# pip install requests pandas openpyxl urllib3 python-dateutil
+# 건수만 세는 빠른 조사 모드: (출처, 키워드, 월)마다 첫 페이지 1건만 요청해 서버가 알려 주는 총 건수를 기록
+# - KBS: total_count / MBC: result 안의 총 건수 / SBS: total 또는 numFound
+# - 결과: 키워드 × 월 × 출처 표(long) + 출처별 키워드×월 피벗 시트(색 척도 = 히트맵)
+# - 중간 결과를 SURVEY_STATE에 저장 → 다시 실행하면 이미 센 칸은 건너뜀
+# 사용: python news_survey.py [--sources kbs,mbc,sbs] [--start 2015-08-01] [--end 2025-08-01] [--out survey.xlsx]
+import os
+import json
+import time
+import math
+import argparse
+from datetime import datetime
+
+import ko_kbs
+import ko_mbc
+import ko_sbs
+
+# ============================ 설정 ============================
+START_DATE = "2015-08-01"        # YYYY-MM-DD
+END_DATE   = "2025-08-01"
+SURVEY_PAGE_SIZE = 1             # 첫 페이지 크기(총 건수만 필요)
+KBS_TAGS = ("m",)                # 크롤은 m/w 둘 다 돌지만 건수 조사는 하나로 충분
+SURVEY_STATE = "survey_counts.json"
+OUTPUT_XLSX = f"survey_{START_DATE}_to_{END_DATE}.xlsx"
+
+# 세 크롤러 키워드 합집합(순서 유지)
+KEYWORDS = list(dict.fromkeys(ko_kbs.KEYWORDS + ko_mbc.KEYWORDS + ko_sbs.KEYWORDS))
+
+# ============================ 출처별 건수 ============================
+def require_total(total: int | None) -> int:
+    if total is None:
+        raise ValueError("no total in response")   # 빈/깨진 응답 → 기록하지 않고 다음에 다시
+    return total
+
+def count_kbs(keyword: str, start: str, end: str) -> int | None:
+    """tag별 total_count 중 큰 값(m/w 결과폭이 다를 수 있음)."""
+    best = None
+    for tag in KBS_TAGS:
+        payload = ko_kbs.fetch_page(keyword, 1, start.replace("-", "."), end.replace("-", "."),
+                                    tag, page_size=SURVEY_PAGE_SIZE)
+        if "total_count" not in payload:
+            raise ValueError(f"no total_count in response (tag={tag})")   # 빈/깨진 응답 → 기록하지 않고 다음에 다시
+        _, total = ko_kbs.extract_rows(payload, keyword)
+        best = max(best or 0, total)
+        time.sleep(ko_kbs.SLEEP_REQ)
+    return best
+
+def count_mbc(keyword: str, start: str, end: str) -> int:
+    payload = ko_mbc.fetch_page(keyword, 0, start.replace("-", ""), end.replace("-", ""),
+                                pagesize=SURVEY_PAGE_SIZE)
+    time.sleep(ko_mbc.REQ_SLEEP)
+    return require_total(ko_mbc.extract_total(payload))
+
+def count_sbs(keyword: str, start: str, end: str) -> int:
+    payload = ko_sbs.fetch_page(keyword, 0, limit=SURVEY_PAGE_SIZE, start_date=start, end_date=end)
+    time.sleep(ko_sbs.SLEEP)
+    return require_total(ko_sbs.extract_total(payload))
+
+# 출처 → (건수 함수, 본 크롤의 페이지 크기, 슬라이스당 추가 배수)
+SOURCES = {
+    "kbs": (count_kbs, ko_kbs.PAGE_SIZE, 2),    # 본 크롤은 tag m/w 두 번
+    "mbc": (count_mbc, ko_mbc.PAGESIZE, 1),
+    "sbs": (count_sbs, ko_sbs.PAGE_SIZE, 1),
+}
+
+# ============================ 상태 ============================
+def cell_key(source: str, keyword: str, month: str) -> str:
+    return f"{source}|{keyword}|{month}"
+
+def load_state(path: str) -> dict:
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def save_state(path: str, counts: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(counts, f, ensure_ascii=False, indent=0)
+    os.replace(tmp, path)
+
+def month_slices(start: str, end: str):
+    """YYYY-MM-DD 입력 → (YYYY-MM, 시작, 끝) 월 단위."""
+    s = datetime.strptime(start, "%Y-%m-%d").strftime("%Y.%m.%d")
+    e = datetime.strptime(end, "%Y-%m-%d").strftime("%Y.%m.%d")
+    for a, b in ko_kbs.month_slices(s, e):
+        yield a[:7].replace(".", "-"), a.replace(".", "-"), b.replace(".", "-")
+
+# ============================ 조사 ============================
+def survey(sources: list, keywords: list, start: str, end: str, state_path: str = SURVEY_STATE) -> dict:
+    """cell_key → 총 건수. 칸마다 저장해 중단돼도 이어서 한다(건수를 못 받은 칸은 저장하지 않고 다음 실행에서 다시)."""
+    counts = load_state(state_path)
+    months = list(month_slices(start, end))
+    requests_made = 0
+    t0 = time.time()
+    for source in sources:
+        count_fn = SOURCES[source][0]
+        for kw in keywords:
+            for month, s, e in months:
+                key = cell_key(source, kw, month)
+                if counts.get(key) is not None:     # 예전 상태 파일의 None 칸도 다시
+                    continue
+                try:
+                    counts[key] = count_fn(kw, s, e)
+                except Exception as ex:
+                    print(f"[WARN] {source} '{kw}' {month}: {ex}", flush=True)
+                    continue
+                requests_made += len(KBS_TAGS) if source == "kbs" else 1
+                save_state(state_path, counts)
+            done = [counts.get(cell_key(source, kw, m)) for m, _, _ in months]
+            print(f"[SURVEY] {source} '{kw}': {sum(c or 0 for c in done)} hits over {len(months)} months", flush=True)
+    print(f"[SURVEY] {requests_made} requests in {time.time() - t0:.0f}s", flush=True)
+    return counts
+
+def crawl_cost(counts: dict) -> dict:
+    """같은 칸을 본 크롤로 다 받을 때 필요한 요청 수(출처별)."""
+    cost = {}
+    for key, total in counts.items():
+        source = key.split("|", 1)[0]
+        _, page_size, mult = SOURCES[source]
+        cost[source] = cost.get(source, 0) + mult * max(1, math.ceil((total or 0) / page_size))
+    return cost
+
+def to_table(counts: dict):
+    import pandas as pd
+    rows = []
+    for key, total in counts.items():
+        source, keyword, month = key.split("|")
+        rows.append({"source": source, "keyword": keyword, "month": month, "count": total})
+    return pd.DataFrame(rows, columns=["source", "keyword", "month", "count"])
+
+def export(counts: dict, path: str, keywords: list):
+    """long 시트 + 출처별/전체 키워드×월 피벗(색 척도)."""
+    import pandas as pd
+    from openpyxl.formatting.rule import ColorScaleRule
+    from openpyxl.utils import get_column_letter
+
+    df = to_table(counts)
+    df = df[df["keyword"].isin(keywords)]
+    with pd.ExcelWriter(path, engine="openpyxl") as xw:
+        df.sort_values(["source", "keyword", "month"]).to_excel(xw, sheet_name="long", index=False)
+        sheets = [("all", df)] + [(src, g) for src, g in df.groupby("source")]
+        for name, g in sheets:
+            pivot = g.pivot_table(index="keyword", columns="month", values="count",
+                                  aggfunc="sum", fill_value=0).reindex([k for k in keywords if k in set(g["keyword"])])
+            pivot["total"] = pivot.sum(axis=1)
+            pivot.to_excel(xw, sheet_name=name)
+            ws = xw.sheets[name]
+            if pivot.shape[1] > 1:
+                last_col = get_column_letter(pivot.shape[1])   # total 앞까지
+                ws.conditional_formatting.add(
+                    f"B2:{last_col}{pivot.shape[0] + 1}",
+                    ColorScaleRule(start_type="min", start_color="FFFFFF", end_type="max", end_color="F8696B"))
+    print(f"[INFO] saved to  : {path}", flush=True)
+
+# ============================ 실행 ============================
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Count-only survey of news search hits per keyword/month/source")
+    ap.add_argument("--sources", default=",".join(SOURCES))
+    ap.add_argument("--start", default=START_DATE)
+    ap.add_argument("--end", default=END_DATE)
+    ap.add_argument("--keywords", nargs="*", default=KEYWORDS)
+    ap.add_argument("--state", default=SURVEY_STATE)
+    ap.add_argument("--out", default=OUTPUT_XLSX)
+    args = ap.parse_args()
+
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    counts = survey(sources, args.keywords, args.start, args.end, args.state)
+    months = {m for m, _, _ in month_slices(args.start, args.end)}
+    counts = {k: v for k, v in counts.items()
+              if k.split("|")[0] in sources and k.split("|")[2] in months}
+    surveyed = sum(len(KBS_TAGS) if k.startswith("kbs|") else 1 for k in counts)
+    for source, n in sorted(crawl_cost(counts).items()):
+        print(f"[INFO] {source}: full crawl ≈ {n} requests", flush=True)
+    print(f"[INFO] survey: {surveyed} requests, full crawl: {sum(crawl_cost(counts).values())} requests", flush=True)
+    export(counts, args.out, args.keywords)
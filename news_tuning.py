@@ -0,0 +1,26 @@
+# news_calibrate.py가 측정한 출처별 전송 설정(페이지 크기, Accept-Encoding 등)을 읽고 쓴다
+# 크롤러(ko_kbs/ko_mbc/ko_sbs)는 import 시 load_tuning()으로 읽어 기본값을 덮어쓴다(파일이 없으면 기본값 그대로)
+import os
+import json
+
+TUNING_FILE = "news_tuning.json"
+
+def load_all(path: str = TUNING_FILE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_tuning(source: str, path: str = TUNING_FILE) -> dict:
+    return load_all(path).get(source, {})
+
+def save_tuning(source: str, values: dict, path: str = TUNING_FILE):
+    data = load_all(path)
+    data[source] = values
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
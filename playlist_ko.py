@@ -1,23 +1,43 @@
-import os
 import time
 import json
 import random
-import pandas as pd
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import Dict
-from googleapiclient.discovery import build
 import googleapiclient.errors
+from yt_quota import QuotaExhausted, CrawlState, run_with_resume
+from yt_pool import YouTubeClientPool
+from yt_cache import ResponseCache
+from yt_enrich import enrich_videos
+from yt_plan import plan_playlists, print_plan, item_date
+from yt_traverse import detect_order, ORDER_PROBE_PAGES
+from yt_watermark import Watermarks, newest_item, reached
+from yt_store import VideoStore
 
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
 API_KEY = ""
+API_KEYS = [API_KEY]  # 프로젝트 키를 여러 개 넣으면 남은 예산 순으로 분산
 CHANNEL_ID = "UCkinYTS9IHqOEwR1Sze2JTw"  # SBS
 
 # 저장 파일명: 채널 ID 반영
 SAVE_FILE = f"playlist_videos_{CHANNEL_ID}_2015_2022.xlsx"
 TEMP_FILE = "temp.json"
 PLAYLISTS_JSON = f"playlists_{CHANNEL_ID}.json"  # (선택) 재생목록 스냅샷 저장
+STATE_FILE = f"crawl_state_{CHANNEL_ID}.json"    # 쿼터 소진 시 재개 지점(pageToken)
+WATERMARK_FILE = f"watermarks_{CHANNEL_ID}.json"  # 재생목록별 워터마크(증분 크롤)
+
+AUTO_RESUME = True                               # 쿼터 소진 → 태평양 자정 리셋 후 자동 재개
+ENRICH = True                                    # 수집 후 videos.list(50개씩)로 길이/조회수/태그 보강
+RESPONSE_CACHE = True                            # 응답을 ETag와 저장 → 재실행 시 If-None-Match, 304면 캐시 응답
+CACHE_FILE = "yt_cache.sqlite"
+CACHE_MAX_AGE = 0                                # 초. 0이면 항상 재검증, >0이면 그 안의 응답은 요청 없이 사용
+CONCURRENCY = 4                                  # 동시에 순회할 재생목록 수(1이면 순차)
+PRUNE_PLAYLISTS = True                           # 메타데이터 + probe 1페이지로 범위 밖 재생목록 건너뛰기
+INCREMENTAL = True                               # 재생목록별 워터마크: 최신순은 아는 영상에서 멈추고, 오래된순은 마지막 페이지부터
+UPLOADS_FLOOR = None                             # 업로드 재생목록으로 닿는 가장 오래된 날짜(알면 지정 → 중복 재생목록 건너뜀)
 
 KOREAN_KEYWORDS = [
     '기후', '기후변화', '기후위기', '온난화', '탄소', '온실가스', '해수면', '이상기후',
@@ -37,18 +57,16 @@ def backoff_sleep(attempt: int):
     delay = min(5.0, (2 ** attempt) * 0.5) + random.uniform(0, 0.3)
     time.sleep(delay)
 
-def load_existing_data() -> Dict[str, dict]:
-    if os.path.exists(TEMP_FILE):
-        with open(TEMP_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+def load_existing_data() -> VideoStore:
+    # 컬럼형 저장소(예전 dict-of-dicts temp 파일도 그대로 읽음)
+    return VideoStore.load(TEMP_FILE)
 
-def save_temp_data(data: Dict[str, dict]):
-    with open(TEMP_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def save_temp_data(data: VideoStore):
+    data.save(TEMP_FILE)
     print(f"[INFO] Temp data saved ({len(data)} videos)")
 
-def save_final_data(data: Dict[str, dict]):
+def save_final_data(data: VideoStore):
+    import pandas as pd  # 내보낼 때만 로드(크롤/체크포인트만 하는 실행은 pandas/openpyxl 없이 시작)
     if data:
         df = pd.DataFrame(list(data.values()))
         # 안전하게 datetime 파싱(UTC)
@@ -79,20 +97,19 @@ def save_playlists_json(playlists: Dict[str, str]):
 # -----------------------------
 # DISCOVERY
 # -----------------------------
-def get_all_playlists(api_key: str, channel_id: str) -> Dict[str, str]:
-    youtube = build("youtube", "v3", developerKey=api_key)
+def get_all_playlists(pool: YouTubeClientPool, channel_id: str) -> Dict[str, str]:
     playlists: Dict[str, str] = {}
     next_page_token = None
     attempt = 0
 
     while True:
         try:
-            res = youtube.playlists().list(
+            res = pool.execute("playlists.list", lambda yt: yt.playlists().list(
                 part="id,snippet",
                 channelId=channel_id,
                 maxResults=50,
                 pageToken=next_page_token
-            ).execute()
+            ))
 
             for item in res.get("items", []):
                 pid = item["id"]
@@ -106,6 +123,8 @@ def get_all_playlists(api_key: str, channel_id: str) -> Dict[str, str]:
             time.sleep(0.25 + random.uniform(0, 0.2))
             attempt = 0  # 성공했으면 재시도 카운터 초기화
 
+        except QuotaExhausted:
+            raise
         except googleapiclient.errors.HttpError as e:
             # rateLimitExceeded 등일 수 있음 → 지수 백오프 후 재시도
             attempt += 1
@@ -123,21 +142,36 @@ def get_all_playlists(api_key: str, channel_id: str) -> Dict[str, str]:
 # -----------------------------
 # CORE
 # -----------------------------
-def fetch_from_playlist(youtube, playlist_id: str, playlist_name: str, existing_data: dict) -> int:
+def fetch_from_playlist(pool: YouTubeClientPool, state: CrawlState, marks: Watermarks,
+                        playlist_id: str, playlist_name: str, existing_data: dict,
+                        lock: threading.Lock, first_page: dict | None = None) -> int:
+    task = f"playlist:{playlist_id}"
     total_new = 0
-    next_page_token = None
+    next_page_token = state.get(task).get("page_token")
     attempt = 0
 
+    # 워터마크: 최신순이면 이전 실행의 최신 영상에 닿는 페이지에서 멈추고,
+    # 오래된순이면 새 영상은 뒤에 붙으므로 지난번 마지막 페이지부터 다시 읽는다
+    mark = marks.get(task, START_DATE) if INCREMENTAL else None
+    if mark and mark.get("order") == "asc" and mark.get("tail_token") and not next_page_token:
+        next_page_token, first_page = mark["tail_token"], None
+    seen_dates, pages, order, newest = [], 0, "unknown", None
+    complete = False
+
     while True:
         try:
-            res = youtube.playlistItems().list(
-                part="snippet,contentDetails",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=next_page_token,
-            ).execute()
+            if first_page is not None:
+                res, first_page = first_page, None  # 계획 단계 probe 응답을 1페이지로 재사용
+            else:
+                res = pool.execute("playlistItems.list", lambda yt: yt.playlistItems().list(
+                    part="snippet,contentDetails",
+                    playlistId=playlist_id,
+                    maxResults=50,
+                    pageToken=next_page_token,
+                ))
 
             items = res.get("items", [])
+            tail_token = next_page_token
 
             for item in items:
                 snippet = item.get("snippet", {}) or {}
@@ -166,7 +200,10 @@ def fetch_from_playlist(youtube, playlist_id: str, playlist_name: str, existing_
                 if not keyword_filter(title):
                     continue
 
-                if vid not in existing_data:
+                # 여러 재생목록이 동시에 쓰므로 락 안에서 확인+삽입(먼저 쓴 재생목록이 출처로 남음)
+                with lock:
+                    if vid in existing_data:
+                        continue
                     existing_data[vid] = {
                         "Video URL": f"https://www.youtube.com/watch?v={vid}",
                         "Title": title,
@@ -175,16 +212,35 @@ def fetch_from_playlist(youtube, playlist_id: str, playlist_name: str, existing_
                         "SourcePlaylist": playlist_name,
                         "PlaylistId": playlist_id,
                     }
-                    total_new += 1
-                    print(f"[MATCH] {playlist_name} | {dt.isoformat()} | {title}")
-
+                total_new += 1
+                print(f"[MATCH] {playlist_name} | {dt.isoformat()} | {title}")
+
+            # 워터마크 후보(END_DATE 이하로 실제 검사한 항목 중 최신)와 정렬 방향
+            pages += 1
+            dated = [(d, it) for it in items if (d := item_date(it)) is not None]
+            top = newest_item([it for d, it in dated if d <= END_DATE])
+            if top and (newest is None or top["published_at"] > newest["published_at"]):
+                newest = top
+            if pages <= ORDER_PROBE_PAGES:
+                seen_dates.extend(d for d, _ in dated)
+                order = detect_order(seen_dates)
+
+            if reached(mark, items):
+                print(f"[INFO] {playlist_name}: reached watermark after {pages} pages")
+                complete = True
+                break
             next_page_token = res.get("nextPageToken")
             if not next_page_token:
+                complete = True
                 break
+            state.update(task, page_token=next_page_token)
 
             time.sleep(0.25 + random.uniform(0, 0.35))
             attempt = 0  # 성공시 재시도 카운터 초기화
 
+        except QuotaExhausted:
+            # 다음 페이지 토큰은 state에 남아 있으므로 리셋 후 여기서부터 재개
+            raise
         except googleapiclient.errors.HttpError as e:
             attempt += 1
             if attempt > 5:
@@ -196,6 +252,9 @@ def fetch_from_playlist(youtube, playlist_id: str, playlist_name: str, existing_
             print(f"[ERROR] Unexpected in fetch_from_playlist: {e}")
             break
 
+    if complete:
+        marks.advance(task, newest, order, tail_token, start=START_DATE)
+    state.mark_done(task)
     return total_new
 
 PLAYLISTS = {
@@ -306,8 +365,11 @@ PLAYLISTS = {
 # MAIN
 # -----------------------------
 def main():
+    cache = ResponseCache(CACHE_FILE, CACHE_MAX_AGE) if RESPONSE_CACHE else None
+    pool = YouTubeClientPool(API_KEYS, cache=cache)
+
     # 1) 재생목록 수집
-    # playlists = get_all_playlists(API_KEY, CHANNEL_ID)
+    # playlists = run_with_resume(lambda: get_all_playlists(pool, CHANNEL_ID), auto_resume=AUTO_RESUME)
     playlists = PLAYLISTS
 
     # 2) 터미널에 보기 좋게 출력(복붙용)
@@ -317,16 +379,62 @@ def main():
     save_playlists_json(playlists)
 
     # 3) 재생목록 순회하며 영상 수집
-    youtube = build("youtube", "v3", developerKey=API_KEY)
+    state = CrawlState(STATE_FILE)
+    marks = Watermarks(WATERMARK_FILE)
     existing_data = load_existing_data()
+    lock = threading.Lock()
     total_new = 0
 
-    for pid, pname in playlists.items():
-        print(f"[INFO] Processing playlist: {pname} ({pid})")
-        added = fetch_from_playlist(youtube, pid, pname, existing_data)
-        total_new += added
-        save_temp_data(existing_data)
+    def checkpoint():
+        with lock:
+            save_temp_data(existing_data)
+            state.save()
+            marks.save()
 
+    def crawl_one(pid: str, pname: str, first_page: dict | None = None) -> int:
+        print(f"[INFO] Processing playlist: {pname} ({pid})")
+        added = fetch_from_playlist(pool, state, marks, pid, pname, existing_data, lock, first_page)
+        checkpoint()  # 재생목록 단위 체크포인트
+        return added
+
+    def crawl():
+        nonlocal total_new
+        todo = [(pid, pname) for pid, pname in playlists.items() if not state.is_done(f"playlist:{pid}")]
+        first_pages = {}
+        if PRUNE_PLAYLISTS and todo:
+            plan = plan_playlists(pool, dict(todo), START_DATE, END_DATE, keyword_filter, CHANNEL_ID, UPLOADS_FLOOR)
+            print_plan(plan)
+            for e in plan:
+                if e["skip"]:
+                    state.mark_done(f"playlist:{e['id']}")
+            todo = [(e["id"], e["title"]) for e in plan if not e["skip"]]
+            # 이어받는 중인 재생목록은 저장된 토큰부터 → probe 페이지 재사용 안 함
+            first_pages = {e["id"]: e["first_page"] for e in plan
+                           if not e["skip"] and not state.get(f"playlist:{e['id']}").get("page_token")}
+        # 재생목록마다 페이지네이션이 독립적 → 제한된 스레드 풀로 동시에 순회
+        ex = ThreadPoolExecutor(max_workers=max(1, CONCURRENCY))
+        try:
+            futures = [ex.submit(crawl_one, pid, pname, first_pages.get(pid)) for pid, pname in todo]
+            for fut in as_completed(futures):
+                total_new += fut.result()
+        except BaseException:
+            # 쿼터 소진 등: 대기 중인 재생목록은 취소(진행 중인 것도 곧 같은 예외로 멈춤)
+            ex.shutdown(wait=True, cancel_futures=True)
+            raise
+        ex.shutdown(wait=True)
+
+        if ENRICH:
+            enrich_videos(pool, existing_data)
+            checkpoint()
+        return True
+
+    finished = run_with_resume(crawl, on_pause=checkpoint, auto_resume=AUTO_RESUME)
+    pool.report()
+    if not finished:
+        print("[INFO] Paused on quota. Re-run to resume from the saved page token.")
+        return
+
+    state.clear()
     print(f"[INFO] Completed. Total new videos added: {total_new}")
     save_final_data(existing_data)
 
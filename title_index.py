@@ -0,0 +1,287 @@
+# 수집한 제목 전체에 대한 역색인(SQLite 파일 하나) — 키워드를 바꿔 볼 때 크롤/엑셀 필터를 다시 돌리지 않고 바로 센다
+# - 한글 등 비ASCII 구간: 문자 bigram, 영어(ASCII 영숫자) 구간: 토큰
+# - 질의: 기본 AND, OR, NOT, 괄호 / 단어 = 부분 문자열(크롤러 keyword_filter와 같음)
+#         "살인 폭염" = 공백 유연(살인폭염/살인  폭염도 일치), ="heat wave" = 띄어쓰기 그대로
+#         영어는 토큰 단위 색인이라 질의의 단어 각각이 제목 어느 토큰의 일부여야 한다("heatwave" ≠ "heat wave")
+# 사용:
+#   python title_index.py build titles.sqlite kbs_titles.xlsx mbc_titles.xlsx temp.json ...
+#   python title_index.py query titles.sqlite '폭염 OR "heat wave"' [--by source|month|crawl_keyword]
+#   python title_index.py keywords titles.sqlite 기후 폭염 "살인 폭염" [--out matrix.xlsx]
+import re
+import time
+import sqlite3
+import argparse
+from array import array
+from pathlib import Path
+from collections import Counter, defaultdict
+
+# ============================ 설정 ============================
+INDEX_FILE = "titles.sqlite"
+BATCH = 50_000                  # 빌드 시 한 번에 쓰는 문서 수
+
+ASCII_RUN_RE = re.compile(r"[a-z0-9]+")
+OTHER_RUN_RE = re.compile(r"[^\x00-\x7f]+")   # 한글 등(공백 제거한 텍스트에서 찾는다)
+SPACE_RE = re.compile(r"\s+")
+QUERY_TOKEN_RE = re.compile(r'\(|\)|=?"[^"]*"|[^\s()"]+')
+
+# ============================ 텍스트 ============================
+def spaced(title: str) -> str:
+    """소문자 + 공백 하나로(띄어쓰기 그대로 비교용)."""
+    return SPACE_RE.sub(" ", str(title or "").lower()).strip()
+
+def compact(title: str) -> str:
+    """공백 제거(공백 유연 비교용)."""
+    return SPACE_RE.sub("", str(title or "").lower())
+
+def grams(text: str) -> set:
+    """색인 키: ASCII 영숫자 토큰은 'w:토큰', 나머지 구간은 문자 bigram(한 글자 구간은 unigram)."""
+    text = text.lower()
+    keys = {"w:" + t for t in ASCII_RUN_RE.findall(text)}
+    for run in OTHER_RUN_RE.findall(compact(text)):
+        if len(run) == 1:
+            keys.add(run)
+        else:
+            keys.update(run[i:i + 2] for i in range(len(run) - 1))
+    return keys
+
+def month_of(value) -> str:
+    s = str(value or "").strip().replace(".", "-")
+    return s[:7] if re.match(r"\d{4}-\d{2}", s) else ""
+
+# ============================ 색인 ============================
+class TitleIndex:
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS docs "
+                          "(id INTEGER PRIMARY KEY, source TEXT, title TEXT, month TEXT, crawl_keyword TEXT, link TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS postings (gram TEXT PRIMARY KEY, ids BLOB)")
+        self.docs = None
+        self.postings = None
+
+    # ---- 빌드 ----
+    def build(self, rows):
+        """rows: (source, title, published, crawl_keyword, link) 반복자. 기존 색인은 지운다."""
+        self.conn.execute("DELETE FROM docs")
+        self.conn.execute("DELETE FROM postings")
+        postings = defaultdict(lambda: array("I"))
+        batch, n = [], 0
+        for source, title, published, crawl_keyword, link in rows:
+            title = str(title or "")
+            for g in grams(title):
+                postings[g].append(n)   # 문서 번호 오름차순으로 쌓임
+            batch.append((n, source, title, month_of(published), crawl_keyword, link))
+            n += 1
+            if len(batch) >= BATCH:
+                self.conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?)", batch)
+                batch = []
+        self.conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?)", batch)
+        self.conn.executemany("INSERT INTO postings VALUES (?, ?)",
+                              ((g, ids.tobytes()) for g, ids in postings.items()))
+        self.conn.commit()
+        print(f"[INDEX] {n} titles, {len(postings)} keys -> {self.path}")
+
+    # ---- 읽기 ----
+    def load(self):
+        if self.docs is not None:
+            return
+        self.docs = self.conn.execute(
+            "SELECT source, title, month, crawl_keyword FROM docs ORDER BY id").fetchall()
+        self.compact = [compact(d[1]) for d in self.docs]
+        self.postings = {}
+        for g, blob in self.conn.execute("SELECT gram, ids FROM postings"):
+            ids = array("I")
+            ids.frombytes(blob)
+            self.postings[g] = ids
+        self.words = [g for g in self.postings if g.startswith("w:")]
+
+    def _containing(self, ch: str) -> set:
+        """한 글자: 그 글자가 든 bigram/unigram 키의 합집합."""
+        return {i for g, p in self.postings.items() if not g.startswith("w:") and ch in g for i in p}
+
+    def _candidates(self, term: str) -> set | None:
+        """term을 포함할 수 있는 문서(색인 키 교집합). 걸러낼 키가 없으면 None(전체)."""
+        result = None
+        for run in ASCII_RUN_RE.findall(spaced(term)):
+            # 부분 문자열 의미 → 그 조각을 포함하는 모든 토큰의 합집합
+            ids = set()
+            for w in self.words:
+                if run in w[2:]:
+                    ids.update(self.postings[w])
+            result = ids if result is None else result & ids
+            if not result:
+                return result
+        for run in OTHER_RUN_RE.findall(compact(term)):
+            if len(run) == 1:
+                keys_ids = [self._containing(run)]
+            else:
+                # 드문 bigram부터 교집합
+                keys = sorted({run[i:i + 2] for i in range(len(run) - 1)},
+                              key=lambda k: len(self.postings.get(k, ())))
+                keys_ids = (self.postings.get(k, ()) for k in keys)
+            for ids in keys_ids:
+                result = set(ids) if result is None else result.intersection(ids)
+                if not result:
+                    return result
+        return result
+
+    def term(self, term: str, strict: bool = False) -> set:
+        term = term.lower()
+        needle = spaced(term) if strict else compact(term)
+        cand = self._candidates(term)
+        ids = range(len(self.docs)) if cand is None else cand
+        if strict:
+            return {i for i in ids if needle in spaced(self.docs[i][1])}
+        return {i for i in ids if needle in self.compact[i]}
+
+    # ---- 질의 ----
+    def search(self, query: str) -> set:
+        self.load()
+        tokens = QUERY_TOKEN_RE.findall(query)
+        pos = 0
+
+        def peek():
+            return tokens[pos] if pos < len(tokens) else None
+
+        def take():
+            nonlocal pos
+            pos += 1
+            return tokens[pos - 1]
+
+        def parse_or():
+            result = parse_and()
+            while peek() == "OR":
+                take()
+                result = result | parse_and()
+            return result
+
+        def parse_and():
+            result = parse_not()
+            while peek() not in (None, ")", "OR"):
+                if peek() == "AND":
+                    take()
+                result = result & parse_not()
+            return result
+
+        def parse_not():
+            if peek() == "NOT":
+                take()
+                return set(range(len(self.docs))) - parse_not()
+            return parse_atom()
+
+        def parse_atom():
+            if peek() in (None, ")"):
+                # 연산자 뒤에 검색어가 없음("폭염 NOT", "NOT", "(", "()")
+                where = f"before {peek()!r}" if peek() else "at end of query"
+                raise ValueError(f"expected a search term {where}")
+            tok = take()
+            if tok == "(":
+                result = parse_or()
+                if peek() == ")":
+                    take()
+                return result
+            if tok.startswith('="'):
+                return self.term(tok[2:-1], strict=True)
+            if tok.startswith('"'):
+                return self.term(tok[1:-1])
+            return self.term(tok)
+
+        if not tokens:
+            return set()
+        result = parse_or()
+        if peek() is not None:
+            raise ValueError(f"unexpected {peek()!r} in query")
+        return result
+
+    def counts(self, ids: set, by: str) -> Counter:
+        col = {"source": 0, "month": 2, "crawl_keyword": 3}[by]
+        return Counter(self.docs[i][col] for i in ids)
+
+    def keyword_matrix(self, keywords: list) -> list:
+        """키워드 × 월 × 출처 개수 행 목록 [(keyword, month, source, count), ...]."""
+        self.load()
+        out = []
+        for kw in keywords:
+            ids = self.term(kw)
+            c = Counter((self.docs[i][2], self.docs[i][0]) for i in ids)
+            out.extend((kw, month, source, n) for (month, source), n in sorted(c.items()))
+        return out
+
+# ============================ 입력 ============================
+def read_rows(paths: list):
+    """엑셀(기사: title/published/link/keyword, 영상: Title/UploadDate/Channel)과 temp JSON 스냅샷."""
+    for path in paths:
+        stem = Path(path).stem
+        if path.endswith(".json"):
+            from yt_store import VideoStore
+            for vid, rec in VideoStore.load(path).items():
+                r = rec.to_dict()
+                yield r.get("Channel") or stem, r.get("Title"), r.get("UploadDate"), "", r.get("Video URL")
+            continue
+        import pandas as pd
+        df = pd.read_excel(path, dtype=str).fillna("")
+        if "title" in df.columns:
+            for r in df.to_dict("records"):
+                yield stem, r["title"], r.get("published", ""), r.get("keyword", ""), r.get("link", "")
+        elif "Title" in df.columns:
+            for r in df.to_dict("records"):
+                yield r.get("Channel") or stem, r["Title"], r.get("UploadDate", ""), "", r.get("Video URL", "")
+        else:
+            print(f"[WARN] {path}: 'title'/'Title' 컬럼이 없어 건너뜀")
+
+# ============================ 실행 ============================
+def main():
+    parser = argparse.ArgumentParser(description="Inverted index over collected titles")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("index")
+    b.add_argument("inputs", nargs="+")
+    q = sub.add_parser("query")
+    q.add_argument("index")
+    q.add_argument("query")
+    q.add_argument("--by", choices=["source", "month", "crawl_keyword"], default="source")
+    q.add_argument("--show", type=int, default=10, help="일치한 제목 몇 개를 보여줄지")
+    k = sub.add_parser("keywords")
+    k.add_argument("index")
+    k.add_argument("keywords", nargs="+")
+    k.add_argument("--out", help="키워드×월×출처 표를 엑셀로 저장")
+    args = parser.parse_args()
+
+    idx = TitleIndex(args.index)
+    if args.cmd == "build":
+        idx.build(read_rows(args.inputs))
+        return
+
+    t0 = time.perf_counter()
+    idx.load()
+    print(f"[INDEX] loaded {len(idx.docs)} titles in {time.perf_counter() - t0:.2f}s")
+
+    if args.cmd == "query":
+        t0 = time.perf_counter()
+        try:
+            ids = idx.search(args.query)
+        except ValueError as e:
+            parser.error(f"query syntax: {e}")
+        print(f"[QUERY] {args.query!r}: {len(ids)} titles ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        for key, n in sorted(idx.counts(ids, args.by).items()):
+            print(f"  {key or '-':<20} {n:>7}")
+        for i in sorted(ids)[:args.show]:
+            print(f"  · [{idx.docs[i][0]}] {idx.docs[i][2]} {idx.docs[i][1]}")
+    else:
+        t0 = time.perf_counter()
+        rows = idx.keyword_matrix(args.keywords)
+        print(f"[QUERY] {len(args.keywords)} keywords ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        totals = Counter()
+        for kw, _, _, n in rows:
+            totals[kw] += n
+        for kw in args.keywords:
+            print(f"  {kw:<20} {totals[kw]:>7}")
+        if args.out:
+            import pandas as pd
+            df = pd.DataFrame(rows, columns=["keyword", "month", "source", "count"])
+            df.pivot_table(index=["keyword", "source"], columns="month", values="count",
+                           fill_value=0, aggfunc="sum").to_excel(args.out)
+            print(f"[INFO] saved to  : {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,8 @@
-import json
 import pandas as pd
+from yt_store import load_records
 
-# JSON 파일 읽기
-with open("final.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
+# JSON 파일 읽기(컬럼형 스냅샷/예전 dict 형식 모두)
+data = load_records("final.json")
 
 # dict → DataFrame
 df = pd.DataFrame(list(data.values()))
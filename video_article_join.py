@@ -0,0 +1,142 @@
+# pip install numpy pandas openpyxl
+# YouTube 영상(Title, UploadDate, Channel) ↔ 방송사 기사(title, published, link) 매칭
+# - 블로킹: 같은 방송사 + 업로드일 ±WINDOW_DAYS 안의 기사만 후보(전체 교차 조인 없음)
+# - 점수: 문자 bigram + 단어 토큰 해시 벡터의 코사인 유사도(후보 블록마다 행렬곱 한 번)
+# - 영상마다 최고 점수 기사 1건 + 신뢰도(2등과의 차이 반영)
+# 사용: python video_article_join.py out.xlsx videos.xlsx kbs_titles.xlsx mbc_titles.xlsx sbs_titles.xlsx
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from near_duplicate import BRACKET_TAG_RE, normalize_title
+
+# ============================ 설정 ============================
+WINDOW_DAYS = 2                 # 업로드일 기준 ± 일수
+DIM = 1 << 12                   # 해시 특징 차원(블록 단위로만 밀집 행렬을 만든다)
+TOKEN_WEIGHT = 1.0              # 단어 토큰 특징 가중치(문자 bigram은 1.0)
+MIN_SCORE = 0.3                 # 이보다 낮으면 매칭 없음
+AMBIGUITY = 0.5                 # 신뢰도 = score × (1 − AMBIGUITY × 2등/1등)
+LOCAL_TZ = "Asia/Seoul"         # 기사 published는 한국 날짜
+
+# 채널명/파일명 → 방송사
+BROADCASTERS = {"kbs": "KBS", "mbc": "MBC", "sbs": "SBS"}
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# ============================ 특징 ============================
+def broadcaster_of(text: str) -> str | None:
+    t = str(text or "").lower()
+    for key, name in BROADCASTERS.items():
+        if key in t:
+            return name
+    return None
+
+def title_features(title: str) -> tuple:
+    """(특징 인덱스, 가중치) — 문자 bigram(정규화 제목) + 단어 토큰(괄호 태그 제거)."""
+    norm = normalize_title(title)
+    grams = {norm[i:i + 2] for i in range(len(norm) - 1)} or ({norm} if norm else set())
+    tokens = {t.lower() for t in TOKEN_RE.findall(BRACKET_TAG_RE.sub(" ", str(title or ""))) if len(t) > 1}
+    idx = [zlib.crc32(g.encode("utf-8")) % DIM for g in grams]
+    idx += [zlib.crc32(b"t:" + t.encode("utf-8")) % DIM for t in tokens]
+    w = [1.0] * len(grams) + [TOKEN_WEIGHT] * len(tokens)
+    return np.asarray(idx, dtype=np.int64), np.asarray(w, dtype=np.float32)
+
+def block_matrix(feats: list) -> np.ndarray:
+    """특징 목록 → L2 정규화된 (len × DIM) 행렬(블록에 든 제목만)."""
+    m = np.zeros((len(feats), DIM), dtype=np.float32)
+    for row, (idx, w) in enumerate(feats):
+        np.add.at(m[row], idx, w)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.maximum(norms, 1e-9)
+
+# ============================ 조인 ============================
+def to_local_day(s: pd.Series) -> np.ndarray:
+    dt = pd.to_datetime(s, utc=True, errors="coerce").dt.tz_convert(LOCAL_TZ)
+    return (dt.dt.tz_localize(None).dt.normalize() - pd.Timestamp("1970-01-01")).dt.days.to_numpy()
+
+def join(videos: pd.DataFrame, articles: pd.DataFrame, window: int = WINDOW_DAYS) -> pd.DataFrame:
+    """
+    videos: Title, UploadDate, Channel / articles: title, published, link, broadcaster.
+    반환: videos + matched_title/matched_published/matched_link/score/second/confidence.
+    """
+    videos = videos.reset_index(drop=True).copy()
+    videos["broadcaster"] = videos["Channel"].map(broadcaster_of)
+    videos["_day"] = to_local_day(videos["UploadDate"])
+    articles = articles.reset_index(drop=True).copy()
+    articles["_day"] = pd.to_datetime(articles["published"], errors="coerce").dt.normalize()
+    articles["_day"] = (articles["_day"] - pd.Timestamp("1970-01-01")).dt.days
+
+    n = len(videos)
+    best = np.full(n, -1, dtype=np.int64)
+    score = np.zeros(n, dtype=np.float32)
+    second = np.zeros(n, dtype=np.float32)
+    pairs = 0
+
+    v_feats = [title_features(t) for t in videos["Title"].astype(str)]
+    a_feats = [title_features(t) for t in articles["title"].astype(str)]
+
+    for bc, vg in videos.dropna(subset=["broadcaster", "_day"]).groupby("broadcaster"):
+        ag = articles[(articles["broadcaster"] == bc) & articles["_day"].notna()].sort_values("_day")
+        if ag.empty:
+            continue
+        a_days = ag["_day"].to_numpy()
+        a_rows = ag.index.to_numpy()
+        for day, vday in vg.groupby("_day"):
+            lo, hi = np.searchsorted(a_days, [day - window, day + window + 1])
+            if lo == hi:
+                continue
+            cand = a_rows[lo:hi]
+            v_rows = vday.index.to_numpy()
+            sim = block_matrix([v_feats[i] for i in v_rows]) @ block_matrix([a_feats[j] for j in cand]).T
+            pairs += sim.size
+            top = sim.argmax(axis=1)
+            top_score = sim[np.arange(len(v_rows)), top]
+            if sim.shape[1] > 1:
+                runner_up = np.partition(sim, -2, axis=1)[:, -2]
+            else:
+                runner_up = np.zeros(len(v_rows), dtype=np.float32)
+            best[v_rows] = cand[top]
+            score[v_rows] = top_score
+            second[v_rows] = runner_up
+
+    matched = (best >= 0) & (score >= MIN_SCORE)
+    pick = np.where(matched, best, 0)
+    for col in ("title", "published", "link"):
+        values = articles[col].to_numpy()[pick] if len(articles) else np.full(n, None)
+        videos[f"matched_{col}"] = np.where(matched, values, None)
+    videos["score"] = np.where(matched, score.round(3), np.nan)
+    videos["second"] = np.where(matched, second.round(3), np.nan)
+    ratio = np.divide(second, score, out=np.zeros_like(score), where=score > 0)
+    videos["confidence"] = np.where(matched, (score * (1 - AMBIGUITY * ratio)).round(3), np.nan)
+    print(f"[JOIN] {n} videos x {len(articles)} articles: {pairs} scored pairs "
+          f"(cross join would be {n * len(articles)}), matched {int(matched.sum())}", flush=True)
+    return videos.drop(columns=["_day"])
+
+# ============================ 실행 ============================
+def load_articles(paths: list) -> pd.DataFrame:
+    frames = []
+    for path in paths:
+        bc = broadcaster_of(Path(path).name)
+        if bc is None:
+            raise ValueError(f"{path}: 파일명으로 방송사(kbs/mbc/sbs)를 알 수 없습니다.")
+        df = pd.read_excel(path, dtype=str)
+        frames.append(df[["title", "published", "link"]].assign(broadcaster=bc))
+    return pd.concat(frames, ignore_index=True)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("usage: python video_article_join.py out.xlsx videos.xlsx kbs.xlsx [mbc.xlsx sbs.xlsx ...]")
+        sys.exit(1)
+    out_path, video_path, article_paths = sys.argv[1], sys.argv[2], sys.argv[3:]
+    videos = pd.read_excel(video_path, dtype=str)
+    articles = load_articles(article_paths)
+    t0 = time.perf_counter()
+    out = join(videos, articles)
+    print(f"[JOIN] done in {time.perf_counter() - t0:.1f}s")
+    out.to_excel(out_path, index=False)
+    print(f"[INFO] saved to  : {out_path}")
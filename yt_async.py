@@ -0,0 +1,216 @@
+# googleapiclient 없이 쓰는 가벼운 asyncio YouTube Data API 클라이언트
+# (channels/playlists/playlistItems/search/videos .list만) — 응답은 googleapiclient와 같은 dict 모양
+# 연결은 keep-alive 풀 하나를 공유하므로 여러 채널/재생목록을 한 이벤트 루프에서 동시에 페이지 넘길 수 있다
+# pip install aiohttp (선택: orjson — 있으면 JSON 디코딩이 빨라짐)
+import sys
+import json
+import random
+import asyncio
+from typing import AsyncIterator
+
+import aiohttp
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:  # orjson 없으면 표준 json
+    loads = json.loads
+
+from yt_quota import QuotaLedger, QuotaExhausted, is_quota_error, key_id
+from yt_cache import ResponseCache, cache_key
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+API_KEYS = [""]
+
+BASE_URL = "https://www.googleapis.com/youtube/v3/"
+RESOURCES = {                   # 메서드 → 경로
+    "channels.list": "channels",
+    "playlists.list": "playlists",
+    "playlistItems.list": "playlistItems",
+    "search.list": "search",
+    "videos.list": "videos",
+}
+POOL_SIZE = 16                  # keep-alive 연결 수(= 동시 요청 상한)
+KEEPALIVE = 30                  # 유휴 연결 유지(초)
+TIMEOUT = 20
+MAX_RETRIES = 5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# -----------------------------
+# ERRORS
+# -----------------------------
+class YouTubeAPIError(Exception):
+    def __init__(self, status: int, content: bytes, uri: str):
+        super().__init__(f"<HTTP {status} for {uri}: {content[:200]!r}>")
+        self.status = status
+        self.content = content
+        self.uri = uri
+
+    @property
+    def resp(self):
+        # googleapiclient HttpError와 같은 모양(e.resp.status, e.content) → is_quota_error 그대로 사용
+        return self
+
+# -----------------------------
+# CLIENT
+# -----------------------------
+class AsyncYouTube:
+    """
+    async with AsyncYouTube(API_KEYS) as yt:
+        res = await yt.list("playlistItems.list", part="snippet", playlistId=pid, maxResults=50)
+    키 선택/차감/서버측 쿼터 초과 시 다음 키로 넘기기는 YouTubeClientPool과 같은 원장을 쓴다.
+    """
+
+    def __init__(self, api_keys: list, ledger: QuotaLedger | None = None, pool_size: int = POOL_SIZE,
+                 cache: ResponseCache | None = None):
+        self.api_keys = list(dict.fromkeys(k for k in api_keys if k))
+        if not self.api_keys:
+            raise ValueError("API_KEYS is empty")
+        self.ledger = ledger or QuotaLedger()
+        self.cache = cache
+        self.pool_size = pool_size
+        self.session: aiohttp.ClientSession | None = None
+        self.calls = {k: 0 for k in self.api_keys}
+        self.failovers = 0
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=KEEPALIVE, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+            headers={"Accept-Encoding": "gzip"},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def pick(self, method: str) -> str:
+        candidates = [k for k in self.api_keys if self.ledger.can_afford(k, method)]
+        if not candidates:
+            raise QuotaExhausted(f"all {len(self.api_keys)} keys exhausted for {method}")
+        return max(candidates, key=self.ledger.remaining)
+
+    async def _get(self, method: str, api_key: str, params: dict, etag: str | None = None) -> dict | None:
+        """200 → 응답 dict, 304(etag와 같음) → None."""
+        url = BASE_URL + RESOURCES[method]
+        query = {k: str(v) for k, v in params.items() if v is not None}
+        query["key"] = api_key
+        headers = {"If-None-Match": etag} if etag else None
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                async with self.session.get(url, params=query, headers=headers) as r:
+                    body = await r.read()
+                    if r.status == 200:
+                        return loads(body)
+                    if r.status == 304 and etag:
+                        return None
+                    err = YouTubeAPIError(r.status, body, f"{url}?{method}")
+                    if r.status not in RETRY_STATUS:
+                        raise err
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                err = e
+            if attempt == MAX_RETRIES:
+                raise err
+            await asyncio.sleep(min(60, 2 ** attempt) + random.uniform(0, 1))
+
+    async def list(self, method: str, **params) -> dict:
+        """googleapiclient의 yt.<resource>().list(**params).execute()와 같은 응답 dict."""
+        cached = key = None
+        if self.cache is not None:
+            key = cache_key(method, params)
+            cached = self.cache.lookup(key)
+            if cached and self.cache.is_fresh(cached[2]):
+                return self.cache.fresh(cached[1])
+
+        while True:
+            api_key = self.pick(method)
+            self.ledger.charge(api_key, method)
+            try:
+                res = await self._get(method, api_key, params, cached[0] if cached else None)
+                self.calls[api_key] += 1
+                if res is None:
+                    return self.cache.revalidated(key, cached[1])
+                if self.cache is not None:
+                    if cached:
+                        self.cache.changed()
+                    self.cache.store(key, res)
+                return res
+            except YouTubeAPIError as e:
+                if not is_quota_error(e):
+                    raise
+                self.ledger.mark_exhausted(api_key)
+                self.failovers += 1
+                print(f"[ASYNC] key {key_id(api_key)} exhausted; failing over", flush=True)
+
+    async def pages(self, method: str, **params) -> AsyncIterator[dict]:
+        """nextPageToken을 따라 응답을 차례로 내보낸다."""
+        token = params.pop("pageToken", None)
+        while True:
+            res = await self.list(method, pageToken=token, **params)
+            yield res
+            token = res.get("nextPageToken")
+            if not token:
+                return
+
+    # 자주 쓰는 5개 엔드포인트
+    async def channels(self, **params) -> dict:
+        return await self.list("channels.list", **params)
+
+    async def playlists(self, **params) -> dict:
+        return await self.list("playlists.list", **params)
+
+    async def playlist_items(self, **params) -> dict:
+        return await self.list("playlistItems.list", **params)
+
+    async def search(self, **params) -> dict:
+        return await self.list("search.list", **params)
+
+    async def videos(self, **params) -> dict:
+        return await self.list("videos.list", **params)
+
+    def report(self):
+        for k in self.api_keys:
+            print(f"  [ASYNC] key={key_id(k)} used={self.ledger.used(k):>6} "
+                  f"remaining={self.ledger.remaining(k):>6} calls={self.calls[k]}")
+        print(f"  [ASYNC] failovers={self.failovers}", flush=True)
+        if self.cache is not None:
+            self.cache.report()
+
+# -----------------------------
+# HELPERS
+# -----------------------------
+async def playlist_items(yt: AsyncYouTube, playlist_id: str, part: str = "snippet,contentDetails") -> list:
+    items = []
+    async for res in yt.pages("playlistItems.list", part=part, playlistId=playlist_id, maxResults=50):
+        items.extend(res.get("items", []))
+    return items
+
+async def gather_playlists(yt: AsyncYouTube, playlist_ids: list, part: str = "snippet,contentDetails") -> dict:
+    """재생목록 여러 개를 동시에 끝까지 넘긴다(동시성은 연결 풀 크기로 제한)."""
+    results = await asyncio.gather(*(playlist_items(yt, pid, part) for pid in playlist_ids),
+                                   return_exceptions=True)
+    out = {}
+    for pid, res in zip(playlist_ids, results):
+        if isinstance(res, QuotaExhausted):
+            raise res
+        if isinstance(res, Exception):
+            print(f"[ERROR] playlist {pid}: {res}")
+            continue
+        out[pid] = res
+    return out
+
+# -----------------------------
+# MAIN
+# -----------------------------
+async def amain(playlist_ids: list):
+    async with AsyncYouTube(API_KEYS) as yt:
+        found = await gather_playlists(yt, playlist_ids)
+        for pid, items in found.items():
+            print(f"[ASYNC] {pid}: {len(items)} items")
+        yt.report()
+
+if __name__ == "__main__":
+    asyncio.run(amain(sys.argv[1:]))
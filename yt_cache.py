@@ -0,0 +1,101 @@
+# YouTube 응답 로컬 캐시(SQLite): ETag와 함께 저장해 두었다가 같은 요청에 If-None-Match를 보내고,
+# 304면 저장된 응답을 그대로 돌려준다. max_age 안의 응답은 요청 없이 바로 쓴다(쿼터 0).
+import json
+import time
+import sqlite3
+import threading
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+CACHE_FILE = "yt_cache.sqlite"
+IGNORED_PARAMS = {"key", "alt", "prettyPrint"}   # 키가 바뀌어도 같은 요청으로 본다
+
+# -----------------------------
+# UTIL / HELPERS
+# -----------------------------
+def cache_key(method: str, params: dict) -> str:
+    items = sorted((k, str(v)) for k, v in params.items() if v is not None and k not in IGNORED_PARAMS)
+    return f"{method}?{urlencode(items)}"
+
+def request_key(method: str, uri: str) -> str:
+    """googleapiclient HttpRequest.uri → cache_key와 같은 형태."""
+    return cache_key(method, dict(parse_qsl(urlparse(uri).query)))
+
+# -----------------------------
+# CACHE
+# -----------------------------
+class ResponseCache:
+    """
+    lookup(key) → (etag, body) / None, store(key, body)는 body["etag"]가 있을 때만.
+    304(revalidated)와 max_age 안의 즉시 응답(fresh)을 적중으로 센다.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, max_age: float = 0):
+        self.path = path
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS responses "
+                          "(key TEXT PRIMARY KEY, etag TEXT, body TEXT, stored REAL)")
+        self.conn.commit()
+        self.stats = {"lookups": 0, "fresh": 0, "revalidated": 0, "misses": 0, "stored": 0, "bytes_saved": 0}
+
+    def _count(self, name: str, n: int = 1):
+        with self.lock:
+            self.stats[name] += n
+
+    def lookup(self, key: str) -> tuple | None:
+        with self.lock:
+            self.stats["lookups"] += 1
+            row = self.conn.execute("SELECT etag, body, stored FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        return row
+
+    def is_fresh(self, stored: float) -> bool:
+        return self.max_age > 0 and time.time() - stored < self.max_age
+
+    def fresh(self, body: str) -> dict:
+        self._count("fresh")
+        self._count("bytes_saved", len(body))
+        return json.loads(body)
+
+    def revalidated(self, key: str, body: str) -> dict:
+        """304 → 저장된 응답. stored를 갱신해 max_age를 다시 센다."""
+        self._count("revalidated")
+        self._count("bytes_saved", len(body))
+        with self.lock:
+            self.conn.execute("UPDATE responses SET stored = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return json.loads(body)
+
+    def store(self, key: str, res: dict):
+        etag = res.get("etag")
+        if not etag:
+            return
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                              (key, etag, json.dumps(res, ensure_ascii=False), time.time()))
+            self.conn.commit()
+            self.stats["stored"] += 1
+
+    def changed(self):
+        """ETag를 보냈지만 200(내용 변경)이 온 경우 — 적중 아님."""
+        self._count("misses")
+
+    def hit_rate(self) -> float:
+        s = self.stats
+        return (s["fresh"] + s["revalidated"]) / s["lookups"] if s["lookups"] else 0.0
+
+    def report(self):
+        s = self.stats
+        print(f"  [CACHE] lookups={s['lookups']} fresh={s['fresh']} revalidated(304)={s['revalidated']} "
+              f"misses={s['misses']} hit_rate={self.hit_rate():.1%} saved={s['bytes_saved'] / 1e6:.1f}MB", flush=True)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
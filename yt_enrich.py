@@ -0,0 +1,152 @@
+# existing_data(videoId → 레코드)에 videos.list 상세정보(길이/조회수/좋아요/태그)를 50개씩 묶어 붙인다
+# 사용: python yt_enrich.py temp.json
+import re
+import sys
+from typing import Dict
+
+from yt_pool import YouTubeClientPool
+from yt_quota import QuotaExhausted
+from yt_store import VideoStore
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+API_KEYS = [""]
+
+BATCH_IDS = 50                  # videos.list / channels.list 의 id 최대 개수
+BATCH_CALLS = 10                # BatchHttpRequest 한 번에 묶을 호출 수(왕복 1회)
+ENRICH_PARTS = "contentDetails,statistics,snippet"
+
+DURATION_RE = re.compile(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+
+# -----------------------------
+# UTIL / HELPERS
+# -----------------------------
+def chunked(seq: list, size: int):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+def duration_seconds(iso: str | None) -> int | None:
+    """ISO 8601 길이(PT1H2M3S) → 초."""
+    m = DURATION_RE.fullmatch(iso or "")
+    if not m or not iso:
+        return None
+    d, h, mi, sec = (int(x or 0) for x in m.groups())
+    return ((d * 24 + h) * 60 + mi) * 60 + sec
+
+def to_int(v) -> int | None:
+    return int(v) if v not in (None, "") else None
+
+def video_fields(item: dict) -> dict:
+    cdet = item.get("contentDetails", {}) or {}
+    stats = item.get("statistics", {}) or {}
+    snippet = item.get("snippet", {}) or {}
+    return {
+        "Duration": cdet.get("duration"),
+        "DurationSec": duration_seconds(cdet.get("duration")),
+        "Definition": cdet.get("definition"),
+        "Caption": cdet.get("caption"),
+        "ViewCount": to_int(stats.get("viewCount")),
+        "LikeCount": to_int(stats.get("likeCount")),
+        "CommentCount": to_int(stats.get("commentCount")),
+        "Tags": "|".join(snippet.get("tags", []) or []),
+        "Available": True,
+    }
+
+# -----------------------------
+# ENRICHMENT
+# -----------------------------
+def enrich_videos(pool: YouTubeClientPool, existing_data: Dict[str, dict],
+                  use_batch: bool = True, force: bool = False) -> int:
+    """
+    아직 보강 안 된 레코드만 골라 videos.list(id=50개)로 상세정보를 병합한다.
+    50k개 ≈ 1,000 units. 응답에 없는(삭제/비공개) 영상은 Available=False로 표시해 다시 묻지 않는다.
+    """
+    todo = [vid for vid, rec in existing_data.items() if force or "Available" not in rec]
+    if not todo:
+        print("[ENRICH] nothing to enrich")
+        return 0
+
+    id_chunks = list(chunked(todo, BATCH_IDS))
+    print(f"[ENRICH] {len(todo)} videos -> {len(id_chunks)} videos.list calls", flush=True)
+
+    def make(ids):
+        return lambda yt: yt.videos().list(part=ENRICH_PARTS, id=",".join(ids))
+
+    def single(ids):
+        # 배치 경로와 같게: 쿼터 소진만 올리고, 나머지 오류는 로그 후 None(다음 실행에서 다시)
+        try:
+            return pool.execute("videos.list", make(ids))
+        except QuotaExhausted:
+            raise
+        except Exception as e:
+            print(f"[ERROR] videos.list failed for {len(ids)} videos: {e}", flush=True)
+            return None
+
+    enriched = 0
+    for group in chunked(id_chunks, BATCH_CALLS if use_batch else 1):
+        if use_batch and len(group) > 1:
+            responses = pool.execute_batch("videos.list", [make(ids) for ids in group])
+        else:
+            responses = [single(ids) for ids in group]
+
+        for ids, res in zip(group, responses):
+            if res is None:
+                continue  # 실패한 묶음은 다음 실행에서 다시
+            found = {it["id"]: it for it in res.get("items", [])}
+            for vid in ids:
+                if vid in found:
+                    existing_data[vid].update(video_fields(found[vid]))
+                    enriched += 1
+                else:
+                    existing_data[vid]["Available"] = False
+        print(f"[ENRICH] {enriched}/{len(todo)} enriched", flush=True)
+
+    return enriched
+
+def get_uploads_playlist_ids(pool: YouTubeClientPool, channel_ids: list) -> Dict[str, str]:
+    """channels.list(id=최대 50개)로 채널별 업로드 재생목록 ID를 한 번에 조회."""
+    def lookup(ids: list) -> dict:
+        res = pool.execute("channels.list", lambda yt: yt.channels().list(
+            part="contentDetails",
+            id=",".join(ids),
+        ))
+        return {item["id"]: item["contentDetails"]["relatedPlaylists"]["uploads"] for item in res.get("items", [])}
+
+    uploads: Dict[str, str] = {}
+    for ids in chunked(list(channel_ids), BATCH_IDS):
+        try:
+            uploads.update(lookup(ids))
+            continue
+        except QuotaExhausted:
+            raise
+        except Exception as e:
+            print(f"[ERROR] channels.list failed for {len(ids)} channel(s): {e}")
+        # 묶음이 실패하면 한 채널씩 다시(실패한 채널만 로그 남기고 넘어감)
+        for cid in ids if len(ids) > 1 else []:
+            try:
+                uploads.update(lookup([cid]))
+            except QuotaExhausted:
+                raise
+            except Exception as e:
+                print(f"[ERROR] channels.list failed for {cid}: {e}")
+    for cid in channel_ids:
+        if cid not in uploads:
+            print(f"[ERROR] Cannot get uploads playlist for channel {cid}")
+    return uploads
+
+# -----------------------------
+# MAIN
+# -----------------------------
+def main(path: str):
+    data = VideoStore.load(path)
+    pool = YouTubeClientPool(API_KEYS)
+    try:
+        enrich_videos(pool, data)
+    finally:
+        data.save(path)
+        print(f"[INFO] Enriched data saved ({len(data)} videos) -> {path}")
+        pool.report()
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "temp.json")
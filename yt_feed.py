@@ -0,0 +1,284 @@
+# 채널 공개 Atom 피드(/feeds/videos.xml?channel_id=)를 조건부 GET으로 폴링 → 쿼터 0으로 새 업로드 수집
+# 피드에는 최근 15개만 실리므로, 지난 폴링 이후 빠진 구간(gap)이 보일 때만 Data API(업로드 재생목록)로 메운다
+# 사용: python yt_feed.py [--once] [--interval 300] [--feed-url "http://127.0.0.1:8000/feed?channel_id={channel_id}"]
+import os
+import time
+import json
+import random
+import argparse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from yt_quota import QuotaExhausted
+from yt_traverse import walk_playlist
+from yt_watermark import rfc3339
+from yt_store import VideoStore
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+API_KEYS = [""]                 # 백필(gap)일 때만 사용
+
+CHANNELS = {
+    "UCcQTRi69dsVYHN3exePtZ1A": "KBS 뉴스",
+    "UCF4Wxdo3inmxP-Y59wXDsFw": "MBC 뉴스",
+    "UCkinYTS9IHqOEwR1Sze2JTw": "SBS 뉴스",
+    "UCBi2mrWuNuyYy4gbM6fU18Q": "ABC 뉴스",
+    "UCeY0bbntWzzVIaj2z3QigXg": "NBC 뉴스",
+    "UC8p1vwvWtl6T73JiExfWs1g": "CBS News",
+}
+
+KEYWORDS = [
+    '기후', '기후변화', '기후위기', '온난화', '탄소', '온실가스', '해수면', '이상기후',
+    '종말', '살인 폭염', '이상기온', '이례적', '유례없는', '극한',
+    '인류', '역사상', '펄펄', '최악의 더위', '북극', '열대화', '엘니뇨', '라니냐', '기온 급상승', '수온', '재생',
+    'climate', 'warming', 'carbon', 'carbon dioxide', 'renewable',
+    'sea level', 'heat wave', 'extreme weather', 'extinction', 'record-breaking',
+    'historic high', 'unusual weather', 'freak weather', 'ecosystem', 'greenhouse gas',
+    'abnormal weather', 'scorching', 'Arctic', 'El Niño', 'La Niña', 'temperature',
+]
+
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+FEED_SIZE = 15                  # 피드에 실리는 최근 항목 수 — 꽉 찼는데 아는 항목이 없으면 gap
+POLL_INTERVAL = 300             # 초
+POLL_JITTER = (0.0, 30.0)       # 채널 폴링이 한꺼번에 몰리지 않도록
+SLEEP_REQ = 0.5                 # 채널 간 딜레이(초)
+TIMEOUT = 15
+
+TEMP_FILE = "temp.json"         # 크롤러와 같은 existing_data 저장소
+FEED_STATE_FILE = "feed_state.json"  # 채널별 ETag/Last-Modified, 직전 피드 videoId, 최신 항목
+
+BACKFILL = True                 # gap이면 업로드 재생목록을 워터마크까지 되짚기(playlistItems.list, 1 unit/페이지)
+
+NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_6) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0 Safari/537.36",
+    "Accept": "application/atom+xml, application/xml;q=0.9, */*;q=0.8",
+    "Connection": "keep-alive",
+}
+
+# -----------------------------
+# UTIL / HELPERS
+# -----------------------------
+def make_session() -> requests.Session:
+    s = requests.Session()
+    retries = Retry(
+        total=3, connect=3, read=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retries)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)     # 로컬 피드 스텁
+    s.headers.update(HEADERS)
+    return s
+
+def load_json(path: str) -> dict:
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def save_json(path: str, data: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+def keyword_filter(title: str) -> bool:
+    title_lower = title.lower()
+    return any(kw.lower() in title_lower for kw in KEYWORDS)
+
+def parse_feed(xml_bytes: bytes) -> list:
+    """Atom 피드/푸시 본문 → [{video_id, channel_id, channel, title, published_at('Z')}, ...] (최신순)."""
+    root = ET.fromstring(xml_bytes)
+    entries = []
+    for e in root.findall("atom:entry", NS):
+        vid = e.findtext("yt:videoId", default="", namespaces=NS)
+        published = e.findtext("atom:published", default="", namespaces=NS)
+        if not vid or not published:
+            continue
+        entries.append({
+            "video_id": vid,
+            "channel_id": e.findtext("yt:channelId", default="", namespaces=NS),
+            "channel": e.findtext("atom:author/atom:name", default="", namespaces=NS),
+            "title": e.findtext("atom:title", default="", namespaces=NS),
+            "published_at": rfc3339(datetime.fromisoformat(published.replace("Z", "+00:00"))),
+        })
+    entries.sort(key=lambda x: x["published_at"], reverse=True)
+    return entries
+
+def ingest(existing_data: dict, video_id: str, title: str, channel: str, published_at: str) -> bool:
+    """크롤러와 같은 레코드 형태로 추가(중복/키워드 불일치면 False)."""
+    if video_id in existing_data or not keyword_filter(title):
+        return False
+    upload_date = published_at.replace("Z", "")
+    existing_data[video_id] = {
+        "Video URL": f"https://www.youtube.com/watch?v={video_id}",
+        "Title": title,
+        "Channel": channel,
+        "UploadDate": upload_date,
+    }
+    print(f"[MATCH] {channel} | {upload_date} | {title}", flush=True)
+    return True
+
+# -----------------------------
+# POLLING
+# -----------------------------
+def fetch_feed(session: requests.Session, url: str, cache: dict) -> list | None:
+    """조건부 GET. 304(변경 없음)면 None. cache에 etag/last_modified를 갱신한다."""
+    headers = {}
+    if cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+    r = session.get(url, headers=headers, timeout=TIMEOUT)
+    if r.status_code == 304:
+        return None
+    r.raise_for_status()
+    cache["etag"] = r.headers.get("ETag") or cache.get("etag")
+    cache["last_modified"] = r.headers.get("Last-Modified") or cache.get("last_modified")
+    return parse_feed(r.content)
+
+def detect_gap(entries: list, cache: dict) -> bool:
+    """직전 피드와 겹치는 항목 없이 피드가 꽉 찼으면 그 사이 업로드가 피드 밖으로 밀려났을 수 있다."""
+    seen = set(cache.get("seen", []))
+    if not seen or len(entries) < FEED_SIZE:
+        return False
+    return not any(e["video_id"] in seen for e in entries)
+
+def backfill(pool, channel_id: str, channel_name: str, mark: dict, existing_data: dict) -> int:
+    """업로드 재생목록(최신순)을 mark(직전 최신 항목)에 닿을 때까지 되짚는다."""
+    from yt_enrich import get_uploads_playlist_ids
+    uploads = get_uploads_playlist_ids(pool, [channel_id])
+    playlist_id = uploads.get(channel_id)
+    if not playlist_id:
+        return 0
+
+    def list_page(page_token, part):
+        return pool.execute("playlistItems.list", lambda yt: yt.playlistItems().list(
+            part=part,
+            playlistId=playlist_id,
+            maxResults=50,
+            pageToken=page_token,
+        ))
+
+    since = datetime.fromisoformat(mark["published_at"].replace("Z", ""))
+    until = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=1)
+    added, stats = 0, {}
+    for items in walk_playlist(list_page, since, until, skip_newer=False, stats=stats,
+                               watermark=dict(mark, order="desc")):
+        for item in items:
+            snippet = item.get("snippet", {}) or {}
+            cdet = item.get("contentDetails", {}) or {}
+            vid = cdet.get("videoId") or (snippet.get("resourceId") or {}).get("videoId")
+            published_at = cdet.get("videoPublishedAt") or snippet.get("publishedAt")
+            if vid and published_at and published_at > mark["published_at"]:
+                added += ingest(existing_data, vid, snippet.get("title", ""), channel_name, published_at)
+    print(f"[FEED] backfill {channel_name}: pages={stats.get('pages')} added={added}", flush=True)
+    return added
+
+def poll_channel(session: requests.Session, channel_id: str, channel_name: str, cache: dict,
+                 existing_data: dict, get_pool=None, feed_url: str = FEED_URL) -> int:
+    """채널 하나를 폴링해 새로 추가한 개수를 돌려준다. get_pool()은 gap일 때만 호출(API 키 필요)."""
+    entries = fetch_feed(session, feed_url.format(channel_id=channel_id), cache)
+    if entries is None:
+        return 0  # 304
+
+    added = 0
+    if cache.get("gap_pending") or detect_gap(entries, cache):
+        cache["gap_pending"] = True
+        if BACKFILL and get_pool and cache.get("newest"):
+            print(f"[FEED] gap detected for {channel_name}; backfilling from {cache['newest']['published_at']}")
+            try:
+                added += backfill(get_pool(), channel_id, channel_name, cache["newest"], existing_data)
+                cache["gap_pending"] = False
+            except QuotaExhausted as e:
+                print(f"[FEED] backfill postponed ({e}); will retry on next poll")
+            except Exception as e:
+                # HttpError 등 — 피드 폴링(데몬)은 계속, gap은 남겨 두고 다음 폴링에서 다시
+                print(f"[WARN] backfill failed for {channel_name} ({e}); will retry on next poll")
+        else:
+            print(f"[FEED] gap detected for {channel_name}; backfill disabled")
+            cache["gap_pending"] = False
+
+    for e in entries:
+        added += ingest(existing_data, e["video_id"], e["title"], channel_name, e["published_at"])
+
+    cache["seen"] = [e["video_id"] for e in entries]
+    # gap을 메우지 못했으면 최신 항목을 올리지 않는다(다음 백필이 같은 지점부터)
+    if entries and not cache.get("gap_pending"):
+        top = entries[0]
+        if not cache.get("newest") or top["published_at"] > cache["newest"]["published_at"]:
+            cache["newest"] = {"video_id": top["video_id"], "published_at": top["published_at"]}
+    return added
+
+# -----------------------------
+# MAIN
+# -----------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Zero-quota YouTube upload polling via channel Atom feeds")
+    parser.add_argument("--once", action="store_true", help="한 번만 폴링하고 종료")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--feed-url", default=FEED_URL, help="{channel_id} 자리표시자가 있는 피드 URL(로컬 스텁 테스트용)")
+    parser.add_argument("--temp-file", default=TEMP_FILE)
+    parser.add_argument("--state-file", default=FEED_STATE_FILE)
+    args = parser.parse_args()
+
+    session = make_session()
+    existing_data = VideoStore.load(args.temp_file)
+    state = load_json(args.state_file)
+    pool = None
+    api_keys = [k for k in API_KEYS if k]
+    if BACKFILL and not api_keys:
+        print("[WARN] API_KEYS is empty; gaps will be logged but not backfilled")
+
+    def get_pool():
+        # 백필이 필요할 때만 만든다 → 평소에는 API 키/쿼터를 전혀 쓰지 않음
+        nonlocal pool
+        if pool is None:
+            from yt_pool import YouTubeClientPool
+            pool = YouTubeClientPool(api_keys)
+        return pool
+
+    try:
+        while True:
+            total_new = 0
+            for channel_id, channel_name in CHANNELS.items():
+                cache = state.setdefault(channel_id, {})
+                try:
+                    total_new += poll_channel(session, channel_id, channel_name, cache,
+                                              existing_data, get_pool if api_keys else None, args.feed_url)
+                except (requests.RequestException, ET.ParseError, ValueError) as e:
+                    print(f"[WARN] feed poll failed for {channel_name}: {e}")
+                time.sleep(SLEEP_REQ)
+
+            if total_new:
+                existing_data.save(args.temp_file)
+                print(f"[INFO] Temp data saved ({len(existing_data)} videos)")
+            save_json(args.state_file, state)
+            print(f"[FEED] {datetime.now().isoformat(timespec='seconds')} poll done: +{total_new}", flush=True)
+
+            if args.once:
+                break
+            time.sleep(args.interval + random.uniform(*POLL_JITTER))
+    except KeyboardInterrupt:
+        print("[INFO] Stopped.")
+    finally:
+        existing_data.save(args.temp_file)
+        save_json(args.state_file, state)
+        if pool is not None:
+            pool.report()
+
+if __name__ == "__main__":
+    main()
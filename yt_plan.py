@@ -0,0 +1,131 @@
+# 재생목록 순회 전 계획 단계: 메타데이터로 범위 밖/업로드 목록과 중복인 재생목록을 거르고 기대 수확순으로 정렬
+from datetime import datetime
+from typing import Callable, Dict
+
+from yt_pool import YouTubeClientPool
+from yt_enrich import chunked, BATCH_IDS
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+PROBE_SIZE = 50                 # probe = 크롤과 같은 1페이지(그대로 재사용)
+PRIOR_HITS = 0.5                # 키워드 적중률 스무딩(표본이 작을 때 0으로 찍히지 않도록)
+
+# -----------------------------
+# UTIL / HELPERS
+# -----------------------------
+def item_date(item: dict) -> datetime | None:
+    snippet = item.get("snippet", {}) or {}
+    cdet = item.get("contentDetails", {}) or {}
+    published_at = cdet.get("videoPublishedAt") or snippet.get("publishedAt")
+    if not published_at:
+        return None
+    return datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+
+def detect_order(dates: list) -> str:
+    """probe 페이지의 날짜 순서: desc(최신순) / asc(오래된순) / mixed."""
+    if len(dates) < 2:
+        return "unknown"
+    if all(a >= b for a, b in zip(dates, dates[1:])):
+        return "desc"
+    if all(a <= b for a, b in zip(dates, dates[1:])):
+        return "asc"
+    return "mixed"
+
+def fetch_playlist_meta(pool: YouTubeClientPool, playlist_ids: list) -> Dict[str, dict]:
+    """playlists.list(id=50개씩)로 itemCount/publishedAt 일괄 조회."""
+    meta: Dict[str, dict] = {}
+    for ids in chunked(list(playlist_ids), BATCH_IDS):
+        res = pool.execute("playlists.list", lambda yt: yt.playlists().list(
+            part="snippet,contentDetails",
+            id=",".join(ids),
+        ))
+        for item in res.get("items", []):
+            meta[item["id"]] = {
+                "item_count": int((item.get("contentDetails") or {}).get("itemCount", 0) or 0),
+                "published_at": (item.get("snippet") or {}).get("publishedAt"),
+            }
+    return meta
+
+def probe_playlist(pool: YouTubeClientPool, playlist_id: str) -> dict:
+    return pool.execute("playlistItems.list", lambda yt: yt.playlistItems().list(
+        part="snippet,contentDetails",
+        playlistId=playlist_id,
+        maxResults=PROBE_SIZE,
+    ))
+
+# -----------------------------
+# PLANNING
+# -----------------------------
+def judge(entry: dict, start: datetime, end: datetime, channel_id: str | None,
+          uploads_floor: datetime | None) -> str | None:
+    """건너뛸 이유(없으면 None)."""
+    if entry["item_count"] == 0 or not entry["dates"]:
+        return "empty"
+    lo, hi = min(entry["dates"]), max(entry["dates"])
+    exact = entry["item_count"] <= len(entry["dates"])   # probe가 전체를 다 봄
+    order = entry["order"]
+
+    # 기간 밖: 범위가 확정이거나 정렬 방향으로 한쪽 끝이 확정될 때만 판단
+    if (exact or order == "desc") and hi < start:
+        return "before START_DATE"
+    if (exact or order == "asc") and lo > end:
+        return "after END_DATE"
+
+    # 채널 업로드 재생목록으로 이미 닿는 구간(uploads_floor 이후)이고 전부 자기 채널 영상이면 중복
+    if uploads_floor and channel_id and entry["own_only"] and (exact or order == "asc") and lo >= uploads_floor:
+        return "covered by uploads"
+    return None
+
+def plan_playlists(pool: YouTubeClientPool, playlists: Dict[str, str], start: datetime, end: datetime,
+                   keyword_filter: Callable[[str], bool], channel_id: str | None = None,
+                   uploads_floor: datetime | None = None) -> list:
+    """
+    재생목록별 메타데이터 + probe 1페이지로 계획을 세운다.
+    반환: 기대 수확 내림차순 [{id, title, item_count, order, expected_yield, skip, first_page}, ...]
+    """
+    meta = fetch_playlist_meta(pool, playlists.keys())
+    plan = []
+    for pid, title in playlists.items():
+        m = meta.get(pid)
+        if m is None:
+            plan.append({"id": pid, "title": title, "item_count": 0, "order": "unknown",
+                         "expected_yield": 0.0, "skip": "not found", "first_page": None})
+            continue
+
+        page = probe_playlist(pool, pid) if m["item_count"] else {"items": []}
+        items = page.get("items", [])
+        dated = [(d, it) for it in items if (d := item_date(it)) is not None]
+        dates = [d for d, _ in dated]
+        in_range = [it for d, it in dated if start <= d <= end]
+        hits = sum(1 for it in in_range if keyword_filter((it.get("snippet") or {}).get("title", "")))
+        owners = {(it.get("snippet") or {}).get("videoOwnerChannelId") for it in items}
+
+        entry = {
+            "id": pid,
+            "title": title,
+            "item_count": m["item_count"],
+            "published_at": m["published_at"],
+            "dates": dates,
+            "order": detect_order(dates),
+            "own_only": owners == {channel_id},
+            "first_page": page,
+        }
+        # 기대 수확 = 항목 수 × (기간 내 비율) × (키워드 적중률, 스무딩)
+        n = max(len(dates), 1)
+        entry["expected_yield"] = round(m["item_count"] * (len(in_range) / n) * ((hits + PRIOR_HITS) / (n + 1)), 2)
+        entry["skip"] = judge(entry, start, end, channel_id, uploads_floor)
+        plan.append(entry)
+
+    plan.sort(key=lambda e: (e["skip"] is not None, -e["expected_yield"]))
+    return plan
+
+def print_plan(plan: list):
+    kept = [e for e in plan if not e["skip"]]
+    skipped = [e for e in plan if e["skip"]]
+    saved = sum(max(0, -(-e["item_count"] // PROBE_SIZE) - 1) for e in skipped)
+    print(f"[PLAN] {len(kept)} playlists to crawl, {len(skipped)} skipped (~{saved} playlistItems pages saved)")
+    for e in kept:
+        print(f"  [PLAN] yield~{e['expected_yield']:>8} items={e['item_count']:>6} order={e['order']:<7} | {e['title']}")
+    for e in skipped:
+        print(f"  [SKIP] {e['skip']:<20} items={e['item_count']:>6} | {e['title']}")
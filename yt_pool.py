@@ -0,0 +1,182 @@
+# 여러 API 키(프로젝트)를 남은 예산 순으로 돌려 쓰는 YouTube 클라이언트 풀
+import os
+import json
+import threading
+from googleapiclient.errors import HttpError
+from yt_quota import QuotaLedger, QuotaExhausted, QUOTA_COSTS, execute, is_quota_error, key_id
+from yt_cache import ResponseCache, request_key
+
+DISCOVERY_FILE = "youtube_v3_discovery.json"   # 디스커버리 문서 사본(한 번 받아 두고 재사용)
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/youtube/v3/rest"
+
+_discovery = None
+_discovery_lock = threading.Lock()
+
+
+def discovery_document() -> dict:
+    """
+    youtube v3 디스커버리 문서를 프로세스당 한 번만 읽어 파싱한다.
+    로컬 사본 → 라이브러리 내장 사본 → 네트워크 순으로 찾고, 처음 얻으면 사본으로 저장한다.
+    """
+    global _discovery
+    with _discovery_lock:
+        if _discovery is None:
+            if os.path.exists(DISCOVERY_FILE):
+                with open(DISCOVERY_FILE, "r", encoding="utf-8") as f:
+                    _discovery = json.load(f)
+            else:
+                from googleapiclient.discovery_cache import get_static_doc
+                doc = get_static_doc("youtube", "v3")
+                if doc is None:
+                    import urllib.request
+                    with urllib.request.urlopen(DISCOVERY_URL, timeout=30) as r:
+                        doc = r.read().decode("utf-8")
+                _discovery = json.loads(doc)
+                tmp = DISCOVERY_FILE + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(_discovery, f, separators=(",", ":"))
+                os.replace(tmp, DISCOVERY_FILE)
+        return _discovery
+
+
+def build_client(api_key: str):
+    """build("youtube","v3")와 같은 클라이언트 — 디스커버리 문서를 매번 읽고 파싱하지 않는다."""
+    from googleapiclient.discovery import build_from_document  # 무거운 import는 클라이언트를 만들 때만
+    return build_from_document(discovery_document(), developerKey=api_key)
+
+
+class YouTubeClientPool:
+    """
+    요청마다 남은 예산이 가장 많은 키를 골라 실행한다.
+    quotaExceeded가 나면 그 키를 소진 처리하고 같은 요청(같은 pageToken)을 다음 키로 다시 보낸다.
+    httplib2 클라이언트는 스레드 안전하지 않으므로 스레드마다 따로 만든다.
+    cache가 있으면 저장된 ETag로 If-None-Match를 보내고 304면 저장된 응답을 돌려준다.
+    """
+
+    def __init__(self, api_keys: list, ledger: QuotaLedger | None = None, cache: ResponseCache | None = None):
+        self.api_keys = list(dict.fromkeys(k for k in api_keys if k))
+        if not self.api_keys:
+            raise ValueError("API_KEYS is empty")
+        self.ledger = ledger or QuotaLedger()
+        self.cache = cache
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.calls = {k: 0 for k in self.api_keys}
+        self.failovers = 0
+
+    def client(self, api_key: str):
+        clients = self._local.__dict__.setdefault("clients", {})
+        if api_key not in clients:
+            clients[api_key] = build_client(api_key)
+        return clients[api_key]
+
+    def _count(self, api_key: str):
+        with self._lock:
+            self.calls[api_key] += 1
+
+    def pick(self, method: str) -> str:
+        candidates = [k for k in self.api_keys if self.ledger.can_afford(k, method)]
+        if not candidates:
+            raise QuotaExhausted(f"all {len(self.api_keys)} keys exhausted for {method}")
+        return max(candidates, key=self.ledger.remaining)
+
+    def execute(self, method: str, make_request):
+        """make_request(youtube) → 요청 객체. 키를 바꿔도 같은 인자로 다시 만든다."""
+        cached = key = None
+        if self.cache is not None:
+            key = request_key(method, make_request(self.client(self.api_keys[0])).uri)
+            cached = self.cache.lookup(key)
+            if cached and self.cache.is_fresh(cached[2]):
+                return self.cache.fresh(cached[1])  # max_age 안 → 요청 없음
+
+        while True:
+            api_key = self.pick(method)
+            request = make_request(self.client(api_key))
+            if cached:
+                request.headers["If-None-Match"] = cached[0]
+            try:
+                res = execute(request, self.ledger, api_key, method)
+                self._count(api_key)
+                break
+            except QuotaExhausted as e:
+                # pick()이 예산을 확인했으므로 여기 오는 건 서버측 소진 → 다음 키로
+                self.failovers += 1
+                print(f"[POOL] key {key_id(api_key)} exhausted ({e}); failing over", flush=True)
+            except HttpError as e:
+                if cached and e.resp.status == 304:
+                    self._count(api_key)
+                    return self.cache.revalidated(key, cached[1])
+                raise
+
+        if self.cache is not None:
+            if cached:
+                self.cache.changed()
+            self.cache.store(key, res)
+        return res
+
+    def execute_batch(self, method: str, make_requests: list) -> list:
+        """
+        여러 요청을 BatchHttpRequest 한 번(HTTP 왕복 1회)으로 보낸다.
+        쿼터는 요청마다 차감되므로 비용은 같고, 줄어드는 건 왕복 횟수다.
+        quotaExceeded로 실패한 요청만 다음 키로 다시 보낸다. 결과 순서는 입력 순서.
+        """
+        results = [None] * len(make_requests)
+        pending = list(range(len(make_requests)))
+        while pending:
+            api_key = self.pick(method)
+            affordable = self.ledger.remaining(api_key) // QUOTA_COSTS[method]
+            chunk, pending = pending[:affordable], pending[affordable:]
+            for _ in chunk:
+                self.ledger.charge(api_key, method)
+
+            failed = []
+            def callback(request_id, response, exception):
+                idx = int(request_id)
+                if exception is None:
+                    results[idx] = response
+                    self._count(api_key)
+                elif is_quota_error(exception):
+                    failed.append(idx)
+                else:
+                    print(f"[ERROR] batch item {idx} failed: {exception}", flush=True)
+
+            yt = self.client(api_key)
+            batch = yt.new_batch_http_request(callback=callback)
+            for idx in chunk:
+                batch.add(make_requests[idx](yt), request_id=str(idx))
+            try:
+                batch.execute()
+            except Exception as e:
+                # 전송 오류 — 응답을 못 받은 항목은 None으로 남긴다(호출 쪽이 다음 실행에서 다시)
+                print(f"[ERROR] batch of {len(chunk)} requests failed: {e}", flush=True)
+
+            if failed:
+                self.ledger.mark_exhausted(api_key)
+                self.failovers += 1
+                print(f"[POOL] key {key_id(api_key)} exhausted in batch; failing over {len(failed)} requests", flush=True)
+                pending = sorted(failed) + pending
+        return results
+
+    def remaining(self) -> int:
+        return sum(self.ledger.remaining(k) for k in self.api_keys)
+
+    def utilization(self) -> list:
+        out = []
+        for k in self.api_keys:
+            used = self.ledger.used(k)
+            out.append({
+                "key": key_id(k),
+                "used": used,
+                "remaining": self.ledger.remaining(k),
+                "utilization": round(used / self.ledger.daily_budget, 3),
+                "calls": self.calls[k],
+            })
+        return out
+
+    def report(self):
+        for u in self.utilization():
+            print(f"  [POOL] key={u['key']} used={u['used']:>6} remaining={u['remaining']:>6} "
+                  f"util={u['utilization']:.1%} calls={u['calls']}")
+        print(f"  [POOL] total remaining={self.remaining()} failovers={self.failovers}", flush=True)
+        if self.cache is not None:
+            self.cache.report()
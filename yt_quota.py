@@ -0,0 +1,200 @@
+# YouTube Data API 쿼터 원장(ledger) + 재개용 페이지 토큰 체크포인트
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+LEDGER_FILE = "quota_ledger.json"
+STATE_FILE = "crawl_state.json"
+
+DAILY_QUOTA = 10_000            # 키(프로젝트)당 하루 기본 쿼터
+RESERVE = 0                     # 수동 작업용으로 남겨둘 여유분
+RESET_MARGIN = 60               # 리셋 직후 바로 치지 않도록 여유(초)
+
+# 메서드별 쿼터 비용(https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    "search.list": 100,
+    "playlistItems.list": 1,
+    "playlists.list": 1,
+    "channels.list": 1,
+    "videos.list": 1,
+}
+
+# 쿼터는 태평양 시간 자정에 리셋된다
+PACIFIC = ZoneInfo("America/Los_Angeles")
+
+# rateLimitExceeded(초당 제한)는 백오프 대상이지 일일 소진이 아니다
+QUOTA_REASONS = ("quotaExceeded", "dailyLimitExceeded")
+
+
+class QuotaExhausted(Exception):
+    """오늘 예산을 다 써서 더 이상 요청할 수 없음(리셋 후 재개)."""
+
+
+# -----------------------------
+# UTIL / HELPERS
+# -----------------------------
+def quota_day(now: datetime | None = None) -> str:
+    now = now or datetime.now(PACIFIC)
+    return now.astimezone(PACIFIC).date().isoformat()
+
+def next_reset(now: datetime | None = None) -> datetime:
+    now = (now or datetime.now(PACIFIC)).astimezone(PACIFIC)
+    tomorrow = now.date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=PACIFIC)
+
+def seconds_until_reset(now: datetime | None = None) -> float:
+    now = now or datetime.now(PACIFIC)
+    return max(0.0, (next_reset(now) - now).total_seconds())
+
+def key_id(api_key: str) -> str:
+    """원장에는 키 원문 대신 짧은 해시만 남긴다."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+def is_quota_error(e: Exception) -> bool:
+    """HttpError가 쿼터 초과(403 quotaExceeded 등)인지 확인."""
+    resp = getattr(e, "resp", None)
+    if getattr(resp, "status", None) != 403:
+        return False
+    content = getattr(e, "content", b"") or b""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", "replace")
+    try:
+        errors = json.loads(content).get("error", {}).get("errors", [])
+        reasons = {err.get("reason") for err in errors}
+    except Exception:
+        reasons = set()
+    return bool(reasons & set(QUOTA_REASONS)) or any(r in content for r in QUOTA_REASONS)
+
+# -----------------------------
+# LEDGER
+# -----------------------------
+class QuotaLedger:
+    """키/날짜(태평양 시간)별 사용량을 파일에 누적 기록한다."""
+
+    def __init__(self, path: str = LEDGER_FILE, daily_budget: int = DAILY_QUOTA, reserve: int = RESERVE):
+        self.path = path
+        self.daily_budget = daily_budget
+        self.reserve = reserve
+        self.data: dict[str, dict[str, int]] = {}
+        self.lock = threading.RLock()   # 여러 스레드가 같은 원장을 공유
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def save(self):
+        with self.lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp, self.path)
+
+    def used(self, api_key: str, day: str | None = None) -> int:
+        return self.data.get(key_id(api_key), {}).get(day or quota_day(), 0)
+
+    def remaining(self, api_key: str) -> int:
+        return max(0, self.daily_budget - self.reserve - self.used(api_key))
+
+    def can_afford(self, api_key: str, method: str) -> bool:
+        return self.remaining(api_key) >= QUOTA_COSTS[method]
+
+    def charge(self, api_key: str, method: str):
+        """요청 직전에 호출 — 예산을 넘으면 요청하지 않고 QuotaExhausted."""
+        cost = QUOTA_COSTS[method]
+        with self.lock:
+            if self.remaining(api_key) < cost:
+                raise QuotaExhausted(f"{method} needs {cost} units, "
+                                     f"{self.remaining(api_key)} left for key {key_id(api_key)}")
+            day = quota_day()
+            per_key = self.data.setdefault(key_id(api_key), {})
+            per_key[day] = per_key.get(day, 0) + cost
+            self.save()
+
+    def mark_exhausted(self, api_key: str):
+        """서버가 quotaExceeded를 돌려주면 원장과 무관하게 오늘은 소진 처리."""
+        with self.lock:
+            per_key = self.data.setdefault(key_id(api_key), {})
+            per_key[quota_day()] = self.daily_budget
+            self.save()
+
+# -----------------------------
+# CHECKPOINT
+# -----------------------------
+class CrawlState:
+    """작업(task)별 다음 pageToken 등 재개 정보를 저장한다."""
+
+    def __init__(self, path: str = STATE_FILE):
+        self.path = path
+        self.data: dict[str, dict] = {}
+        self.lock = threading.RLock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def get(self, task: str) -> dict:
+        return self.data.get(task, {})
+
+    def update(self, task: str, **fields):
+        """메모리만 갱신 — 영상 데이터와 같은 시점에 save()로 함께 저장한다."""
+        with self.lock:
+            self.data.setdefault(task, {}).update(fields)
+
+    def is_done(self, task: str) -> bool:
+        return self.get(task).get("done", False)
+
+    def mark_done(self, task: str):
+        self.update(task, done=True, page_token=None)
+
+    def save(self):
+        with self.lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+
+    def clear(self):
+        self.data = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# -----------------------------
+# EXECUTION
+# -----------------------------
+def execute(request, ledger: QuotaLedger, api_key: str, method: str):
+    """쿼터를 차감하고 요청 실행. 서버측 쿼터 초과도 QuotaExhausted로 바꿔 올린다."""
+    ledger.charge(api_key, method)
+    try:
+        return request.execute()
+    except Exception as e:
+        if is_quota_error(e):
+            ledger.mark_exhausted(api_key)
+            raise QuotaExhausted(f"server reported quota exceeded for key {key_id(api_key)}") from e
+        raise
+
+def wait_for_reset(margin: int = RESET_MARGIN):
+    wake = next_reset() + timedelta(seconds=margin)
+    secs = seconds_until_reset() + margin
+    print(f"[QUOTA] budget exhausted. sleeping {secs / 3600:.1f}h until {wake.isoformat()}", flush=True)
+    time.sleep(secs)
+
+def run_with_resume(job, on_pause=None, auto_resume: bool = True):
+    """
+    job() 도중 QuotaExhausted가 나면 on_pause()로 체크포인트를 저장하고
+    태평양 자정 리셋까지 기다렸다가 job()을 다시 실행한다(저장된 토큰에서 이어짐).
+    """
+    while True:
+        try:
+            return job()
+        except QuotaExhausted as e:
+            print(f"[QUOTA] paused: {e}", flush=True)
+            if on_pause:
+                on_pause()
+            if not auto_resume:
+                return None
+            wait_for_reset()
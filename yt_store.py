@@ -0,0 +1,333 @@
+# existing_data(videoId → 레코드 dict)를 대신하는 컬럼형 저장소
+# - videoId: 11자 base64url → 8바이트 정수(array 'Q'), 날짜: epoch 초(array 'q')
+# - 채널/재생목록 이름은 한 번만 저장(인터닝), "Video URL"은 ID로 만들어 낸다
+# - dict와 같은 방식으로 쓴다: vid in store / store[vid] = {...} / store[vid].update(...) / store.values()
+import os
+import json
+import base64
+import binascii
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+SNAPSHOT_FORMAT = "videostore-1"
+URL_PREFIX = "https://www.youtube.com/watch?v="
+
+# 날짜 문자열 모양(원래대로 되돌려 쓰기 위해 행마다 1바이트)
+# - TZ_OFFSET은 분 단위 오프셋을 date_offset 컬럼에 함께 둔다
+# - TZ_RAW: 컬럼으로 똑같이 되돌릴 수 없는 문자열(형식 오류, 초 미만 등) → raw_dates에 그대로
+TZ_NAIVE, TZ_OFFSET, TZ_Z, TZ_NONE, TZ_DATE, TZ_RAW = 0, 1, 2, 3, 4, 5
+
+# 컬럼으로 따로 두는 필드. 그 밖의 필드(보강 정보 등)는 행별 extra dict
+COLUMNS = ("Video URL", "Title", "Channel", "UploadDate", "SourcePlaylist", "PlaylistId")
+
+# -----------------------------
+# UTIL / HELPERS
+# -----------------------------
+def encode_id(vid: str) -> int | None:
+    """11자 YouTube ID → 64비트 정수. 되돌렸을 때 같은 문자열이 아니면 None(그대로 보관)."""
+    if len(vid) != 11:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(vid + "=")
+    except (binascii.Error, ValueError):
+        return None
+    n = int.from_bytes(raw, "big")
+    return n if decode_id(n) == vid else None
+
+def decode_id(n: int) -> str:
+    return base64.urlsafe_b64encode(n.to_bytes(8, "big")).decode("ascii").rstrip("=")
+
+def encode_date(s: str | None) -> tuple | None:
+    """ISO 문자열 → (epoch 초, 모양, 오프셋 분). 원래 문자열로 되돌릴 수 없으면 None."""
+    if not s:
+        return 0, TZ_NONE, 0
+    try:
+        if len(s) == 10:
+            dt = datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
+            kind, offset = TZ_DATE, 0
+        else:
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+                kind, offset = TZ_NAIVE, 0
+            else:
+                kind = TZ_Z if s.endswith("Z") else TZ_OFFSET
+                offset = int(dt.utcoffset().total_seconds() // 60)
+    except (ValueError, TypeError):
+        return None
+    encoded = int(dt.timestamp()), kind, offset
+    return encoded if decode_date(*encoded) == s else None
+
+def decode_date(epoch: int, kind: int, offset: int = 0) -> str | None:
+    if kind == TZ_NONE:
+        return None
+    dt = datetime.fromtimestamp(epoch, timezone.utc)
+    if kind == TZ_DATE:
+        return dt.date().isoformat()
+    if kind == TZ_OFFSET:
+        return dt.astimezone(timezone(timedelta(minutes=offset))).isoformat()
+    s = dt.replace(tzinfo=None).isoformat()
+    return s + "Z" if kind == TZ_Z else s
+
+# -----------------------------
+# RECORD VIEW
+# -----------------------------
+class VideoRecord:
+    """store[vid]가 돌려주는 행 보기. 읽기/쓰기 모두 저장소 컬럼에 바로 반영된다."""
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "VideoStore", row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, field: str):
+        value = self._store._get_field(self._row, field)
+        if value is None and field not in self:
+            raise KeyError(field)
+        return value
+
+    def __setitem__(self, field: str, value):
+        self._store._set_field(self._row, field, value)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.keys()
+
+    def get(self, field: str, default=None):
+        value = self._store._get_field(self._row, field)
+        return default if value is None else value
+
+    def update(self, fields: dict):
+        for k, v in fields.items():
+            self[k] = v
+
+    def keys(self) -> list:
+        return list(self.to_dict())
+
+    def items(self):
+        return self.to_dict().items()
+
+    def to_dict(self) -> dict:
+        return self._store._row_dict(self._row)
+
+    def __repr__(self):
+        return f"VideoRecord({self.to_dict()!r})"
+
+# -----------------------------
+# STORE
+# -----------------------------
+class VideoStore:
+    def __init__(self):
+        self.ids = array("Q")               # 8바이트 videoId
+        self.dates = array("q")             # epoch 초
+        self.date_kind = array("B")
+        self.date_offset = array("h")       # TZ_OFFSET의 UTC 오프셋(분)
+        self.channels = array("i")          # names 인덱스(-1 = 없음)
+        self.playlists = array("i")
+        self.playlist_ids = array("i")
+        self.titles: list[str] = []
+        self.names: list[str] = []          # 인터닝된 채널/재생목록 이름·ID
+        self._name_index: dict[str, int] = {}
+        self._index: dict[int, int] = {}    # 인코딩된 ID → 행
+        self._odd_ids: dict[str, int] = {}  # 11자 base64url이 아닌 ID → 행
+        self._odd_rows: dict[int, str] = {}
+        self.extra: dict[int, dict] = {}    # 행 → 컬럼 밖 필드
+        self.raw_dates: dict[int, str] = {} # 행 → TZ_RAW 날짜 문자열
+
+    # ---- 인터닝 ----
+    def _intern(self, name: str | None) -> int:
+        if name is None:
+            return -1
+        idx = self._name_index.get(name)
+        if idx is None:
+            idx = self._name_index[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+    def _name(self, idx: int) -> str | None:
+        return self.names[idx] if idx >= 0 else None
+
+    # ---- 행 접근 ----
+    def _row_of(self, vid: str) -> int | None:
+        n = encode_id(vid)
+        return self._index.get(n) if n is not None else self._odd_ids.get(vid)
+
+    def _vid(self, row: int) -> str:
+        return self._odd_rows.get(row) or decode_id(self.ids[row])
+
+    def _get_field(self, row: int, field: str):
+        if field == "Video URL":
+            return URL_PREFIX + self._vid(row)
+        if field == "Title":
+            return self.titles[row]
+        if field == "Channel":
+            return self._name(self.channels[row])
+        if field == "UploadDate":
+            if self.date_kind[row] == TZ_RAW:
+                return self.raw_dates[row]
+            return decode_date(self.dates[row], self.date_kind[row], self.date_offset[row])
+        if field == "SourcePlaylist":
+            return self._name(self.playlists[row])
+        if field == "PlaylistId":
+            return self._name(self.playlist_ids[row])
+        return self.extra.get(row, {}).get(field)
+
+    def _set_field(self, row: int, field: str, value):
+        if field == "Video URL":
+            return  # ID에서 만들어 냄
+        if field == "Title":
+            self.titles[row] = value
+        elif field == "Channel":
+            self.channels[row] = self._intern(value)
+        elif field == "UploadDate":
+            self.raw_dates.pop(row, None)
+            encoded = encode_date(value)
+            if encoded is None:
+                self.dates[row], self.date_kind[row], self.date_offset[row] = 0, TZ_RAW, 0
+                self.raw_dates[row] = value
+            else:
+                self.dates[row], self.date_kind[row], self.date_offset[row] = encoded
+        elif field == "SourcePlaylist":
+            self.playlists[row] = self._intern(value)
+        elif field == "PlaylistId":
+            self.playlist_ids[row] = self._intern(value)
+        else:
+            self.extra.setdefault(row, {})[field] = value
+
+    def _row_dict(self, row: int) -> dict:
+        rec = {"Video URL": URL_PREFIX + self._vid(row), "Title": self.titles[row]}
+        for field in COLUMNS[2:]:
+            value = self._get_field(row, field)
+            if value is not None:
+                rec[field] = value
+        rec.update(self.extra.get(row, {}))
+        return rec
+
+    # ---- dict와 같은 API ----
+    def __contains__(self, vid: str) -> bool:
+        return self._row_of(vid) is not None
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._vid(row) for row in range(len(self)))
+
+    def __getitem__(self, vid: str) -> VideoRecord:
+        row = self._row_of(vid)
+        if row is None:
+            raise KeyError(vid)
+        return VideoRecord(self, row)
+
+    def __setitem__(self, vid: str, record: dict):
+        row = self._row_of(vid)
+        if row is None:
+            row = len(self.titles)
+            n = encode_id(vid)
+            if n is not None:
+                self._index[n] = row
+            else:
+                self._odd_ids[vid] = row
+                self._odd_rows[row] = vid
+            self.ids.append(n or 0)
+            self.dates.append(0)
+            self.date_kind.append(TZ_NONE)
+            self.date_offset.append(0)
+            self.channels.append(-1)
+            self.playlists.append(-1)
+            self.playlist_ids.append(-1)
+            self.titles.append("")
+        else:
+            self.extra.pop(row, None)
+            self.channels[row] = self.playlists[row] = self.playlist_ids[row] = -1
+            self.date_kind[row] = TZ_NONE
+            self.raw_dates.pop(row, None)
+        for k, v in record.items():
+            self._set_field(row, k, v)
+
+    def get(self, vid: str, default=None):
+        row = self._row_of(vid)
+        return default if row is None else VideoRecord(self, row)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def items(self) -> Iterator[tuple]:
+        return ((self._vid(row), VideoRecord(self, row)) for row in range(len(self)))
+
+    def values(self) -> Iterator[dict]:
+        """내보내기용: 원래 모양의 레코드 dict를 하나씩 만들어 낸다(DataFrame(list(store.values())))."""
+        return (self._row_dict(row) for row in range(len(self)))
+
+    def update(self, other: dict):
+        for vid, rec in other.items():
+            self[vid] = rec
+
+    # ---- 스냅샷 ----
+    def to_snapshot(self) -> dict:
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "ids": [self._vid(row) for row in range(len(self))],
+            "titles": self.titles,
+            "dates": self.dates.tolist(),
+            "date_kind": self.date_kind.tolist(),
+            "date_offset": self.date_offset.tolist(),
+            "raw_dates": {str(row): value for row, value in self.raw_dates.items()},
+            "names": self.names,
+            "channels": self.channels.tolist(),
+            "playlists": self.playlists.tolist(),
+            "playlist_ids": self.playlist_ids.tolist(),
+            "extra": {str(row): fields for row, fields in self.extra.items()},
+        }
+
+    @classmethod
+    def from_snapshot(cls, snap: dict) -> "VideoStore":
+        store = cls()
+        store.names = list(snap["names"])
+        store._name_index = {name: i for i, name in enumerate(store.names)}
+        store.titles = list(snap["titles"])
+        store.dates = array("q", snap["dates"])
+        store.date_kind = array("B", snap["date_kind"])
+        # 오프셋/원문 컬럼이 없는 예전 스냅샷은 UTC로 저장돼 있었다
+        store.date_offset = array("h", snap.get("date_offset") or [0] * len(store.date_kind))
+        store.raw_dates = {int(row): value for row, value in snap.get("raw_dates", {}).items()}
+        store.channels = array("i", snap["channels"])
+        store.playlists = array("i", snap["playlists"])
+        store.playlist_ids = array("i", snap["playlist_ids"])
+        for row, vid in enumerate(snap["ids"]):
+            n = encode_id(vid)
+            if n is not None:
+                store._index[n] = row
+            else:
+                store._odd_ids[vid] = row
+                store._odd_rows[row] = vid
+            store.ids.append(n or 0)
+        store.extra = {int(row): fields for row, fields in snap.get("extra", {}).items()}
+        return store
+
+    @classmethod
+    def load(cls, path: str) -> "VideoStore":
+        """컬럼형 스냅샷이든 예전 dict-of-dicts JSON이든 읽는다."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") == SNAPSHOT_FORMAT:
+            return cls.from_snapshot(data)
+        store = cls()
+        store.update(data)
+        return store
+
+    def save(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_snapshot(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+def load_records(path: str) -> dict:
+    """어느 형식이든 videoId → 레코드 dict로 읽는다(엑셀 변환 등 pandas 쪽에서 사용)."""
+    store = VideoStore.load(path)
+    return {vid: rec.to_dict() for vid, rec in store.items()}
@@ -0,0 +1,116 @@
+# 업로드 재생목록 순회: 날짜 정렬을 감지해 START_DATE 경계를 넘으면 바로 멈추고,
+# END_DATE보다 새로운 구간은 가벼운 part(contentDetails)로만 넘긴다
+# (playlistItems.list는 part와 관계없이 1 unit — 가벼운 part는 쿼터가 아니라 전송량을 줄이는 것이고,
+#  범위에 닿은 경계 페이지는 FULL_PART로 다시 받으므로 재생목록당 1 unit이 더 든다)
+from datetime import datetime
+from typing import Callable, Iterator
+
+from yt_watermark import newest_item, reached
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+ORDER_PROBE_PAGES = 2           # 정렬 방향은 처음 몇 페이지로 판단
+ORDER_TOLERANCE = 0.95          # 인접 쌍 중 이 비율 이상이 최신순이면 desc (예약 공개 등 약간의 역전 허용)
+LIGHT_PART = "contentDetails"   # videoPublishedAt만 필요할 때(제목/썸네일/설명 없이) — 응답 바이트만 줄어듦, 쿼터는 같음
+FULL_PART = "snippet,contentDetails"
+
+# -----------------------------
+# UTIL / HELPERS
+# -----------------------------
+def item_datetime(item: dict) -> datetime | None:
+    """업로드 시각(naive UTC). contentDetails.videoPublishedAt 우선."""
+    cdet = item.get("contentDetails", {}) or {}
+    snippet = item.get("snippet", {}) or {}
+    published_at = cdet.get("videoPublishedAt") or snippet.get("publishedAt")
+    if not published_at:
+        return None
+    return datetime.fromisoformat(published_at.replace("Z", ""))
+
+def detect_order(dates: list, tolerance: float = ORDER_TOLERANCE) -> str:
+    pairs = list(zip(dates, dates[1:]))
+    if len(pairs) < 2:
+        return "unknown"
+    desc = sum(1 for a, b in pairs if a >= b) / len(pairs)
+    if desc >= tolerance:
+        return "desc"
+    if 1 - desc >= tolerance:
+        return "asc"
+    return "mixed"
+
+# -----------------------------
+# TRAVERSAL
+# -----------------------------
+def walk_playlist(list_page: Callable[[str | None, str], dict], start: datetime, end: datetime,
+                  page_token: str | None = None, on_page: Callable[[str], None] | None = None,
+                  skip_newer: bool = True, stats: dict | None = None,
+                  watermark: dict | None = None) -> Iterator[list]:
+    """
+    list_page(page_token, part) → playlistItems.list 응답.
+    페이지 단위로 items를 내보낸다(필터링은 호출 측). 멈추는 조건:
+      - 정렬이 최신순(desc)으로 확인됐고 페이지 전체가 start보다 오래됨 → 이후도 전부 오래됨
+      - watermark(이전 실행의 최신 항목)에 닿음 → 이후는 이미 본 항목
+    stats에 이번 순회에서 검사한 최신 항목(newest)과 마지막 페이지 토큰(last_token)을 남긴다(워터마크 갱신용).
+    skip_newer: 페이지 전체가 end보다 새로우면 LIGHT_PART로만 넘긴다(제목 불필요). 전송량 최적화일 뿐
+      쿼터는 페이지당 1 unit 그대로이고, 경계 페이지를 FULL_PART로 다시 받는 호출 1번(1 unit)이 더 든다.
+    API에 날짜 필터/임의 오프셋이 없어 페이지 자체를 건너뛸 수는 없다(토큰이 불투명).
+    """
+    stats = {} if stats is None else stats
+    stats.update(pages=0, light_pages=0, refetched=0, order="unknown", stopped_early=False,
+                 stopped_at_mark=False, newest=None, last_token=page_token)
+    seen_dates: list = []
+    part = LIGHT_PART if skip_newer else FULL_PART
+
+    while True:
+        res = list_page(page_token, part)
+        dates = [d for it in res.get("items", []) if (d := item_datetime(it)) is not None]
+        stats["last_token"] = page_token
+        hit_mark = reached(watermark, res.get("items", []))
+
+        if part == LIGHT_PART:
+            if dates and min(dates) > end:
+                if hit_mark:
+                    # 이미 아는 구간인데 범위보다 새로운 페이지 → 볼 것 없음
+                    stats["stopped_at_mark"] = True
+                    break
+                # 범위보다 새로운 페이지: 제목 없이 넘어감
+                stats["light_pages"] += 1
+                seen_dates.extend(dates)
+                nxt = res.get("nextPageToken")
+                if not nxt:
+                    break
+                page_token = nxt
+                if on_page:
+                    on_page(page_token)
+                continue
+            # 경계 페이지부터는 제목이 필요 → 같은 토큰으로 전체 part 재요청
+            part = FULL_PART
+            stats["refetched"] += 1
+            res = list_page(page_token, part)
+            dates = [d for it in res.get("items", []) if (d := item_datetime(it)) is not None]
+            hit_mark = reached(watermark, res.get("items", []))
+
+        stats["pages"] += 1
+        # 워터마크 후보는 실제로 검사한(end 이하) 항목 중 최신 — 범위보다 새로운 항목은 아직 안 본 것
+        top = newest_item([it for it in res.get("items", []) if (d := item_datetime(it)) is not None and d <= end])
+        if top and (stats["newest"] is None or top["published_at"] > stats["newest"]["published_at"]):
+            stats["newest"] = top
+        yield res.get("items", [])
+
+        if hit_mark:
+            stats["stopped_at_mark"] = True
+            break
+
+        seen_dates.extend(dates)
+        if stats["order"] == "unknown" or stats["pages"] <= ORDER_PROBE_PAGES:
+            stats["order"] = detect_order(seen_dates)
+        if stats["order"] == "desc" and dates and max(dates) < start:
+            stats["stopped_early"] = True
+            break
+
+        nxt = res.get("nextPageToken")
+        if not nxt:
+            break
+        page_token = nxt
+        if on_page:
+            on_page(page_token)
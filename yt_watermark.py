@@ -0,0 +1,90 @@
+# 재생목록별 워터마크(가장 최신 videoId/publishedAt, 정렬 방향, 마지막 페이지 토큰)
+# → 다음 갱신 실행은 이미 아는 항목에 닿는 즉시 페이지 넘기기를 멈춘다
+import os
+import json
+import threading
+from datetime import datetime, timezone
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+WATERMARK_FILE = "watermarks.json"
+
+# -----------------------------
+# UTIL / HELPERS
+# -----------------------------
+def item_video_id(item: dict) -> str | None:
+    cdet = item.get("contentDetails", {}) or {}
+    snippet = item.get("snippet", {}) or {}
+    return cdet.get("videoId") or (snippet.get("resourceId") or {}).get("videoId")
+
+def item_published(item: dict) -> str | None:
+    """RFC3339 UTC 문자열 그대로 — 'Z' 형식끼리는 문자열 비교로 시간 순서가 맞다."""
+    cdet = item.get("contentDetails", {}) or {}
+    snippet = item.get("snippet", {}) or {}
+    return cdet.get("videoPublishedAt") or snippet.get("publishedAt")
+
+def rfc3339(dt: datetime) -> str:
+    """naive(UTC로 간주)/aware datetime → 'Z' 문자열(워터마크 비교용)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat(timespec="seconds") + "Z"
+
+def newest_item(items: list) -> dict | None:
+    best = None
+    for it in items:
+        vid, pub = item_video_id(it), item_published(it)
+        if vid and pub and (best is None or pub > best["published_at"]):
+            best = {"video_id": vid, "published_at": pub}
+    return best
+
+def reached(mark: dict | None, items: list) -> bool:
+    """최신순 재생목록에서 이 페이지가 이미 아는 구간에 닿았는지."""
+    if not mark or mark.get("order") != "desc":
+        return False
+    if any(item_video_id(it) == mark["video_id"] for it in items):
+        return True
+    dates = [p for it in items if (p := item_published(it))]
+    return bool(dates) and min(dates) <= mark["published_at"]
+
+# -----------------------------
+# STORE
+# -----------------------------
+class Watermarks:
+    def __init__(self, path: str = WATERMARK_FILE):
+        self.path = path
+        self.data: dict[str, dict] = {}
+        self.lock = threading.RLock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def get(self, key: str, start: datetime | None = None) -> dict | None:
+        """start가 예전 실행이 훑은 구간보다 이르면 None — 더 과거로 넓힌 실행은 처음부터 다시 본다."""
+        mark = self.data.get(key)
+        if mark and start is not None and mark.get("start", "") > rfc3339(start):
+            return None
+        return mark
+
+    def advance(self, key: str, newest: dict | None, order: str, tail_token: str | None = None,
+                start: datetime | None = None):
+        """끝까지(또는 워터마크까지) 다 본 뒤에만 호출 — 중간에 멈춘 순회로 워터마크를 올리면 빈 구간이 생긴다."""
+        with self.lock:
+            mark = dict(self.data.get(key) or {})
+            if newest and newest["published_at"] > mark.get("published_at", ""):
+                mark.update(newest)
+            if start is not None and (not mark.get("start") or rfc3339(start) < mark["start"]):
+                mark["start"] = rfc3339(start)
+            if order in ("desc", "asc"):
+                mark["order"] = order
+            if tail_token:
+                mark["tail_token"] = tail_token
+            mark["updated"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            self.data[key] = mark
+
+    def save(self):
+        with self.lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
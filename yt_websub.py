@@ -0,0 +1,225 @@
+# WebSub(PubSubHubbub) 푸시 수신 서버: 허브에 채널 업로드 피드를 구독하고, 푸시된 Atom 항목을
+# 키워드 필터 → existing_data(temp.json)에 바로 넣는다. 쿼터 0, 업로드 후 수 초 내 수집.
+# 사용: python yt_websub.py --callback-url https://<공개주소>/websub [--port 8080] [--hub-url http://127.0.0.1:9000/]
+import hmac
+import time
+import hashlib
+import argparse
+import threading
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from yt_feed import CHANNELS, TEMP_FILE, make_session, load_json, save_json, parse_feed, ingest
+from yt_store import VideoStore
+
+# -----------------------------
+# CONFIGURATION
+# -----------------------------
+HUB_URL = "https://pubsubhubbub.appspot.com/subscribe"
+TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
+LEASE_SECONDS = 5 * 24 * 3600   # 허브가 더 짧게 줄 수 있음 → 확인(GET)에 온 값을 따른다
+RENEW_MARGIN = 6 * 3600         # 만료 이만큼 전에 재구독
+RENEW_CHECK = 600               # 갱신 스레드 점검 주기(초)
+SECRET = ""                     # 설정하면 X-Hub-Signature(HMAC-SHA1)로 푸시 본문을 검증
+SAVE_DEBOUNCE = 5.0             # 푸시가 몰릴 때 저장 간격(초)
+TIMEOUT = 15
+
+SUBS_FILE = "websub_subscriptions.json"  # topic → {channel_id, expires, verified}
+
+# -----------------------------
+# SUBSCRIPTIONS
+# -----------------------------
+class Subscriptions:
+    def __init__(self, path: str = SUBS_FILE):
+        self.path = path
+        self.lock = threading.RLock()
+        self.data: dict[str, dict] = load_json(path)
+
+    def pending(self, topic: str, channel_id: str):
+        with self.lock:
+            self.data.setdefault(topic, {})["channel_id"] = channel_id
+
+    def verified(self, topic: str, lease: int):
+        with self.lock:
+            sub = self.data.setdefault(topic, {})
+            sub.update(verified=True, expires=time.time() + lease)
+            self.save()
+
+    def unsubscribed(self, topic: str):
+        with self.lock:
+            self.data.pop(topic, None)
+            self.save()
+
+    def wanted(self, topic: str) -> bool:
+        with self.lock:
+            return topic in self.data
+
+    def due(self, now: float) -> list:
+        """만료가 가깝거나 아직 확인이 안 된 구독."""
+        with self.lock:
+            return [(t, s["channel_id"]) for t, s in self.data.items()
+                    if not s.get("verified") or s.get("expires", 0) - RENEW_MARGIN <= now]
+
+    def save(self):
+        with self.lock:
+            save_json(self.path, self.data)
+
+def subscribe(session: requests.Session, hub_url: str, callback_url: str, topic: str,
+              mode: str = "subscribe") -> bool:
+    """허브에 구독 요청(비동기 확인). 202/204면 곧 callback으로 확인 GET이 온다."""
+    form = {
+        "hub.callback": callback_url,
+        "hub.topic": topic,
+        "hub.mode": mode,
+        "hub.verify": "async",
+        "hub.lease_seconds": str(LEASE_SECONDS),
+    }
+    if SECRET:
+        form["hub.secret"] = SECRET
+    try:
+        r = session.post(hub_url, data=form, timeout=TIMEOUT)
+    except requests.RequestException as e:
+        print(f"[WEBSUB] {mode} request failed for {topic}: {e}")
+        return False
+    if r.status_code not in (202, 204):
+        print(f"[WEBSUB] hub refused {mode} for {topic}: {r.status_code} {r.text[:200]}")
+        return False
+    print(f"[WEBSUB] {mode} requested: {topic}", flush=True)
+    return True
+
+def renew_loop(session: requests.Session, subs: Subscriptions, hub_url: str, callback_url: str,
+               stop: threading.Event):
+    """만료 전에 자동으로 재구독(임대 갱신)."""
+    while not stop.is_set():
+        for topic, _ in subs.due(time.time()):
+            subscribe(session, hub_url, callback_url, topic)
+        stop.wait(RENEW_CHECK)
+
+# -----------------------------
+# RECEIVER
+# -----------------------------
+class Store:
+    """푸시 핸들러 스레드들이 공유하는 existing_data + 지연 저장."""
+
+    def __init__(self, path: str = TEMP_FILE):
+        self.path = path
+        self.data = VideoStore.load(path)
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.last_save = 0.0
+
+    def add_entries(self, entries: list) -> int:
+        added = 0
+        with self.lock:
+            for e in entries:
+                channel = CHANNELS.get(e["channel_id"]) or e["channel"]
+                added += ingest(self.data, e["video_id"], e["title"], channel, e["published_at"])
+            self.dirty = self.dirty or bool(added)
+            if self.dirty and time.time() - self.last_save >= SAVE_DEBOUNCE:
+                self.flush()
+        return added
+
+    def flush(self):
+        with self.lock:
+            if self.dirty:
+                self.data.save(self.path)
+                self.dirty = False
+                self.last_save = time.time()
+                print(f"[INFO] Temp data saved ({len(self.data)} videos)", flush=True)
+
+def make_handler(subs: Subscriptions, store: Store):
+    class WebSubHandler(BaseHTTPRequestHandler):
+        def _reply(self, code: int, body: bytes = b""):
+            self.send_response(code)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            # 구독/해지 확인: 우리가 요청한 topic일 때만 challenge를 그대로 돌려준다
+            q = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            mode, topic, challenge = q.get("hub.mode"), q.get("hub.topic"), q.get("hub.challenge")
+            if not challenge or not topic or not subs.wanted(topic):
+                return self._reply(404)
+            if mode == "subscribe":
+                subs.verified(topic, int(q.get("hub.lease_seconds") or LEASE_SECONDS))
+            elif mode == "unsubscribe":
+                subs.unsubscribed(topic)
+            elif mode == "denied":
+                print(f"[WEBSUB] subscription denied: {topic} ({q.get('hub.reason')})")
+                return self._reply(200)
+            else:
+                return self._reply(404)
+            print(f"[WEBSUB] verified {mode}: {topic}", flush=True)
+            self._reply(200, challenge.encode())
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if SECRET:
+                sig = self.headers.get("X-Hub-Signature", "")
+                expected = "sha1=" + hmac.new(SECRET.encode(), body, hashlib.sha1).hexdigest()
+                if not hmac.compare_digest(sig, expected):
+                    # 서명이 틀려도 2xx로 답하고 무시(허브 재전송 방지, WebSub 권고)
+                    print("[WEBSUB] signature mismatch; ignored")
+                    return self._reply(202)
+            try:
+                entries = parse_feed(body)   # 삭제 알림(at:deleted-entry)은 videoId가 없어 걸러짐
+            except ET.ParseError as e:
+                print(f"[WEBSUB] bad payload: {e}")
+                return self._reply(400)
+            added = store.add_entries(entries)
+            print(f"[WEBSUB] push: {len(entries)} entries, +{added}", flush=True)
+            self._reply(204)
+
+        def log_message(self, fmt, *args):
+            pass  # 요청마다 찍히는 기본 로그는 끔
+
+    return WebSubHandler
+
+# -----------------------------
+# MAIN
+# -----------------------------
+def main():
+    parser = argparse.ArgumentParser(description="WebSub push receiver for YouTube channel uploads")
+    parser.add_argument("--callback-url", required=True, help="허브가 접근할 수 있는 이 서버의 공개 URL")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--hub-url", default=HUB_URL, help="로컬 허브 스텁으로 테스트할 때 지정")
+    parser.add_argument("--topic-url", default=TOPIC_URL, help="{channel_id} 자리표시자가 있는 topic URL")
+    parser.add_argument("--temp-file", default=TEMP_FILE)
+    parser.add_argument("--subs-file", default=SUBS_FILE)
+    args = parser.parse_args()
+
+    session = make_session()
+    subs = Subscriptions(args.subs_file)
+    store = Store(args.temp_file)
+    for channel_id in CHANNELS:
+        subs.pending(args.topic_url.format(channel_id=channel_id), channel_id)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(subs, store))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[WEBSUB] listening on {args.host}:{args.port} (callback {args.callback_url})", flush=True)
+
+    # 서버가 뜬 뒤에 구독해야 확인 GET을 받을 수 있다
+    stop = threading.Event()
+    renewer = threading.Thread(target=renew_loop, args=(session, subs, args.hub_url, args.callback_url, stop),
+                               daemon=True)
+    renewer.start()
+    try:
+        while True:
+            time.sleep(SAVE_DEBOUNCE)
+            store.flush()
+    except KeyboardInterrupt:
+        print("[INFO] Stopped.")
+    finally:
+        stop.set()
+        server.shutdown()
+        store.flush()
+        subs.save()
+
+if __name__ == "__main__":
+    main()